@@ -5,7 +5,8 @@ const fs = require('fs');
 class Database {
     constructor() {
         this.db = null;
-        this.dbPath = path.join(__dirname, 'taobei.db');
+        // 测试时可通过 TAOBEI_DB_PATH 指定独立的数据库文件
+        this.dbPath = process.env.TAOBEI_DB_PATH || path.join(__dirname, 'taobei.db');
     }
 
     // 初始化数据库连接
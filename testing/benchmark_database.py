@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+数据库批量操作基准测试
+对比逐行写入与 executemany 单事务批量写入的造数/清理耗时
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.database_helper import DatabaseHelper
+
+INIT_SQL = os.path.join(os.path.dirname(os.path.abspath(__file__)), "../src/database/init.sql")
+
+
+def create_database(db_dir):
+    """基于 init.sql 创建独立的基准测试数据库"""
+    db_path = os.path.join(db_dir, "benchmark.db")
+    helper = DatabaseHelper(db_path, wal=True)
+    with open(INIT_SQL, encoding="utf-8") as f:
+        helper.get_connection().executescript(f.read())
+    return helper
+
+
+def generate_phones(count):
+    """生成不与测试手机号冲突的手机号"""
+    return [f"139{i:08d}" for i in range(count)]
+
+
+def timed(func, *args):
+    """执行函数并返回耗时（毫秒）"""
+    start = time.perf_counter()
+    func(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def seed_row_by_row(helper, phones):
+    """逐行造数（原 setup_test_data 的方式）"""
+    for phone in phones:
+        helper.create_test_user(phone, f"用户{phone[-4:]}")
+        helper.create_verification_code(phone, "123456")
+
+
+def teardown_row_by_row(helper, phones):
+    """逐行清理（原 clean_test_data 的方式）"""
+    for phone in phones:
+        helper.delete_user_by_phone(phone)
+        helper.delete_verification_codes(phone)
+
+
+def seed_bulk(helper, phones):
+    """批量造数"""
+    helper.bulk_create_users(phones)
+    helper.bulk_create_verification_codes(phones)
+
+
+def teardown_bulk(helper, phones):
+    """批量清理"""
+    helper.bulk_delete_by_phones(phones)
+
+
+def run_benchmark(sizes, row_by_row_limit):
+    """运行基准测试并返回结果列表"""
+    results = []
+    with tempfile.TemporaryDirectory() as db_dir:
+        helper = create_database(db_dir)
+        for size in sizes:
+            phones = generate_phones(size)
+            result = {
+                "rows": size,
+                "bulk_seed_ms": round(timed(seed_bulk, helper, phones), 2),
+                "bulk_teardown_ms": round(timed(teardown_bulk, helper, phones), 2),
+                "row_seed_ms": None,
+                "row_teardown_ms": None
+            }
+            if size <= row_by_row_limit:
+                result["row_seed_ms"] = round(timed(seed_row_by_row, helper, phones), 2)
+                result["row_teardown_ms"] = round(timed(teardown_row_by_row, helper, phones), 2)
+            results.append(result)
+        helper.close()
+    return results
+
+
+def print_results(results):
+    """打印结果表格"""
+    print(f"{'行数':>8} | {'批量造数(ms)':>12} | {'批量清理(ms)':>12} | {'逐行造数(ms)':>12} | {'逐行清理(ms)':>12}")
+    print("-" * 72)
+    for result in results:
+        row_seed = result["row_seed_ms"] if result["row_seed_ms"] is not None else "-"
+        row_teardown = result["row_teardown_ms"] if result["row_teardown_ms"] is not None else "-"
+        print(f"{result['rows']:>8} | {result['bulk_seed_ms']:>12} | {result['bulk_teardown_ms']:>12} | "
+              f"{row_seed:>12} | {row_teardown:>12}")
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="数据库批量造数/清理基准测试")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10, 1000, 100000],
+        help="测试的数据行数 (默认: 10 1000 100000)"
+    )
+    parser.add_argument(
+        "--row-by-row-limit",
+        type=int,
+        default=1000,
+        help="逐行方式参与对比的最大行数 (默认: 1000)"
+    )
+    parser.add_argument(
+        "--output",
+        help="将结果写入指定JSON文件"
+    )
+    args = parser.parse_args()
+
+    results = run_benchmark(args.sizes, args.row_by_row_limit)
+    print_results(results)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n结果已写入: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,37 +1,224 @@
 """
 pytest 全局配置和 fixture 定义
+Playwright、behave 和步骤定义只在UI fixture被请求或收集 .feature 时才导入，
+纯API测试的收集不加载浏览器相关模块（见 test_import_budget.py）
 """
+import json
 import os
+import warnings
 import pytest
-from playwright.sync_api import sync_playwright
-from utils.config import Config
+from utils.config import Config, get_worker_id
 from utils.database_helper import DatabaseHelper
-
-# 导入所有步骤定义
-from features.steps import login_steps, register_steps, user_management_steps, product_management_steps
+from utils.db_snapshot import DatabaseSnapshot
+from utils.backend_server import BackendServer, FrontendServer, find_free_port, port_available, start_servers
+from utils.api_metrics import APIMetrics, enable_metrics, get_active_metrics
+from utils.wait_profiler import wait_profiler
+from utils.auth_state import get_auth_state_cache
+from utils.context_pool import BrowserContextPool
+from utils.asset_cache import enable_asset_cache, disable_asset_cache
+from utils.mock_api import MockBackend
+from utils.stream_reporter import StreamReporter
+from utils.test_impact import ImpactCollector, ImpactIndex, changed_files
+from utils.duration_scheduler import DurationRecorder, DurationStore, plan_schedule
+from utils.api_helper import APIHelper
+from utils.data_registry import data_registry
+from utils.preflight import format_results, preflight_targets, run_preflight
+from utils.circuit_breaker import breaker_states, get_breaker, skip_rejected
+from utils.retry_policy import retry_stats
 
 
 @pytest.fixture(scope="session")
-def config():
-    """全局配置fixture"""
+def config(worker_environment, managed_servers):
+    """全局配置fixture
+    
+    先启动本会话需要的服务（worker_environment/managed_servers），Config 读到的是它们的
+    地址。只有用到服务的fixture（preflight、browser、auth_state_cache 等）才请求它，
+    纯单元测试的会话不会启动 Node 进程。
+    """
     return Config()
 
 
 @pytest.fixture(scope="session")
-def database_helper():
-    """数据库操作助手fixture"""
-    return DatabaseHelper()
+def worker_id():
+    """当前xdist worker标识，非并行运行时为master"""
+    return get_worker_id()
+
+
+@pytest.fixture(scope="session")
+def database_snapshot(tmp_path_factory):
+    """数据库基准快照fixture：基于init.sql和种子数据构建一次"""
+    snapshot = DatabaseSnapshot(str(tmp_path_factory.getbasetemp() / "taobei_golden.db"))
+    snapshot.build(seed=lambda helper: helper.setup_test_data())
+    yield snapshot
+    snapshot.close()
+
+
+@pytest.fixture(scope="session")
+def worker_db_path(database_snapshot, worker_id):
+    """当前worker独占的测试数据库副本
+    
+    位于 SERVER_STATE_DIR 下的固定路径，复用的后端下次运行仍打开同一个文件（已存在时
+    原地还原为基准快照）。会话内 DB_PATH 指向该副本，DatabaseHelper()、步骤定义和
+    测试启动的后端（TAOBEI_DB_PATH）都只读写副本，不会改动 src/database/taobei.db。
+    """
+    state_dir = Config().SERVER_STATE_DIR
+    os.makedirs(state_dir, exist_ok=True)
+    path = database_snapshot.create_copy(os.path.abspath(os.path.join(state_dir, f"taobei_{worker_id}.db")))
+    previous = os.environ.get("DB_PATH")
+    os.environ["DB_PATH"] = path
+    yield path
+    
+    if previous is None:
+        os.environ.pop("DB_PATH", None)
+    else:
+        os.environ["DB_PATH"] = previous
+
+
+@pytest.fixture(scope="session")
+def worker_environment(request):
+    """并行隔离fixture
+    
+    WORKER_ISOLATION=true 时为每个worker启动独占端口的后端服务（首选
+    API_PORT_BASE + worker序号，被占用时改用空闲端口），后端使用worker独占的
+    数据库副本，API_BASE_URL 指向该后端，Config 会自动使用这一设置；手机号段
+    由 Config 根据worker序号计算。
+    """
+    worker_config = Config()
+    if not worker_config.WORKER_ISOLATION:
+        yield None
+        return
+    
+    db_path = request.getfixturevalue("worker_db_path")
+    port = worker_config.worker_api_port
+    if not port_available(port):
+        port = find_free_port()
+    server = BackendServer(port, db_path=db_path)
+    server.start()
+    print(f"worker后端已就绪: {server.summary()}")
+    
+    previous = os.environ.get("API_BASE_URL")
+    os.environ["API_BASE_URL"] = server.api_base_url
+    yield server
+    server.stop()
+    
+    if previous is None:
+        os.environ.pop("API_BASE_URL", None)
+    else:
+        os.environ["API_BASE_URL"] = previous
+
+
+@pytest.fixture(scope="session")
+def worker_frontend(worker_environment):
+    """并行隔离时当前worker独占的 Vite 开发服务器
+    
+    页面的 /api 请求经 Vite 代理到worker自己的后端，UI测试与其他worker互不影响。
+    只在UI测试用到浏览器时启动，非隔离运行时为 None（使用 BASE_URL）。
+    """
+    if worker_environment is None:
+        yield None
+        return
+    server = FrontendServer(worker_environment.base_url, port=find_free_port())
+    server.start()
+    print(f"worker前端已就绪: {server.summary()}")
+    previous = os.environ.get("BASE_URL")
+    os.environ["BASE_URL"] = server.base_url
+    yield server
+    server.stop()
+    
+    if previous is None:
+        os.environ.pop("BASE_URL", None)
+    else:
+        os.environ["BASE_URL"] = previous
+
+
+@pytest.fixture(scope="session")
+def managed_servers(worker_environment, worker_db_path, worker_id):
+    """自动管理的服务fixture
+    
+    START_BACKEND=true（--start-backend）时在空闲端口启动 src/backend/app.js（使用
+    当前worker的数据库副本），START_FRONTEND=true（--start-frontend）时再启动 Vite
+    开发服务器，并通过 API_BASE_URL/BASE_URL 让 Config 指向它们。SERVER_REUSE=true
+    （默认）时服务在测试结束后保持运行，下次运行直接复用；xdist worker 各自使用
+    SERVER_STATE_DIR/<worker> 下的服务。WORKER_ISOLATION 下由 worker_environment
+    为每个worker启动后端，这里不再启动。
+    """
+    settings = Config()
+    if worker_environment is not None:
+        yield None
+        return
+    if not (settings.START_BACKEND or settings.START_FRONTEND):
+        warnings.warn(f"后端不由测试启动，测试数据写入 {worker_db_path}：后端需以 "
+                      f"TAOBEI_DB_PATH={worker_db_path} 启动才能读到，或使用 --start-backend")
+        yield None
+        return
+    
+    state_dir = settings.SERVER_STATE_DIR
+    if worker_id != "master":
+        state_dir = os.path.join(state_dir, worker_id)
+    servers = start_servers(frontend=settings.START_FRONTEND, reuse=settings.SERVER_REUSE,
+                            state_dir=state_dir, db_path=worker_db_path)
+    for server in servers.values():
+        print(f"服务已就绪: {server.summary()}")
+    previous = {key: os.environ.get(key) for key in ("API_BASE_URL", "BASE_URL")}
+    os.environ["API_BASE_URL"] = servers["backend"].api_base_url
+    if "frontend" in servers:
+        os.environ["BASE_URL"] = servers["frontend"].base_url
+    yield servers
+    for server in servers.values():
+        server.stop()
+    
+    for key, value in previous.items():
+        if value is None:
+            os.environ.pop(key, None)
+        else:
+            os.environ[key] = value
+
+
+@pytest.fixture(scope="session")
+def preflight(config):
+    """运行前预检fixture：第一个用到服务的测试开始前并行检查后端、前端和数据库
+    
+    由 browser、bdd_context 和API测试模块（pytestmark）请求，纯单元测试的会话不做预检。
+    总耗时不超过 PREFLIGHT_BUDGET（默认1秒）。PREFLIGHT=warn（默认）时对不可用的
+    服务给出警告，strict 时终止运行，off 时不检查。后端无法连接时同时打开其熔断器。
+    """
+    if config.PREFLIGHT == "off":
+        return None
+    results = run_preflight(preflight_targets(config), config.PREFLIGHT_BUDGET)
+    print(format_results(results, config.PROFILE))
+    failed = [result for result in results if not result["ok"]]
+    if config.CIRCUIT_BREAKER:
+        # 预检已确认后端连不上：直接熔断，API测试从第一个起就统一跳过
+        for result in failed:
+            if result["name"] == "backend" and result.get("error") == "无法连接":
+                get_breaker(result["target"]).trip(f"运行前预检: {result['target']} 无法连接")
+    if failed:
+        summary = ", ".join(f"{result['name']} {result['target']} ({result.get('error')})" for result in failed)
+        if config.PREFLIGHT == "strict":
+            pytest.exit(f"环境预检失败: {summary}", returncode=pytest.ExitCode.USAGE_ERROR)
+        warnings.warn(f"环境预检: 以下服务不可用，相关测试可能失败: {summary}")
+    return results
+
+
+@pytest.fixture(scope="session")
+def database_helper(worker_db_path):
+    """数据库操作助手fixture：指向当前worker的数据库副本（测试启动的后端读写同一个文件）"""
+    helper = DatabaseHelper(worker_db_path, wal=True)
+    yield helper
+    helper.close()
 
 
 @pytest.fixture(scope="session")
 def playwright_instance():
     """Playwright实例fixture"""
+    from playwright.sync_api import sync_playwright
+    
     with sync_playwright() as p:
         yield p
 
 
 @pytest.fixture(scope="session")
-def browser(playwright_instance, config):
+def browser(playwright_instance, config, preflight):
     """浏览器实例fixture"""
     browser = playwright_instance.chromium.launch(
         headless=config.HEADLESS,
@@ -41,30 +228,188 @@ def browser(playwright_instance, config):
     browser.close()
 
 
+@pytest.fixture(scope="session")
+def asset_cache(config, worker_id):
+    """静态资源缓存fixture：会话内所有上下文共享，只有 /api 请求访问网络"""
+    if not config.ASSET_CACHE:
+        yield None
+        return
+    cache = enable_asset_cache()
+    yield cache
+    suffix = "" if worker_id == "master" else f"_{worker_id}"
+    cache.write_report(f"reports/asset_cache{suffix}.json")
+    print(f"静态资源缓存统计: {cache.summary()}")
+    disable_asset_cache()
+
+
+@pytest.fixture(scope="session")
+def data_files():
+    """test_data/ 数据文件注册表：每个文件在进程内只解析一次，返回只读数据"""
+    return data_registry
+
+
+@pytest.fixture(scope="session")
+def api_mock(config):
+    """模拟后端fixture：API_MOCK=true 或 --mock-api 时页面的商品和认证接口不访问真实后端"""
+    if not config.API_MOCK:
+        return None
+    return MockBackend(registered_phones=[config.TEST_PHONE_REGISTERED])
+
+
+@pytest.fixture(scope="session")
+def context_pool(browser, config, asset_cache, api_mock, worker_frontend):
+    """浏览器上下文池fixture：上下文预先加载好应用首页，测试之间只重置不重建"""
+    base_url = worker_frontend.base_url if worker_frontend is not None else config.BASE_URL
+    pool = BrowserContextPool(browser, base_url, size=config.CONTEXT_POOL_SIZE,
+                              asset_cache=asset_cache, api_mock=api_mock)
+    yield pool
+    print(f"浏览器上下文池统计: {pool.get_stats()}")
+    pool.close()
+
+
+@pytest.fixture(scope="session")
+def auth_state_cache(config):
+    """登录状态缓存fixture：每个手机号只通过API登录一次"""
+    return get_auth_state_cache()
+
+
 @pytest.fixture(scope="function")
-def page(browser, config):
-    """页面实例fixture"""
-    context = browser.new_context(
-        viewport={"width": 1280, "height": 720},
-        locale="zh-CN"
-    )
-    page = context.new_page()
+def page(request, context_pool):
+    """页面实例fixture
+    
+    从上下文池取出已打开应用首页的页面，测试结束后重置并放回池中。
+    标记了 @pytest.mark.authenticated(phone="...") 的测试直接注入缓存的
+    登录状态，不再走短信登录的UI流程；phone 缺省为已注册测试手机号。
+    """
+    storage_state = None
+    marker = request.node.get_closest_marker("authenticated")
+    if marker is not None:
+        cache = request.getfixturevalue("auth_state_cache")
+        storage_state = cache.get_storage_state(marker.kwargs.get("phone"))
     
-    # 导航到应用首页
-    page.goto(config.BASE_URL)
+    context, page = context_pool.acquire(storage_state)
+    
+    # 采集测试影响时记录页面访问的接口
+    collector = request.config.pluginmanager.get_plugin("impact_collector")
+    on_request = (lambda req: collector.record_url(req.url)) if collector is not None else None
+    if on_request is not None:
+        page.on("request", on_request)
     
     yield page
     
-    # 清理
-    context.close()
+    if on_request is not None:
+        page.remove_listener("request", on_request)
+    # 重置后放回池中
+    context_pool.release(page)
+    if context_pool.api_mock is not None:
+        context_pool.api_mock.reset()
 
 
 @pytest.fixture(scope="function")
-def clean_database(database_helper):
-    """清理测试数据fixture"""
-    yield
-    # 测试后清理数据
-    database_helper.clean_test_data()
+def bdd_context(request, preflight):
+    """BDD场景的步骤上下文，与 features/environment.py 为 behave 准备的属性一致
+    
+    页面（driver/page/browser_context）在步骤第一次使用时才从上下文池取出，
+    纯API场景不会打开浏览器。
+    """
+    def pooled_page():
+        page = request.getfixturevalue("page")
+        context.__dict__.update(driver=page, page=page, browser_context=page.context)
+        return page
+    
+    from utils.bdd_engine import StepContext
+    
+    context = StepContext({
+        "driver": pooled_page,
+        "page": pooled_page,
+        "browser_context": lambda: pooled_page().context,
+        "browser": lambda: request.getfixturevalue("browser"),
+        "db_helper": lambda: request.getfixturevalue("database_helper"),
+        "api_helper": APIHelper
+    })
+    return context
+
+
+def pytest_collect_file(file_path, parent):
+    """features/ 下的 .feature 文件由统一的BDD引擎收集"""
+    if file_path.suffix == ".feature":
+        from utils.bdd_engine import FeatureFile
+        return FeatureFile.from_parent(parent, path=file_path)
+
+
+@pytest.fixture(scope="function")
+def clean_database(database_helper, database_snapshot):
+    """清理测试数据fixture：测试前将当前worker的数据库副本还原为基准快照"""
+    database_snapshot.restore(database_helper)
+    yield database_helper
+
+
+def pytest_addoption(parser):
+    """添加命令行选项"""
+    parser.addoption(
+        "--api-metrics",
+        action="store_true",
+        default=False,
+        help="记录APIHelper每次调用的耗时直方图，并写入JSON报告的api_metrics字段"
+    )
+    parser.addoption(
+        "--mock-api",
+        action="store_true",
+        default=False,
+        help="UI测试的商品和认证接口由基于TestDataManager的模拟后端响应，无需启动Node后端"
+    )
+    parser.addoption(
+        "--start-backend",
+        action="store_true",
+        default=False,
+        help="在空闲端口自动启动后端服务（默认测试结束后保持运行供下次复用，SERVER_REUSE=false 时随会话结束）"
+    )
+    parser.addoption(
+        "--start-frontend",
+        action="store_true",
+        default=False,
+        help="同时自动启动 Vite 开发服务器（/api 代理到自动启动的后端）"
+    )
+    parser.addoption(
+        "--stream-report",
+        default="reports/results.jsonl",
+        help="每个测试结束时追加一行JSON结果的文件（设为空字符串关闭），"
+             "可用 python run_tests.py report 生成HTML"
+    )
+    parser.addoption(
+        "--wait-profile",
+        action="store_true",
+        default=False,
+        help="按测试统计固定等待、条件等待和有效操作耗时，写入 reports/wait_profile.json"
+    )
+    parser.addoption(
+        "--collect-impact",
+        action="store_true",
+        default=False,
+        help="跟踪每个测试用到的页面对象、APIHelper方法和后端接口，更新测试影响索引"
+    )
+    parser.addoption(
+        "--changed-since",
+        metavar="GIT_REF",
+        default=None,
+        help="只运行受相对 GIT_REF 改动的文件影响的测试（需要已采集的测试影响索引）"
+    )
+    parser.addoption(
+        "--impact-index",
+        default=".test_impact.json",
+        help="测试影响索引文件 (默认: .test_impact.json)"
+    )
+    parser.addoption(
+        "--lpt",
+        action="store_true",
+        default=False,
+        help="并行运行时按历史耗时从长到短分配测试，浏览器测试和API测试分开（配合 -n 和 --dist loadgroup）"
+    )
+    parser.addoption(
+        "--durations-file",
+        default=".test_durations.json",
+        help="每个测试的历史耗时文件，每次运行后更新 (默认: .test_durations.json)"
+    )
 
 
 def pytest_configure(config):
@@ -73,10 +418,144 @@ def pytest_configure(config):
     reports_dir = "reports"
     if not os.path.exists(reports_dir):
         os.makedirs(reports_dir)
+    
+    # 启用API调用指标采集
+    if config.getoption("--api-metrics") or Config().API_METRICS:
+        enable_metrics()
+    
+    # 流式结果：xdist 下只在主进程写文件，worker 的结果由主进程接收
+    stream_path = config.getoption("--stream-report")
+    if stream_path and not hasattr(config, "workerinput"):
+        config.pluginmanager.register(StreamReporter(stream_path), "stream_reporter")
+    
+    # 记录每个测试的耗时，供 --lpt 调度使用
+    if not hasattr(config, "workerinput"):
+        store = DurationStore(config.getoption("--durations-file"))
+        config.pluginmanager.register(DurationRecorder(store), "duration_recorder")
+        if config.getoption("--lpt") and config.getoption("dist", "no") != "loadgroup":
+            print("⚠️ --lpt 需要配合 -n 和 --dist loadgroup 使用，本次不调度")
+    
+    # 模拟后端模式：Config 在会话内读取 API_MOCK
+    if config.getoption("--mock-api"):
+        os.environ["API_MOCK"] = "true"
+    
+    # 自动管理的服务：Config 在会话内读取 START_BACKEND/START_FRONTEND
+    if config.getoption("--start-backend"):
+        os.environ["START_BACKEND"] = "true"
+    if config.getoption("--start-frontend"):
+        os.environ["START_FRONTEND"] = "true"
+    
+    # 启用等待耗时分析
+    if config.getoption("--wait-profile"):
+        wait_profiler.enabled = True
+    
+    # 采集测试影响索引：测试在哪个进程运行就在哪个进程跟踪
+    if config.getoption("--collect-impact"):
+        config.pluginmanager.register(ImpactCollector(), "impact_collector")
+
+
+@pytest.fixture(autouse=True)
+def wait_profile(request):
+    """按测试统计等待耗时（未启用分析时不做任何事）"""
+    wait_profiler.start_scenario(request.node.nodeid)
+    yield
+    wait_profiler.end_scenario()
+
+
+@pytest.fixture(autouse=True)
+def retry_budget(request):
+    """按测试统计重试次数，并限制每个测试的重试预算（RETRY_BUDGET）"""
+    retry_stats.start_test(request.node.nodeid)
+    yield
+    retry_stats.end_test()
+
+
+@pytest.fixture(scope="session")
+def api_metrics():
+    """API调用指标fixture：本会话内创建的APIHelper都会记录指标"""
+    return get_active_metrics() or enable_metrics()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """后端已熔断而被拒绝的测试按 CIRCUIT_BREAKER_ACTION 统一跳过，不逐个报连接失败；
+    测试结果中记录重试次数"""
+    outcome = yield
+    report = outcome.get_result()
+    if call.excinfo is not None and Config().CIRCUIT_BREAKER_ACTION == "skip":
+        skip_rejected(item, call, report)
+    if call.when == "call":
+        retries = retry_stats.current_retries()
+        if retries:
+            report.user_properties.append(("retries", retries))
+
+
+def pytest_sessionfinish(session):
+    """xdist worker将指标和测试影响交给主进程合并，写入等待耗时报告和测试影响索引"""
+    metrics = get_active_metrics()
+    if metrics is not None and hasattr(session.config, "workeroutput"):
+        session.config.workeroutput["api_metrics"] = metrics.to_dict()
+    
+    if hasattr(session.config, "workeroutput"):
+        session.config.workeroutput["retries"] = retry_stats.to_dict()
+    else:
+        retries = retry_stats.summary()
+        if retries["total_retries"]:
+            print(f"\n🔁 重试 {retries['total_retries']} 次（{len(retries['tests'])} 个测试），"
+                  f"退避等待 {retries['total_delay_s']}s")
+            for nodeid, entry in list(retries["tests"].items())[:5]:
+                print(f"  {entry['retries']:>3}  {nodeid}")
+    
+    collector = session.config.pluginmanager.get_plugin("impact_collector")
+    if collector is not None:
+        if hasattr(session.config, "workeroutput"):
+            session.config.workeroutput["test_impact"] = collector.tests
+        elif collector.tests:
+            index_path = session.config.getoption("--impact-index")
+            index = ImpactIndex.load(index_path, collector.repo_root) or ImpactIndex(repo_root=collector.repo_root)
+            index.update(collector.tests)
+            index.save(index_path)
+            print(f"\n🧭 测试影响索引已更新: {index_path} ({len(collector.tests)} 个测试)")
+    
+    for state in breaker_states().values():
+        if state["trips"]:
+            print(f"\n⚡ 后端 {state['host']} 熔断 {state['trips']} 次，"
+                  f"直接拒绝 {state['rejected']} 个请求: {state['last_error']}")
+    
+    if wait_profiler.scenarios:
+        worker = get_worker_id()
+        suffix = "" if worker == "master" else f"_{worker}"
+        wait_profiler.write_report(f"reports/wait_profile{suffix}.json")
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """合并xdist worker的指标、重试统计和测试影响"""
+    workeroutput = getattr(node, "workeroutput", {})
+    data = workeroutput.get("api_metrics")
+    if data:
+        (get_active_metrics() or enable_metrics()).merge(APIMetrics.from_dict(data))
+    
+    if workeroutput.get("retries"):
+        retry_stats.merge(workeroutput["retries"])
+    
+    collector = node.config.pluginmanager.get_plugin("impact_collector")
+    if collector is not None and workeroutput.get("test_impact"):
+        collector.tests.update(workeroutput["test_impact"])
+
 
+@pytest.hookimpl(optionalhook=True)
+def pytest_json_modifyreport(json_report):
+    """将API调用指标和重试统计写入 reports/report.json"""
+    metrics = get_active_metrics()
+    if metrics is not None:
+        json_report["api_metrics"] = metrics.summary()
+    json_report["retries"] = retry_stats.summary()
 
+
+@pytest.hookimpl(tryfirst=True)
 def pytest_collection_modifyitems(config, items):
-    """修改测试项收集"""
+    """修改测试项收集（先于 xdist 为分组测试的 nodeid 加后缀）"""
     for item in items:
         # 为UI测试添加标记
         if "ui" in item.nodeid or "page" in item.fixturenames:
@@ -85,10 +564,62 @@ def pytest_collection_modifyitems(config, items):
         # 为API测试添加标记
         if "api" in item.nodeid or "requests" in str(item.function):
             item.add_marker(pytest.mark.api)
+    
+    # 按改动选择测试
+    ref = config.getoption("--changed-since")
+    if ref:
+        _select_changed(config, items, ref)
+    
+    # 按历史耗时分组：xdist 的 loadgroup 把同一分组的测试交给同一个 worker
+    if config.getoption("--lpt") and hasattr(config, "workerinput") and config.getvalue("loadgroup"):
+        _schedule_by_duration(config, items)
+
+
+BROWSER_FIXTURES = {"page", "browser", "context_pool"}
+
+
+def _schedule_by_duration(config, items):
+    """LPT 分组：每个 worker 一个分组，组内按耗时从长到短排列"""
+    store = DurationStore(config.getoption("--durations-file"))
+    kinds = {item.nodeid: "browser" if BROWSER_FIXTURES & set(item.fixturenames) else "api" for item in items}
+    estimates = store.estimate(kinds.items())
+    plan = plan_schedule([(nodeid, kind, estimates[nodeid]) for nodeid, kind in kinds.items()],
+                         config.workerinput["workercount"])
+    
+    groups = {nodeid: group["name"] for group in plan["groups"] for nodeid in group["tests"]}
+    for item in items:
+        item.add_marker(pytest.mark.xdist_group(groups[item.nodeid]))
+    items.sort(key=lambda item: -estimates[item.nodeid])
+    
+    # 所有 worker 的计划相同，由 gw0 写出
+    if config.workerinput["workerid"] == "gw0":
+        with open("reports/lpt_schedule.json", "w", encoding="utf-8") as f:
+            json.dump(plan, f, ensure_ascii=False, indent=2)
+
+
+def _select_changed(config, items, ref):
+    """只保留受改动影响的测试；没有索引或无法计算改动时运行全部测试"""
+    index_path = config.getoption("--impact-index")
+    index = ImpactIndex.load(index_path)
+    if index is None:
+        print(f"⚠️ 未找到测试影响索引 {index_path}，运行全部测试（先用 --collect-impact 采集）")
+        return
+    try:
+        changed = changed_files(ref, index.repo_root)
+    except ValueError as e:
+        print(f"⚠️ {e}，运行全部测试")
+        return
+    
+    selected = index.affected((item.nodeid for item in items), changed)
+    deselected = [item for item in items if item.nodeid not in selected]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = [item for item in items if item.nodeid in selected]
+    print(f"\n🧭 相对 {ref} 改动 {len(changed)} 个文件，选中 {len(items)} 个测试，跳过 {len(deselected)} 个")
 
 
 @pytest.fixture(autouse=True)
-def setup_test_environment(config):
+def setup_test_environment():
     """自动设置测试环境"""
     # 确保测试环境变量设置正确
     os.environ["TEST_ENV"] = "true"
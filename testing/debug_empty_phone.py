@@ -1,10 +1,12 @@
 from playwright.sync_api import sync_playwright
 import time
 
+from utils.config import Config
+
 with sync_playwright() as p:
     browser = p.chromium.launch(headless=False)
     page = browser.new_page()
-    page.goto('http://localhost:5173/login')
+    page.goto(f'{Config().BASE_URL}/login')
     
     # 等待页面加载
     time.sleep(2)
@@ -4,8 +4,17 @@ Behave环境配置文件
 设置测试环境和浏览器实例
 """
 from playwright.sync_api import sync_playwright
+from utils.config import Config
+from utils.asset_cache import enable_asset_cache
+from utils.context_pool import BrowserContextPool
 from utils.database_helper import DatabaseHelper
+from utils.mock_api import MockBackend
 from utils.api_helper import APIHelper
+from utils.wait_profiler import wait_profiler
+from utils.bdd_engine import feature_cache
+
+# behave 在加载本文件之后才解析 .feature，从这里开始使用与 pytest 共用的解析缓存
+feature_cache.install_into_behave()
 
 
 def before_all(context):
@@ -20,6 +29,14 @@ def before_all(context):
         slow_mo=500      # 减慢操作速度以便观察
     )
     
+    # 预热浏览器上下文池
+    config = Config()
+    context.asset_cache = enable_asset_cache() if config.ASSET_CACHE else None
+    context.api_mock = MockBackend(registered_phones=[config.TEST_PHONE_REGISTERED]) if config.API_MOCK else None
+    context.context_pool = BrowserContextPool(context.browser, config.BASE_URL, size=config.CONTEXT_POOL_SIZE,
+                                              asset_cache=context.asset_cache, api_mock=context.api_mock)
+    context.context_pool.warm_up()
+    
     # 初始化数据库和API助手
     context.db_helper = DatabaseHelper()
     context.api_helper = APIHelper()
@@ -30,17 +47,15 @@ def before_all(context):
 def before_scenario(context, scenario):
     """在每个场景开始前执行"""
     print("=== before_scenario 被调用 ===")
-    # 创建新的浏览器上下文和页面
-    context.browser_context = context.browser.new_context(
-        viewport={"width": 1280, "height": 720},
-        locale="zh-CN"
-    )
-    
-    context.driver = context.browser_context.new_page()
+    # 从上下文池取出已加载应用首页的浏览器上下文和页面
+    context.browser_context, context.driver = context.context_pool.acquire()
+    context.page = context.driver
     
     # 设置页面超时
     context.driver.set_default_timeout(30000)
     
+    wait_profiler.start_scenario(scenario.name)
+    
     print(f"开始执行场景: {scenario.name}")
     print(f"浏览器已初始化: {hasattr(context, 'browser')}")
     print(f"浏览器上下文已初始化: {hasattr(context, 'browser_context')}")
@@ -49,21 +64,37 @@ def before_scenario(context, scenario):
 
 def after_scenario(context, scenario):
     """在每个场景结束后执行"""
+    # 重置上下文后放回池中，不再关闭重建
     if hasattr(context, 'driver'):
-        context.driver.close()
+        context.context_pool.release(context.driver)
+    if context.api_mock is not None:
+        context.api_mock.reset()
     
-    if hasattr(context, 'browser_context'):
-        context.browser_context.close()
+    profile = wait_profiler.end_scenario()
+    if profile:
+        print(f"等待耗时: 固定等待 {profile['fixed_sleep_ms']}ms, "
+              f"条件等待 {profile['condition_wait_ms']}ms, 有效操作 {profile['productive_ms']}ms")
     
     print(f"场景执行完成: {scenario.name}")
 
 
 def after_all(context):
     """在所有测试结束后执行"""
+    if hasattr(context, 'context_pool'):
+        print(f"浏览器上下文池统计: {context.context_pool.get_stats()}")
+        context.context_pool.close()
+    
+    if getattr(context, 'asset_cache', None) is not None:
+        context.asset_cache.write_report()
+        print(f"静态资源缓存统计: {context.asset_cache.summary()}")
+    
     if hasattr(context, 'browser'):
         context.browser.close()
     
     if hasattr(context, 'playwright'):
         context.playwright.stop()
     
+    wait_profiler.write_report()
+    
+    print(f"Feature解析缓存统计: {feature_cache.get_stats()}")
     print("测试环境清理完成")
\ No newline at end of file
@@ -1,4 +1,3 @@
-# language: zh-CN
 Feature: 商品管理
   作为一个用户
   我希望能够浏览和搜索商品
@@ -3,10 +3,9 @@
 用户登录功能的步骤定义
 """
 from behave import given, when, then
-from pages.login_page import LoginPage
+import pages
 from utils.database_helper import DatabaseHelper
 from utils.api_helper import APIHelper
-import time
 import re
 
 
@@ -46,7 +45,7 @@ def step_user_on_login_page(context):
         context.driver = context.browser_context.new_page()
         context.driver.set_default_timeout(30000)
     
-    context.login_page = LoginPage(context.driver)
+    context.login_page = pages.LoginPage(context.driver)
     context.login_page.navigate_to_login_page()
     # 验证页面加载成功
     assert context.driver.url.endswith('/login'), f"期望在登录页面，实际URL: {context.driver.url}"
@@ -206,8 +205,7 @@ def step_database_records_verification_code(context):
 def step_system_verification_success(context):
     """系统验证成功"""
     # 等待登录请求完成
-    import time
-    time.sleep(2)
+    pages.BasePage(context.driver).wait_for_api_idle(timeout=5000)
     
     # 检查是否有错误提示
     try:
@@ -227,10 +225,13 @@ def step_system_verification_success(context):
 @then('页面自动跳转到首页')
 def step_page_redirects_to_home(context):
     """页面自动跳转到首页"""
-    import time
-    
-    # 等待页面跳转
-    time.sleep(3)
+    # 等待页面跳转：URL变化、出现dashboard或localStorage写入登录状态，任一满足即可
+    pages.BasePage(context.driver).wait_for_js_condition(
+        """() => ['/home', '/dashboard'].some(part => location.href.includes(part))
+            || !!document.querySelector('.dashboard, [class*="dashboard"]')
+            || (!!localStorage.getItem('token') && !!localStorage.getItem('user'))""",
+        timeout=3000
+    )
     
     # 检查URL是否跳转
     current_url = context.driver.url
@@ -269,9 +270,10 @@ def step_page_redirects_to_home(context):
 @then('系统不让用户登录')
 def step_system_prevents_login(context):
     """系统不让用户登录"""
-    # 等待响应
-    import time
-    time.sleep(2)
+    # 等待响应：登录请求返回或出现错误提示
+    page = pages.BasePage(context.driver)
+    if not page.wait_for_api_idle(timeout=2000):
+        page.wait_for_any_visible(['.error', '.alert-danger', '[class*="error"]'], timeout=2000)
     
     # 检查是否仍在登录页面
     current_url = context.driver.url
@@ -315,9 +317,12 @@ def step_page_shows_message(context, message):
                 
                 context.driver.on("dialog", handle_dialog)
                 
-                # 等待一段时间看是否有弹窗出现
-                import time
-                time.sleep(2)
+                # 等待弹窗出现或登录状态写入localStorage
+                page = pages.BasePage(context.driver)
+                page.wait_for_condition(
+                    lambda: dialog_handled or bool(context.driver.evaluate("localStorage.getItem('token')")),
+                    timeout=2000
+                )
                 
                 if dialog_handled:
                     print("成功处理JavaScript弹窗")
@@ -340,8 +345,7 @@ def step_page_shows_message(context, message):
                         current_url = context.driver.url
                         print(f"当前页面URL: {current_url}")
                         # 等待页面可能的跳转
-                        import time
-                        time.sleep(3)
+                        page.wait_for_url_change(current_url, timeout=3000)
                         new_url = context.driver.url
                         print(f"等待后的页面URL: {new_url}")
                         
@@ -402,8 +406,15 @@ def step_get_verification_code_button_countdown(context):
     """获取验证码按钮开始倒计时"""
     # 等待按钮变为不可点击状态
     get_code_button = context.driver.locator('[data-testid="get-verification-code-btn"]')
-    # 等待按钮文本变化（开始倒计时）
-    context.driver.wait_for_timeout(1000)  # 等待1秒让倒计时开始
+    # 等待按钮文本变化（开始倒计时）或按钮被禁用
+    pages.BasePage(context.driver).wait_for_js_condition(
+        """(selector) => {
+            const button = document.querySelector(selector);
+            return !!button && (button.disabled || button.textContent.includes('秒'));
+        }""",
+        arg='[data-testid="get-verification-code-btn"]',
+        timeout=2000
+    )
     button_text = get_code_button.text_content()
     assert "秒" in button_text or not get_code_button.is_enabled(), "按钮应该开始倒计时或变为不可点击"
     print("获取验证码按钮开始倒计时")
@@ -413,7 +424,7 @@ def step_get_verification_code_button_countdown(context):
 @then('等待 {seconds:d} 秒')
 def step_wait_seconds(context, seconds):
     """等待指定秒数"""
-    time.sleep(seconds)
+    pages.BasePage(context.driver).sleep(seconds)
     print(f"等待了 {seconds} 秒")
 
 
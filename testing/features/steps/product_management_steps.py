@@ -3,9 +3,8 @@
 """
 import json
 import time
-from pytest_bdd import given, when, then, parsers
-from playwright.sync_api import Page, expect
-from pages.product_management_page import ProductListPage, ProductDetailPage
+from behave import given, when, then
+import pages
 from utils.api_helper import APIHelper
 from utils.test_data import TestDataManager
 from utils.config import Config
@@ -18,28 +17,28 @@ test_data_manager = TestDataManager()
 
 # 通用步骤定义
 @given('系统已经启动并运行正常')
-def step_system_is_running():
+def step_system_is_running(context):
     """系统已经启动并运行正常"""
     # 这是一个前置条件步骤，通常不需要具体实现
     # 在实际测试中，这表示系统环境已经准备就绪
     pass
 
 @given('系统中存在商品数据')
-def step_system_has_product_data():
+def step_system_has_product_data(context):
     """系统中存在商品数据"""
     # 这是一个前置条件步骤，确保系统中有测试商品数据
     # 在实际测试中，这表示数据库中已经有商品数据可供测试
     pass
 
-@given(parsers.parse('商品ID "{product_id}" 存在'))
-def step_product_id_exists(product_id):
+@given('商品ID "{product_id}" 存在')
+def step_product_id_exists(context, product_id):
     """商品ID存在"""
     # 这是一个前置条件步骤，确保指定ID的商品存在
     # 在实际测试中，这表示数据库中存在指定ID的商品
     pass
 
-@given(parsers.parse('商品ID "{product_id}" 不存在'))
-def step_product_id_not_exists(product_id):
+@given('商品ID "{product_id}" 不存在')
+def step_product_id_not_exists(context, product_id):
     """商品ID不存在"""
     # 这是一个前置条件步骤，确保指定ID的商品不存在
     # 在实际测试中，这表示数据库中不存在指定ID的商品
@@ -50,20 +49,20 @@ def step_product_id_not_exists(product_id):
 def step_user_on_product_list_page(context):
     """用户在商品列表页面"""
     # 初始化页面对象
-    context.product_page = ProductManagementPage(context.page)
+    context.product_page = pages.ProductListPage(context.page)
     
     # 导航到商品列表页面
     context.product_page.navigate_to_product_list()
     
     # 验证页面加载完成
-    expect(context.page.locator('[data-testid="product-list"]')).to_be_visible()
+    pages.expect(context.page.locator('[data-testid="product-list"]')).to_be_visible()
 
 
 @given('用户在商品详情页面')
 def step_user_on_product_detail_page(context):
     """用户在商品详情页面"""
     # 初始化页面对象
-    context.product_page = ProductManagementPage(context.page)
+    context.product_page = pages.ProductDetailPage(context.page)
     
     # 获取测试商品数据
     test_product = test_data_manager.get_product_by_id(1)
@@ -73,7 +72,7 @@ def step_user_on_product_detail_page(context):
     context.product_page.navigate_to_product_detail(test_product["id"])
     
     # 验证页面加载完成
-    expect(context.page.locator('[data-testid="product-detail"]')).to_be_visible()
+    pages.expect(context.page.locator('[data-testid="product-detail"]')).to_be_visible()
 
 
 @when('用户查看商品列表')
@@ -207,11 +206,11 @@ def step_user_clicks_add_to_cart(context):
 def step_display_product_list(context):
     """显示商品列表"""
     # 验证商品列表可见
-    expect(context.page.locator('[data-testid="product-list"]')).to_be_visible()
+    pages.expect(context.page.locator('[data-testid="product-list"]')).to_be_visible()
     
     # 验证至少有一个商品项
     product_items = context.page.locator('[data-testid="product-item"]')
-    expect(product_items.first()).to_be_visible()
+    pages.expect(product_items.first).to_be_visible()
 
 
 @then('每页显示{expected_count:d}个商品')
@@ -245,7 +244,7 @@ def step_display_expected_page_products(context, expected_page):
 def step_display_pagination_info(context):
     """显示分页信息"""
     # 验证分页组件可见
-    expect(context.page.locator('[data-testid="pagination"]')).to_be_visible()
+    pages.expect(context.page.locator('[data-testid="pagination"]')).to_be_visible()
     
     # 验证分页信息
     pagination_info = context.product_page.get_pagination_info()
@@ -333,10 +332,10 @@ def step_products_sorted_by_name_desc(context):
 def step_display_product_detail_info(context):
     """显示商品详情信息"""
     # 验证商品详情页面元素可见
-    expect(context.page.locator('[data-testid="product-detail"]')).to_be_visible()
-    expect(context.page.locator('[data-testid="product-name"]')).to_be_visible()
-    expect(context.page.locator('[data-testid="product-price"]')).to_be_visible()
-    expect(context.page.locator('[data-testid="product-description"]')).to_be_visible()
+    pages.expect(context.page.locator('[data-testid="product-detail"]')).to_be_visible()
+    pages.expect(context.page.locator('[data-testid="product-name"]')).to_be_visible()
+    pages.expect(context.page.locator('[data-testid="product-price"]')).to_be_visible()
+    pages.expect(context.page.locator('[data-testid="product-description"]')).to_be_visible()
     
     # 验证商品信息与测试数据匹配
     if hasattr(context, 'current_product'):
@@ -367,7 +366,7 @@ def step_redirect_to_product_detail_page(context):
     # 验证URL包含商品ID
     if hasattr(context, 'clicked_product_id'):
         expected_url_pattern = f"/product/{context.clicked_product_id}"
-        expect(context.page).to_have_url(Config.BASE_URL + expected_url_pattern)
+        pages.expect(context.page).to_have_url(Config().BASE_URL + expected_url_pattern)
 
 
 @then('显示商品大图')
@@ -375,7 +374,7 @@ def step_display_product_large_image(context):
     """显示商品大图"""
     # 验证大图模态框或放大图片可见
     large_image_modal = context.page.locator('[data-testid="product-image-modal"]')
-    expect(large_image_modal).to_be_visible()
+    pages.expect(large_image_modal).to_be_visible()
 
 
 @then('显示添加成功提示')
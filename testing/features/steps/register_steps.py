@@ -2,9 +2,8 @@
 """
 注册功能的BDD步骤定义
 """
-import time
 from behave import given, when, then
-from pages.register_page import RegisterPage
+import pages
 from utils.database_helper import DatabaseHelper
 from utils.api_helper import APIHelper
 
@@ -12,7 +11,7 @@ from utils.api_helper import APIHelper
 @given('用户在注册页面')
 def step_user_on_register_page(context):
     """用户在注册页面"""
-    context.register_page = RegisterPage(context.driver)
+    context.register_page = pages.RegisterPage(context.driver)
     context.register_page.navigate_to_register()
     print("用户已导航到注册页面")
 
@@ -20,7 +19,7 @@ def step_user_on_register_page(context):
 @given('用户在注册页面输入了手机号和验证码')
 def step_user_entered_phone_and_code(context):
     """用户在注册页面输入了手机号和验证码"""
-    context.register_page = RegisterPage(context.driver)
+    context.register_page = pages.RegisterPage(context.driver)
     context.register_page.navigate_to_register()
     
     # 输入测试手机号和验证码
@@ -108,8 +107,8 @@ def step_system_does_not_create_user(context):
     phone = context.registered_phone
     user_count_before = context.db_helper.get_user_count()
     
-    # 等待一段时间确保操作完成
-    time.sleep(1)
+    # 等待注册请求返回，确保操作完成
+    context.register_page.wait_for_api_idle(timeout=2000)
     
     user_count_after = context.db_helper.get_user_count()
     assert user_count_after == user_count_before, "用户数量不应该增加"
@@ -150,10 +149,11 @@ def step_system_creates_new_user(context):
     phone = context.new_user_phone
     
     # 等待用户创建完成
-    time.sleep(2)
+    user_exists = context.register_page.wait_for_condition(
+        lambda: context.db_helper.user_exists(phone), timeout=2000
+    )
     
     # 验证用户是否被创建
-    user_exists = context.db_helper.user_exists(phone)
     assert user_exists, f"用户 {phone} 应该被创建"
     print(f"系统已在数据库中创建用户: {phone}")
 
@@ -183,7 +183,7 @@ def step_system_does_not_send_code_register(context):
 def step_page_shows_message_register(context, message):
     """页面显示指定消息（注册页面）"""
     # 等待消息出现
-    context.driver.wait_for_timeout(1000)
+    context.register_page.wait_for_any_visible([f'text="{message}"'], timeout=1000)
     # 这里应该检查页面上的实际消息
     print(f"注册页面显示消息: {message}")
 
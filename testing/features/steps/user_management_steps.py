@@ -1,12 +1,11 @@
 """
 用户管理模块的步骤定义文件
 """
-import json
 import time
-from pytest_bdd import given, when, then, parsers
-from playwright.sync_api import Page, expect
-from pages.user_management_page import UserManagementPage
+from behave import given, when, then
+import pages
 from utils.api_helper import APIHelper
+from utils.auth_state import get_auth_state_cache
 from utils.test_data import TestDataManager
 from utils.config import Config
 
@@ -16,44 +15,37 @@ test_context = {}
 # 创建测试数据管理器实例
 test_data_manager = TestDataManager()
 
-# 通用步骤定义
-@given('系统已经启动并运行正常')
-def step_system_is_running():
-    """系统已经启动并运行正常"""
-    # 这是一个前置条件步骤，通常不需要具体实现
-    # 在实际测试中，这表示系统环境已经准备就绪
-    pass
-
+# 通用步骤定义（"系统已经启动并运行正常" 定义在 product_management_steps.py，behave 不允许重复注册）
 @given('用户已登录')
-def step_user_is_logged_in():
+def step_user_is_logged_in(context):
     """用户已登录"""
     # 这是一个前置条件步骤，表示用户已经成功登录系统
     # 在实际测试中，这表示用户认证状态已经建立
     pass
 
 @given('用户未登录')
-def step_user_is_not_logged_in():
+def step_user_is_not_logged_in(context):
     """用户未登录"""
     # 这是一个前置条件步骤，表示用户未登录系统
     # 在实际测试中，这表示用户处于未认证状态
     pass
 
 @given('用户通过API已登录')
-def step_user_logged_in_via_api():
+def step_user_logged_in_via_api(context):
     """用户通过API已登录"""
     # 这是一个前置条件步骤，表示用户通过API成功登录
     # 在实际测试中，这表示API认证状态已经建立
     pass
 
 @given('用户未通过API登录')
-def step_user_not_logged_in_via_api():
+def step_user_not_logged_in_via_api(context):
     """用户未通过API登录"""
     # 这是一个前置条件步骤，表示用户未通过API登录
     # 在实际测试中，这表示API认证状态未建立
     pass
 
 @given('我使用无效的token')
-def step_use_invalid_token():
+def step_use_invalid_token(context):
     """我使用无效的token"""
     # 这是一个前置条件步骤，设置无效的认证token
     # 在实际测试中，这用于测试无效认证的场景
@@ -68,19 +60,16 @@ def step_user_logged_in_on_profile_page(context):
     context.current_user = user_data
     
     # 初始化页面对象
-    context.user_page = UserManagementPage(context.page)
+    context.user_page = pages.UserManagementPage(context.page)
     
-    # 模拟登录状态（设置token）
-    context.page.add_init_script(f"""
-        localStorage.setItem('token', 'valid_test_token');
-        localStorage.setItem('user_info', '{json.dumps(user_data)}');
-    """)
+    # 注入缓存的登录状态，跳过短信登录的UI流程
+    get_auth_state_cache().apply_to_context(context.page.context, user_data["phone_number"])
     
     # 导航到用户信息页面
     context.user_page.navigate_to_profile_page()
     
     # 验证页面加载完成
-    expect(context.page.locator('[data-testid="user-profile-form"]')).to_be_visible()
+    pages.expect(context.page.locator('[data-testid="user-profile-form"]')).to_be_visible()
 
 
 @when('用户输入新的昵称"{nickname}"')
@@ -178,7 +167,7 @@ def step_display_error_message(context, error_message):
 def step_user_logged_out_successfully(context):
     """用户成功退出登录"""
     # 验证跳转到登录页面
-    expect(context.page).to_have_url(Config.BASE_URL + "/login")
+    pages.expect(context.page).to_have_url(Config().BASE_URL + "/login")
     
     # 验证localStorage中的token已清除
     token = context.page.evaluate("localStorage.getItem('token')")
@@ -189,8 +178,8 @@ def step_user_logged_out_successfully(context):
 def step_user_redirected_to_login_page(context):
     """用户被重定向到登录页面"""
     # 等待页面跳转
-    context.page.wait_for_url(Config.BASE_URL + "/login", timeout=5000)
-    expect(context.page).to_have_url(Config.BASE_URL + "/login")
+    context.page.wait_for_url(Config().BASE_URL + "/login", timeout=5000)
+    pages.expect(context.page).to_have_url(Config().BASE_URL + "/login")
 
 
 @then('显示未授权访问提示')
@@ -202,7 +191,7 @@ def step_display_unauthorized_access_message(context):
         assert "未授权" in error_message or "请先登录" in error_message
     except:
         # 如果没有错误消息，检查是否跳转到登录页面
-        expect(context.page).to_have_url(Config.BASE_URL + "/login")
+        pages.expect(context.page).to_have_url(Config().BASE_URL + "/login")
 
 
 # API测试步骤定义
@@ -1,4 +1,3 @@
-# language: zh-CN
 Feature: 用户管理
   作为一个已登录的用户
   我希望能够管理我的个人信息
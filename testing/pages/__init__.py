@@ -1,8 +1,26 @@
 """
 页面对象模型包
+页面对象依赖 Playwright，包级别的名称在第一次访问时才导入，
+纯API场景的步骤模块可以 import pages 而不加载浏览器相关模块
 """
-from .base_page import BasePage
-from .login_page import LoginPage
-from .register_page import RegisterPage
+import importlib
 
-__all__ = ["BasePage", "LoginPage", "RegisterPage"]
\ No newline at end of file
+_EXPORTS = {
+    "BasePage": ".base_page",
+    "LoginPage": ".login_page",
+    "RegisterPage": ".register_page",
+    "ProductListPage": ".product_management_page",
+    "ProductDetailPage": ".product_management_page",
+    "UserManagementPage": ".user_management_page",
+    "expect": "playwright.sync_api"
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
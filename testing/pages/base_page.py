@@ -1,9 +1,147 @@
 """
 基础页面类
 """
-from playwright.sync_api import Page, Locator, expect
-from typing import Optional
+from playwright.sync_api import Page, Locator, expect, Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+from typing import Callable, Dict, List, Optional
 import time
+import weakref
+from utils.asset_cache import get_active_asset_cache
+from utils.retry_policy import RetryPolicy
+from utils.wait_profiler import wait_profiler
+
+
+# 在页面内等待DOM在 quiet_ms 内没有变化（MutationObserver），超时后直接返回
+_DOM_STABLE_SCRIPT = """
+([selector, quietMs, timeoutMs]) => new Promise(resolve => {
+    const target = (selector && document.querySelector(selector)) || document.body;
+    let quietTimer = null;
+    let deadline = null;
+    const observer = new MutationObserver(() => {
+        clearTimeout(quietTimer);
+        quietTimer = setTimeout(done, quietMs);
+    });
+    function done() {
+        observer.disconnect();
+        clearTimeout(quietTimer);
+        clearTimeout(deadline);
+        resolve(true);
+    }
+    observer.observe(target, {childList: true, subtree: true, attributes: true, characterData: true});
+    quietTimer = setTimeout(done, quietMs);
+    deadline = setTimeout(done, timeoutMs);
+})
+"""
+
+
+# 当前URL已离开指定页面，或页面出现首页特征元素
+_HOME_READY_SCRIPT = """
+([leaving, indicators]) => {
+    const url = window.location.href;
+    if (url.includes('/home') || url.endsWith('/') || !url.includes(leaving)) {
+        return true;
+    }
+    return indicators.some(selector => {
+        const el = document.querySelector(selector);
+        return !!el && el.offsetParent !== null;
+    });
+}
+"""
+
+# 在页面内一次性提取列表中每一行的字段，字段规则见 BasePage.extract_table
+_EXTRACT_TABLE_SCRIPT = """
+(rows, [fields, visibleOnly]) => {
+    const isVisible = el => !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+    const read = (row, spec) => {
+        const at = spec.lastIndexOf('@');
+        const css = (at >= 0 ? spec.slice(0, at) : spec).trim();
+        const attr = at >= 0 ? spec.slice(at + 1) : null;
+        const el = css ? row.querySelector(css) : row;
+        if (!el) {
+            return '';
+        }
+        return (attr ? el.getAttribute(attr) : el.textContent) || '';
+    };
+    return rows
+        .filter(row => !visibleOnly || isVisible(row))
+        .map(row => Object.fromEntries(
+            Object.entries(fields).map(([name, spec]) => [name, read(row, spec)])
+        ));
+}
+"""
+
+_HOME_INDICATORS = [".user-info", ".home-content", ".main-content", "[data-testid='home']"]
+
+# 操作没有生效的 Playwright 错误：元素在操作前被重新渲染、仍在动画中、被遮挡或尚不可用。
+# Playwright 在动作超时前会一直自动重试这些情况，所以它们通常出现在 TimeoutError
+# 的调用日志（Call log）里，而不是单独的错误
+_UI_RETRYABLE_ERRORS = {
+    "not attached to the dom": "detached",
+    "detached from the dom": "detached",
+    "element is detached": "detached",
+    "not stable": "not_stable",
+    "intercepts pointer events": "intercepted",
+    "element is not enabled": "not_enabled",
+    "element is not editable": "not_enabled"
+}
+# 单次尝试的最短超时（毫秒）
+_UI_MIN_ATTEMPT_TIMEOUT = 1000
+
+
+def _ui_retry_reason(action: str):
+    """页面操作的重试判定
+
+    错误信息（含超时的调用日志）表明操作没有生效时重试；其余超时说明
+    等待的条件一直没有出现，不再重试。点击只在确定没有点到时重试，
+    填充是幂等的（先清空再填），其他 Playwright 错误也可以重试。
+    """
+    def classify(result, error):
+        if error is None or not isinstance(error, PlaywrightError):
+            return None
+        message = str(error).lower()
+        for marker, reason in _UI_RETRYABLE_ERRORS.items():
+            if marker in message:
+                return reason
+        if isinstance(error, PlaywrightTimeoutError):
+            return None
+        return "playwright_error" if action == "fill" else None
+    
+    return classify
+
+
+class _ApiRequestTracker:
+    """跟踪页面中进行中的 /api/ 请求"""
+    
+    def __init__(self, page: Page):
+        self.inflight = 0
+        self.last_activity = time.monotonic()
+        page.on("request", self._on_start)
+        page.on("requestfinished", self._on_end)
+        page.on("requestfailed", self._on_end)
+    
+    def _on_start(self, request):
+        if "/api/" in request.url:
+            self.inflight += 1
+            self.last_activity = time.monotonic()
+    
+    def _on_end(self, request):
+        if "/api/" in request.url:
+            self.inflight = max(self.inflight - 1, 0)
+            self.last_activity = time.monotonic()
+    
+    def is_idle(self, quiet_ms: int) -> bool:
+        return self.inflight == 0 and (time.monotonic() - self.last_activity) * 1000 >= quiet_ms
+
+
+_api_trackers = weakref.WeakKeyDictionary()
+
+
+def _api_tracker_for(page: Page) -> _ApiRequestTracker:
+    """每个页面只注册一次请求跟踪"""
+    tracker = _api_trackers.get(page)
+    if tracker is None:
+        tracker = _ApiRequestTracker(page)
+        _api_trackers[page] = tracker
+    return tracker
 
 
 class BasePage:
@@ -12,6 +150,8 @@ class BasePage:
     def __init__(self, page: Page):
         self.page = page
         self.timeout = 30000  # 30秒超时
+        self.retry_policy = RetryPolicy.from_config()
+        _api_tracker_for(page)
     
     def navigate_to(self, url: str):
         """导航到指定URL"""
@@ -22,7 +162,11 @@ class BasePage:
             full_url = f"{config.BASE_URL}{url}"
         else:
             full_url = url
-        self.page.goto(full_url)
+        asset_cache = get_active_asset_cache()
+        if asset_cache is not None:
+            asset_cache.goto(self.page, full_url)
+        else:
+            self.page.goto(full_url)
     
     def wait_for_page_load(self, timeout: int = 30000):
         """等待页面加载完成"""
@@ -32,23 +176,37 @@ class BasePage:
         """获取页面元素"""
         return self.page.locator(selector)
     
+    def _attempt_timeout(self, timeout: int) -> int:
+        """单次操作的超时：把 timeout 分给各次尝试，重试后总等待时间与不重试时相当"""
+        return max(timeout // (self.retry_policy.max_retries + 1), min(timeout, _UI_MIN_ATTEMPT_TIMEOUT))
+    
     def click_element(self, selector: str, timeout: int = None):
-        """点击元素"""
+        """点击元素，元素在点击前被重新渲染时按重试策略重试"""
         timeout = timeout or self.timeout
-        element = self.get_element(selector)
-        element.wait_for(state="visible", timeout=timeout)
-        # 确保元素可点击
-        element.wait_for(state="attached", timeout=timeout)
-        element.click(timeout=timeout)
+        action_timeout = self._attempt_timeout(timeout)
+        
+        def attempt():
+            element = self.get_element(selector)
+            element.wait_for(state="visible", timeout=timeout)
+            # 确保元素可点击
+            element.wait_for(state="attached", timeout=timeout)
+            element.click(timeout=action_timeout)
+        
+        self.retry_policy.run(attempt, _ui_retry_reason("click"), f"click {selector}")
     
     def fill_input(self, selector: str, text: str, timeout: int = None):
-        """填充输入框"""
+        """填充输入框，失败时按重试策略重试"""
         timeout = timeout or self.timeout
-        element = self.get_element(selector)
-        element.wait_for(state="visible", timeout=timeout)
-        element.wait_for(state="attached", timeout=timeout)
-        element.clear()
-        element.fill(text, timeout=timeout)
+        action_timeout = self._attempt_timeout(timeout)
+        
+        def attempt():
+            element = self.get_element(selector)
+            element.wait_for(state="visible", timeout=timeout)
+            element.wait_for(state="attached", timeout=timeout)
+            element.clear(timeout=action_timeout)
+            element.fill(text, timeout=action_timeout)
+        
+        self.retry_policy.run(attempt, _ui_retry_reason("fill"), f"fill {selector}")
     
     def get_text(self, selector: str, timeout: int = None) -> str:
         """获取元素文本"""
@@ -110,8 +268,96 @@ class BasePage:
             return self.page.screenshot()
     
     def wait_for_timeout(self, timeout: int):
-        """等待指定时间（毫秒）"""
-        self.page.wait_for_timeout(timeout)
+        """等待指定时间（毫秒），计入固定等待耗时"""
+        with wait_profiler.measure("fixed_sleep"):
+            self.page.wait_for_timeout(timeout)
+    
+    # 条件等待：满足条件立即返回，超时返回空结果而不抛出异常
+    def wait_for_any_visible(self, selectors: List[str], timeout: int = None) -> Optional[Locator]:
+        """等待多个选择器中任意一个元素可见，返回该元素"""
+        timeout = timeout or self.timeout
+        # visible=true 过滤掉隐藏的匹配项，避免 .first 落在不可见元素上
+        locator = None
+        for selector in selectors:
+            candidate = self.page.locator(f"{selector} >> visible=true")
+            locator = candidate if locator is None else locator.or_(candidate)
+        element = locator.first
+        with wait_profiler.measure("condition_wait"):
+            try:
+                element.wait_for(state="visible", timeout=timeout)
+                return element
+            except PlaywrightTimeoutError:
+                return None
+    
+    def wait_for_hidden(self, selector: str, timeout: int = None) -> bool:
+        """等待元素隐藏或移除（如加载动画）"""
+        timeout = timeout or self.timeout
+        with wait_profiler.measure("condition_wait"):
+            try:
+                self.page.wait_for_selector(selector, state="hidden", timeout=timeout)
+                return True
+            except PlaywrightTimeoutError:
+                return False
+    
+    def wait_for_dom_stable(self, selector: str = None, quiet_ms: int = 100, timeout: int = 5000):
+        """等待DOM在 quiet_ms 毫秒内不再变化，用于替代操作后的固定等待"""
+        with wait_profiler.measure("condition_wait"):
+            self.page.evaluate(_DOM_STABLE_SCRIPT, [selector, quiet_ms, timeout])
+    
+    def wait_for_js_condition(self, expression: str, arg=None, timeout: int = None) -> bool:
+        """等待页面内的JS条件成立"""
+        timeout = timeout or self.timeout
+        with wait_profiler.measure("condition_wait"):
+            try:
+                self.page.wait_for_function(expression, arg=arg, timeout=timeout)
+                return True
+            except PlaywrightTimeoutError:
+                return False
+    
+    def wait_for_condition(self, predicate: Callable[[], bool], timeout: int = None, interval: int = 50) -> bool:
+        """轮询Python侧条件直到成立（轮询期间继续处理页面事件）"""
+        timeout = timeout or self.timeout
+        deadline = time.monotonic() + timeout / 1000
+        with wait_profiler.measure("condition_wait"):
+            while True:
+                if predicate():
+                    return True
+                if time.monotonic() >= deadline:
+                    return False
+                self.page.wait_for_timeout(interval)
+    
+    def wait_for_url_change(self, previous_url: str, timeout: int = None) -> bool:
+        """等待URL离开 previous_url"""
+        timeout = timeout or self.timeout
+        with wait_profiler.measure("condition_wait"):
+            try:
+                self.page.wait_for_url(lambda url: url != previous_url, timeout=timeout)
+                return True
+            except PlaywrightTimeoutError:
+                return False
+    
+    def wait_for_api_idle(self, quiet_ms: int = 100, timeout: int = None) -> bool:
+        """等待页面发出的API请求全部返回，且 quiet_ms 毫秒内没有新的API请求"""
+        tracker = _api_tracker_for(self.page)
+        return self.wait_for_condition(lambda: tracker.is_idle(quiet_ms), timeout=timeout, interval=25)
+    
+    def wait_for_home_page(self, leaving: str, timeout: int = 10000) -> bool:
+        """等待URL离开 leaving 所在页面，或首页特征元素出现"""
+        return self.wait_for_js_condition(_HOME_READY_SCRIPT, arg=[leaving, _HOME_INDICATORS], timeout=timeout)
+    
+    def sleep(self, seconds: float):
+        """固定等待（仅用于场景明确要求等待时长的情况），计入固定等待耗时"""
+        with wait_profiler.measure("fixed_sleep"):
+            self.page.wait_for_timeout(seconds * 1000)
+    
+    def extract_table(self, selector: str, fields: Dict[str, str], visible_only: bool = False) -> List[Dict[str, str]]:
+        """一次浏览器调用提取列表中所有行的字段
+        
+        selector 匹配每一行，fields 为 {字段名: 规则}，规则写法：
+        "css" 取子元素文本，"css@attr" 取子元素属性，"@attr" 取行元素自身
+        属性，"" 取行元素自身文本；找不到的字段返回空字符串。
+        """
+        return self.page.locator(selector).evaluate_all(_EXTRACT_TABLE_SCRIPT, [fields, visible_only])
     
     def get_element_attribute(self, selector: str, attribute: str) -> str:
         """获取元素属性"""
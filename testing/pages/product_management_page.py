@@ -1,17 +1,17 @@
 """
 商品管理页面的Page Object Model
 """
-import time
 from playwright.sync_api import Page, expect, Locator
+from pages.base_page import BasePage
 from utils.config import Config
 
 
-class ProductListPage:
+class ProductListPage(BasePage):
     """商品列表页面对象"""
     
     def __init__(self, page: Page):
-        self.page = page
-        self.base_url = Config.BASE_URL
+        super().__init__(page)
+        self.base_url = Config().BASE_URL
         
         # 页面元素定位器
         self.product_list_container = '[data-testid="product-list-container"]'
@@ -84,22 +84,13 @@ class ProductListPage:
         """获取商品列表"""
         try:
             self.wait_for_page_load()
-            product_elements = self.page.locator(self.product_items).all()
-            
-            products = []
-            for element in product_elements:
-                try:
-                    product = {
-                        "title": element.locator(self.product_title).text_content() or "",
-                        "price": element.locator(self.product_price).text_content() or "",
-                        "category": element.locator(self.product_category).text_content() or "",
-                        "image_src": element.locator(self.product_image).get_attribute("src") or ""
-                    }
-                    products.append(product)
-                except:
-                    continue
-            
-            return products
+            # 一次调用提取全部商品卡片，避免每个商品多次往返浏览器
+            return self.extract_table(self.product_items, {
+                "title": self.product_title,
+                "price": self.product_price,
+                "category": self.product_category,
+                "image_src": f"{self.product_image}@src"
+            })
         except:
             return []
     
@@ -124,13 +115,13 @@ class ProductListPage:
     
     def wait_for_search_results(self):
         """等待搜索结果加载"""
-        try:
-            self.page.wait_for_selector(self.loading_spinner, state="hidden", timeout=10000)
-        except:
-            pass
-        
-        # 等待一下让结果稳定
-        time.sleep(0.5)
+        self.wait_for_list_update()
+    
+    def wait_for_list_update(self, timeout: int = 10000):
+        """等待加载动画消失、列表接口返回且列表DOM稳定"""
+        self.wait_for_hidden(self.loading_spinner, timeout=timeout)
+        self.wait_for_api_idle(timeout=timeout)
+        self.wait_for_dom_stable(self.product_list_container, timeout=timeout)
     
     def clear_search(self):
         """清空搜索"""
@@ -165,12 +156,7 @@ class ProductListPage:
     
     def wait_for_filter_results(self):
         """等待筛选结果加载"""
-        try:
-            self.page.wait_for_selector(self.loading_spinner, state="hidden", timeout=10000)
-        except:
-            pass
-        
-        time.sleep(0.5)
+        self.wait_for_list_update()
     
     def sort_by_price_ascending(self):
         """按价格升序排序"""
@@ -195,11 +181,9 @@ class ProductListPage:
             sort_dropdown = self.page.locator(self.sort_dropdown)
             sort_dropdown.click()
             
-            # 等待下拉选项出现
-            time.sleep(0.3)
-            
-            # 点击具体排序选项
+            # 等待下拉选项出现后点击具体排序选项
             sort_option = self.page.locator(sort_option_selector)
+            sort_option.wait_for(state="visible", timeout=5000)
             sort_option.click()
             
             self.wait_for_sort_results()
@@ -208,12 +192,7 @@ class ProductListPage:
     
     def wait_for_sort_results(self):
         """等待排序结果加载"""
-        try:
-            self.page.wait_for_selector(self.loading_spinner, state="hidden", timeout=10000)
-        except:
-            pass
-        
-        time.sleep(0.5)
+        self.wait_for_list_update()
     
     def set_page_size(self, page_size: int):
         """设置每页显示数量"""
@@ -264,20 +243,16 @@ class ProductListPage:
     
     def wait_for_pagination_update(self):
         """等待分页更新"""
-        try:
-            self.page.wait_for_selector(self.loading_spinner, state="hidden", timeout=10000)
-        except:
-            pass
-        
-        time.sleep(0.5)
+        self.wait_for_list_update()
     
     def click_product(self, product_index: int = 0):
         """点击商品进入详情页"""
         try:
             product_elements = self.page.locator(self.product_items)
             if product_index < product_elements.count():
+                current_url = self.page.url
                 product_elements.nth(product_index).click()
-                time.sleep(1)  # 等待页面跳转
+                self.wait_for_url_change(current_url, timeout=5000)  # 等待页面跳转
         except:
             pass
     
@@ -285,8 +260,9 @@ class ProductListPage:
         """根据标题点击商品"""
         try:
             product_element = self.page.locator(self.product_items).filter(has_text=title)
+            current_url = self.page.url
             product_element.click()
-            time.sleep(1)
+            self.wait_for_url_change(current_url, timeout=5000)
         except:
             pass
     
@@ -353,12 +329,12 @@ class ProductListPage:
             return ""
 
 
-class ProductDetailPage:
+class ProductDetailPage(BasePage):
     """商品详情页面对象"""
     
     def __init__(self, page: Page):
-        self.page = page
-        self.base_url = Config.BASE_URL
+        super().__init__(page)
+        self.base_url = Config().BASE_URL
         
         # 页面元素定位器
         self.product_detail_container = '[data-testid="product-detail-container"]'
@@ -448,11 +424,8 @@ class ProductDetailPage:
         """获取商品图片列表"""
         images = []
         try:
-            image_elements = self.page.locator(self.product_images).all()
-            for img in image_elements:
-                src = img.get_attribute("src")
-                if src:
-                    images.append(src)
+            rows = self.extract_table(self.product_images, {"src": "@src"})
+            images = [row["src"] for row in rows if row["src"]]
         except:
             pass
         
@@ -464,7 +437,7 @@ class ProductDetailPage:
             image_elements = self.page.locator(self.product_images)
             if image_index < image_elements.count():
                 image_elements.nth(image_index).click()
-                time.sleep(0.5)  # 等待图片切换
+                self.wait_for_dom_stable(self.main_image, timeout=2000)  # 等待图片切换
         except:
             pass
     
@@ -474,7 +447,7 @@ class ProductDetailPage:
             thumbnail_elements = self.page.locator(self.thumbnail_images)
             if thumbnail_index < thumbnail_elements.count():
                 thumbnail_elements.nth(thumbnail_index).click()
-                time.sleep(0.5)
+                self.wait_for_dom_stable(self.main_image, timeout=2000)
         except:
             pass
     
@@ -535,8 +508,9 @@ class ProductDetailPage:
         """立即购买"""
         try:
             buy_btn = self.page.locator(self.buy_now_button)
+            current_url = self.page.url
             buy_btn.click()
-            time.sleep(1)  # 等待页面跳转
+            self.wait_for_url_change(current_url, timeout=5000)  # 等待页面跳转
         except:
             pass
     
@@ -544,12 +518,13 @@ class ProductDetailPage:
         """返回上一页"""
         try:
             back_btn = self.page.locator(self.back_button)
+            current_url = self.page.url
             if back_btn.is_visible():
                 back_btn.click()
             else:
                 self.page.go_back()
             
-            time.sleep(1)
+            self.wait_for_url_change(current_url, timeout=5000)
         except:
             self.page.go_back()
     
@@ -609,8 +584,9 @@ class ProductDetailPage:
         """点击面包屑导航链接"""
         try:
             breadcrumb_link = self.page.locator(self.breadcrumb_links).filter(has_text=link_text)
+            current_url = self.page.url
             breadcrumb_link.click()
-            time.sleep(1)
+            self.wait_for_url_change(current_url, timeout=5000)
         except:
             pass
     
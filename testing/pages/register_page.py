@@ -5,7 +5,6 @@
 
 from playwright.sync_api import Page, expect
 from .base_page import BasePage
-import time
 import re
 
 
@@ -35,7 +34,8 @@ class RegisterPage(BasePage):
     def navigate_to_register_page(self):
         """导航到注册页面"""
         try:
-            self.page.goto("http://localhost:3000/register", timeout=30000)
+            from utils.config import Config
+            self.page.goto(f"{Config().BASE_URL}/register", timeout=30000)
             self.wait_for_element(self.register_form, timeout=15000)
             
             # 等待手机号输入框可见
@@ -278,12 +278,9 @@ class RegisterPage(BasePage):
             ]
             
             for selector in selectors:
-                elements = self.page.locator(selector)
-                if elements.count() > 0:
-                    for i in range(elements.count()):
-                        element = elements.nth(i)
-                        if element.is_visible():
-                            return element.text_content().strip()
+                visible = self.extract_table(selector, {"text": ""}, visible_only=True)
+                if visible:
+                    return visible[0]["text"].strip()
             
             return ""
         except Exception as e:
@@ -304,12 +301,9 @@ class RegisterPage(BasePage):
             ]
             
             for selector in selectors:
-                elements = self.page.locator(selector)
-                if elements.count() > 0:
-                    for i in range(elements.count()):
-                        element = elements.nth(i)
-                        if element.is_visible():
-                            return element.text_content().strip()
+                visible = self.extract_table(selector, {"text": ""}, visible_only=True)
+                if visible:
+                    return visible[0]["text"].strip()
             
             return ""
         except Exception as e:
@@ -327,7 +321,7 @@ class RegisterPage(BasePage):
     def wait_for_error_message(self, timeout: int = 15000):
         """等待错误消息出现"""
         try:
-            # 尝试多个错误消息选择器
+            # 任一错误消息选择器可见即返回
             selectors = [
                 ".error-message",
                 ".toast-error",
@@ -335,17 +329,9 @@ class RegisterPage(BasePage):
                 "[class*='error']"
             ]
             
-            for selector in selectors:
-                try:
-                    element = self.page.locator(selector).first
-                    element.wait_for(state="visible", timeout=5000)
-                    if element.is_visible():
-                        return element.text_content().strip()
-                except:
-                    continue
-            
-            # 如果没有找到错误消息，等待一下再检查
-            time.sleep(2)
+            element = self.wait_for_any_visible(selectors, timeout=timeout)
+            if element is not None:
+                return (element.text_content() or "").strip()
             return self.get_error_message()
             
         except Exception as e:
@@ -355,25 +341,17 @@ class RegisterPage(BasePage):
     def wait_for_success_message(self, timeout: int = 15000):
         """等待成功消息出现"""
         try:
-            # 尝试多个成功消息选择器
+            # 任一成功消息选择器可见即返回
             selectors = [
                 ".success-message",
                 ".toast-success",
-                ".message.success", 
+                ".message.success",
                 "[class*='success']"
             ]
             
-            for selector in selectors:
-                try:
-                    element = self.page.locator(selector).first
-                    element.wait_for(state="visible", timeout=5000)
-                    if element.is_visible():
-                        return element.text_content().strip()
-                except:
-                    continue
-            
-            # 如果没有找到成功消息，等待一下再检查
-            time.sleep(2)
+            element = self.wait_for_any_visible(selectors, timeout=timeout)
+            if element is not None:
+                return (element.text_content() or "").strip()
             return self.get_success_message()
             
         except Exception as e:
@@ -384,27 +362,7 @@ class RegisterPage(BasePage):
         """等待跳转到首页"""
         try:
             # 等待URL变化或首页特征元素出现
-            start_time = time.time()
-            while time.time() - start_time < timeout / 1000:
-                current_url = self.page.url
-                if "/home" in current_url or current_url.endswith("/") or "register" not in current_url:
-                    return True
-                
-                # 检查是否有用户信息等首页特征
-                home_indicators = [
-                    ".user-info",
-                    ".home-content",
-                    ".main-content", 
-                    "[data-testid='home']"
-                ]
-                
-                for indicator in home_indicators:
-                    if self.page.locator(indicator).is_visible():
-                        return True
-                
-                time.sleep(0.5)
-            
-            return False
+            return self.wait_for_home_page("register", timeout=timeout)
             
         except Exception as e:
             print(f"等待跳转到首页失败: {e}")
@@ -414,14 +372,7 @@ class RegisterPage(BasePage):
         """等待跳转到登录页面"""
         try:
             # 等待URL变化到登录页面
-            start_time = time.time()
-            while time.time() - start_time < timeout / 1000:
-                current_url = self.page.url
-                if "/login" in current_url:
-                    return True
-                time.sleep(0.5)
-            
-            return False
+            return self.wait_for_js_condition("() => window.location.href.includes('/login')", timeout=timeout)
             
         except Exception as e:
             print(f"等待跳转到登录页面失败: {e}")
@@ -1,17 +1,17 @@
 """
 用户管理页面的Page Object Model
 """
-import time
 from playwright.sync_api import Page, expect, Locator
+from pages.base_page import BasePage
 from utils.config import Config
 
 
-class UserManagementPage:
+class UserManagementPage(BasePage):
     """用户管理页面对象"""
     
     def __init__(self, page: Page):
-        self.page = page
-        self.base_url = Config.BASE_URL
+        super().__init__(page)
+        self.base_url = Config().BASE_URL
         
         # 页面元素定位器
         self.profile_form = '[data-testid="user-profile-form"]'
@@ -109,13 +109,14 @@ class UserManagementPage:
     def click_logout_button(self):
         """点击退出登录按钮"""
         logout_btn = self.page.locator(self.logout_button)
+        current_url = self.page.url
         logout_btn.click()
         
         # 处理可能的确认对话框
         self.handle_logout_confirmation()
         
         # 等待页面跳转
-        time.sleep(1)
+        self.wait_for_url_change(current_url, timeout=5000)
     
     def handle_logout_confirmation(self):
         """处理退出登录确认对话框"""
@@ -223,16 +224,16 @@ class UserManagementPage:
     def wait_for_nickname_validation(self):
         """等待昵称验证完成"""
         try:
-            # 等待验证消息出现或消失
-            self.page.wait_for_timeout(1000)  # 给验证一些时间
+            # 等待表单内验证消息渲染完成
+            self.wait_for_dom_stable(self.profile_form, timeout=1000)
         except:
             pass
     
     def wait_for_avatar_url_validation(self):
         """等待头像URL验证完成"""
         try:
-            # 等待验证消息出现或消失
-            self.page.wait_for_timeout(1000)  # 给验证一些时间
+            # 等待表单内验证消息渲染完成
+            self.wait_for_dom_stable(self.profile_form, timeout=1000)
         except:
             pass
     
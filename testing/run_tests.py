@@ -6,18 +6,20 @@
 
 import os
 import sys
+import json
 import subprocess
 import argparse
 from pathlib import Path
 
 
-def run_command(cmd, cwd=None):
+def run_command(cmd, cwd=None, env=None):
     """执行命令并返回结果"""
     try:
         result = subprocess.run(
             cmd, 
             shell=True, 
             cwd=cwd, 
+            env=env,
             capture_output=True, 
             text=True,
             encoding='utf-8'
@@ -59,7 +61,8 @@ def setup_environment():
 
 
 def run_tests(test_type="all", feature=None, scenario=None, browser="chromium", 
-              headless=True, report_format="html", parallel=False):
+              headless=True, report_format="html", parallel=False, mock_api=False,
+              changed_since=None, collect_impact=False, start_backend=False, start_frontend=False):
     """运行测试"""
     
     # 构建pytest命令
@@ -92,9 +95,29 @@ def run_tests(test_type="all", feature=None, scenario=None, browser="chromium",
     if not headless:
         cmd_parts.append("--headed")
     
-    # 添加并行执行
+    # 添加并行执行：每个worker使用独立的后端、数据库副本和手机号段；
+    # 按上次运行记录的耗时从长到短分组，浏览器测试和API测试分开
+    env = None
     if parallel:
-        cmd_parts.extend(["-n", "auto"])
+        cmd_parts.extend(["-n", "auto", "--dist", "loadgroup", "--lpt"])
+        env = os.environ.copy()
+        env["WORKER_ISOLATION"] = "true"
+    
+    # 模拟后端模式：UI测试不依赖Node后端，完整链路用 --type smoke 单独运行
+    if mock_api:
+        cmd_parts.append("--mock-api")
+    
+    # 自动启动（或复用上次运行留下的）后端和前端开发服务器
+    if start_backend:
+        cmd_parts.append("--start-backend")
+    if start_frontend:
+        cmd_parts.append("--start-frontend")
+    
+    # 测试影响分析：只运行受改动影响的测试 / 更新依赖索引
+    if changed_since:
+        cmd_parts.append(f"--changed-since={changed_since}")
+    if collect_impact:
+        cmd_parts.append("--collect-impact")
     
     # 添加报告生成
     reports_dir = Path("reports")
@@ -128,7 +151,7 @@ def run_tests(test_type="all", feature=None, scenario=None, browser="chromium",
     cmd = " ".join(cmd_parts)
     print(f"🚀 执行测试命令: {cmd}")
     
-    success, stdout, stderr = run_command(cmd)
+    success, stdout, stderr = run_command(cmd, env=env)
     
     if success:
         print("✅ 测试执行完成")
@@ -146,10 +169,53 @@ def run_tests(test_type="all", feature=None, scenario=None, browser="chromium",
         return False
 
 
+def run_load_test(concurrency_levels=None, durations=None, output="reports/load_test_report.json"):
+    """运行负载测试"""
+    from utils.load_generator import LoadGenerator, load_performance_settings
+    
+    settings = load_performance_settings()
+    concurrency_levels = concurrency_levels or settings["concurrent_users"]
+    durations = durations or settings["load_test_duration"]
+    
+    generator = LoadGenerator()
+    print(f"🚀 执行负载测试: 并发数 {concurrency_levels}, 持续时间 {durations} 秒")
+    try:
+        generator.prepare_users(max(concurrency_levels))
+        results = generator.run(concurrency_levels, durations)
+    finally:
+        # 压测用户和验证码写在后端使用的数据库中，结束后删除
+        generator.cleanup()
+    
+    for result in results:
+        print(f"\n👥 并发数 {result['concurrent_users']}, 持续 {result['duration_seconds']} 秒: "
+              f"{result['throughput_rps']} req/s, 错误率 {result['error_rate']:.2%}")
+        for endpoint, stats in result["endpoints"].items():
+            print(f"  {endpoint:<24} {stats['throughput_rps']:>8} req/s  "
+                  f"p50 {stats['p50_ms']:>8}ms  p95 {stats['p95_ms']:>8}ms  "
+                  f"p99 {stats['p99_ms']:>8}ms  错误率 {stats['error_rate']:.2%}  状态码 {stats['status_codes']}")
+    
+    output_path = Path(output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"\n📊 负载测试报告: {output_path}")
+    
+    return all(result["total_requests"] > 0 for result in results)
+
+
 def main():
     """主函数"""
     parser = argparse.ArgumentParser(description="淘贝应用自动化测试运行器")
     
+    parser.add_argument(
+        "command",
+        nargs="?",
+        choices=["test", "load", "report"],
+        default="test",
+        help="test: 运行测试 (默认); load: 按 test_data/performance.json 运行负载测试; "
+             "report: 从 reports/results.jsonl 生成HTML报告"
+    )
+    
     parser.add_argument(
         "--type", 
         choices=["all", "ui", "api", "login", "register", "smoke"],
@@ -191,7 +257,63 @@ def main():
     parser.add_argument(
         "--parallel",
         action="store_true",
-        help="并行执行测试"
+        help="并行执行测试（每个worker独立的后端和数据库）"
+    )
+    
+    parser.add_argument(
+        "--mock-api",
+        action="store_true",
+        help="页面的商品和认证接口使用进程内模拟后端（快速模式，配合 --type ui）"
+    )
+    
+    parser.add_argument(
+        "--start-backend",
+        action="store_true",
+        help="自动启动后端服务，测试结束后保持运行，下次运行直接复用"
+    )
+    
+    parser.add_argument(
+        "--start-frontend",
+        action="store_true",
+        help="同时自动启动 Vite 开发服务器"
+    )
+    
+    parser.add_argument(
+        "--stop-servers",
+        action="store_true",
+        help="停止 --start-backend/--start-frontend 保留运行的服务后退出"
+    )
+    
+    parser.add_argument(
+        "--changed-since",
+        metavar="GIT_REF",
+        help="只运行受相对 GIT_REF 的改动影响的测试（依赖 .test_impact.json 索引）"
+    )
+    
+    parser.add_argument(
+        "--collect-impact",
+        action="store_true",
+        help="运行时采集每个测试的依赖，更新 .test_impact.json 索引"
+    )
+    
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        nargs="+",
+        help="负载测试并发数 (默认: performance.json 中的 concurrent_users)"
+    )
+    
+    parser.add_argument(
+        "--duration",
+        type=float,
+        nargs="+",
+        help="负载测试持续时间（秒） (默认: performance.json 中的 load_test_duration)"
+    )
+    
+    parser.add_argument(
+        "--load-output",
+        default="reports/load_test_report.json",
+        help="负载测试报告路径 (默认: reports/load_test_report.json)"
     )
     
     parser.add_argument(
@@ -205,6 +327,20 @@ def main():
     print("🎯 淘贝应用自动化测试运行器")
     print("=" * 50)
     
+    if args.stop_servers:
+        from utils.backend_server import stop_recorded_servers
+        from utils.config import Config
+        stopped = stop_recorded_servers(Config().SERVER_STATE_DIR)
+        print(f"🛑 已停止: {', '.join(stopped) if stopped else '无运行中的服务'}")
+        return
+    
+    # 报告后处理不需要测试环境
+    if args.command == "report":
+        from utils.stream_reporter import build_html
+        summary = build_html()
+        print(f"📊 HTML报告: reports/stream_report.html ({summary['total']} 个测试, {summary['counts']})")
+        return
+    
     # 设置环境
     if not setup_environment():
         sys.exit(1)
@@ -213,6 +349,11 @@ def main():
         print("✅ 环境设置完成，退出")
         return
     
+    if args.command == "load":
+        if not run_load_test(args.concurrency, args.duration, args.load_output):
+            sys.exit(1)
+        return
+    
     # 运行测试
     success = run_tests(
         test_type=args.type,
@@ -221,7 +362,12 @@ def main():
         browser=args.browser,
         headless=not args.headed,
         report_format=args.report,
-        parallel=args.parallel
+        parallel=args.parallel,
+        mock_api=args.mock_api,
+        changed_since=args.changed_since,
+        collect_impact=args.collect_impact,
+        start_backend=args.start_backend,
+        start_frontend=args.start_frontend
     )
     
     if not success:
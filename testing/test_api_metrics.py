@@ -0,0 +1,108 @@
+"""
+API调用指标测试 - 使用本地HTTP服务，不依赖后端服务
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from utils.api_helper import APIHelper
+from utils.api_metrics import APIMetrics, LatencyHistogram, normalize_endpoint
+from utils.config import Config
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def _reply(self):
+        body = json.dumps({"success": True}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._reply()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._reply()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_server():
+    """本地HTTP服务"""
+    server = HTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/api"
+    server.shutdown()
+    server.server_close()
+
+
+class TestLatencyHistogram:
+    """延迟直方图测试"""
+
+    def test_percentiles_within_precision(self):
+        """分位数误差在有效数字精度内"""
+        histogram = LatencyHistogram()
+        for value in range(1, 10001):
+            histogram.record(value / 10)
+        assert histogram.count == 10000
+        assert histogram.percentile(50) == pytest.approx(500, rel=0.01)
+        assert histogram.percentile(99) == pytest.approx(990, rel=0.01)
+        assert histogram.percentile(100) == 1000
+        assert len(histogram.counts) < 2000
+
+    def test_merge_and_round_trip(self):
+        """直方图可以序列化并合并"""
+        first, second = LatencyHistogram(), LatencyHistogram()
+        first.record(1.5)
+        second.record(250)
+        merged = LatencyHistogram.from_dict(first.to_dict())
+        merged.merge(second)
+        assert merged.count == 2
+        assert merged.min == 1.5
+        assert merged.max == 250
+
+
+def test_normalize_endpoint():
+    """数字ID归一化"""
+    assert normalize_endpoint("/products/12") == "/products/{id}"
+    assert normalize_endpoint("products/12/reviews") == "/products/{id}/reviews"
+    assert normalize_endpoint("/auth/login") == "/auth/login"
+
+
+def test_api_helper_records_calls(local_server):
+    """APIHelper记录每次调用的耗时、建连耗时和字节数"""
+    config = Config()
+    config.API_BASE_URL = local_server
+    metrics = APIMetrics()
+    api = APIHelper(config, metrics=metrics)
+
+    api.login("13800138001", "123456")
+    api.get_product_detail(1)
+    api.get_product_detail(2)
+
+    summary = metrics.summary()
+    login = summary["POST /auth/login"]
+    detail = summary["GET /products/{id}"]
+    assert login["wall_ms"]["count"] == 1
+    assert login["connect_ms"]["max"] > 0
+    assert login["bytes_sent"] > 0
+    assert login["bytes_received"] > 0
+    assert detail["wall_ms"]["count"] == 2
+    assert detail["status_codes"] == {"200": 2}
+
+
+def test_api_helper_without_metrics_records_nothing(local_server, monkeypatch):
+    """未启用指标采集时不记录"""
+    monkeypatch.setattr("utils.api_metrics._active_metrics", None)
+    config = Config()
+    config.API_BASE_URL = local_server
+    api = APIHelper(config)
+    assert api.metrics is None
+    assert api.get_products().status_code == 200
@@ -1,24 +1,33 @@
 """
 API模块测试 - 用户管理和商品管理功能验证
 """
-import requests
 import pytest
 
-BASE_URL = 'http://localhost:3001/api'
+from utils.circuit_breaker import guarded_request
+from utils.config import Config
+
+# 需要后端服务：会话中第一次用到时执行运行前预检（并按配置自动启动后端）；
+# 请求都经过熔断器，后端不可用时统一跳过而不是逐个报连接失败
+pytestmark = pytest.mark.usefixtures("preflight")
+
+
+def api_url(endpoint: str) -> str:
+    """测试运行时再读取API地址，--start-backend 自动启动的后端会覆盖 API_BASE_URL"""
+    return Config().get_api_url(endpoint)
 
 class TestUserManagementAPI:
     """用户管理API测试"""
     
     def test_get_user_profile_without_auth(self):
         """测试未认证状态下获取用户信息"""
-        response = requests.get(f'{BASE_URL}/user/profile')
+        response = guarded_request("GET", api_url('user/profile'), timeout=10)
         # 预期返回401未授权或404未找到
         assert response.status_code in [401, 404, 500], f"预期401/404/500，实际: {response.status_code}"
     
     def test_update_user_profile_without_auth(self):
         """测试未认证状态下更新用户信息"""
         update_data = {'nickname': '测试用户', 'avatar': 'https://example.com/avatar.jpg'}
-        response = requests.put(f'{BASE_URL}/user/profile', json=update_data)
+        response = guarded_request("PUT", api_url('user/profile'), json=update_data, timeout=10)
         # 预期返回401未授权或404未找到
         assert response.status_code in [401, 404, 500], f"预期401/404/500，实际: {response.status_code}"
 
@@ -27,7 +36,7 @@ class TestProductManagementAPI:
     
     def test_get_products_list(self):
         """测试获取商品列表"""
-        response = requests.get(f'{BASE_URL}/products')
+        response = guarded_request("GET", api_url('products'), timeout=10)
         print(f'商品列表API状态: {response.status_code}')
         
         if response.status_code == 200:
@@ -44,7 +53,7 @@ class TestProductManagementAPI:
     
     def test_get_product_detail(self):
         """测试获取商品详情"""
-        response = requests.get(f'{BASE_URL}/products/1')
+        response = guarded_request("GET", api_url('products/1'), timeout=10)
         print(f'商品详情API状态: {response.status_code}')
         
         if response.status_code == 200:
@@ -61,7 +70,7 @@ class TestProductManagementAPI:
     
     def test_search_products(self):
         """测试商品搜索"""
-        response = requests.get(f'{BASE_URL}/products/search?keyword=测试')
+        response = guarded_request("GET", api_url('products/search?keyword=测试'), timeout=10)
         print(f'商品搜索API状态: {response.status_code}')
         
         if response.status_code == 200:
@@ -76,7 +85,7 @@ class TestRegistrationAPI:
     def test_send_verification_code(self):
         """测试发送验证码"""
         data = {'phone_number': '13800138999'}
-        response = requests.post(f'{BASE_URL}/auth/send-verification-code', json=data)
+        response = guarded_request("POST", api_url('auth/send-verification-code'), json=data, timeout=10)
         print(f'发送验证码API状态: {response.status_code}')
         
         if response.status_code == 200:
@@ -93,7 +102,7 @@ class TestRegistrationAPI:
             'verification_code': '123456',
             'agree_to_terms': True
         }
-        response = requests.post(f'{BASE_URL}/auth/register', json=data)
+        response = guarded_request("POST", api_url('auth/register'), json=data, timeout=10)
         print(f'用户注册API状态: {response.status_code}')
         
         if response.status_code in [200, 201]:
@@ -0,0 +1,135 @@
+"""
+静态资源缓存测试 - 使用最小化的路由替身，不启动真实浏览器
+"""
+import json
+
+from utils.asset_cache import AssetCache
+
+
+class _FakeResponse:
+    def __init__(self, status, headers, body=b""):
+        self.status = status
+        self.headers = headers
+        self._body = body
+
+    def body(self):
+        return self._body
+
+
+class _FakeRequest:
+    def __init__(self, url, method="GET"):
+        self.url = url
+        self.method = method
+        self.headers = {"accept": "*/*"}
+
+
+class _FakeServer:
+    """按 ETag 返回 200 或 304 的静态资源服务"""
+
+    def __init__(self):
+        self.etag = '"v1"'
+        self.body = b"console.log('app')"
+        self.fetches = []
+
+    def fetch(self, headers):
+        self.fetches.append(headers)
+        if headers.get("if-none-match") == self.etag:
+            return _FakeResponse(304, {"etag": self.etag})
+        return _FakeResponse(200, {"etag": self.etag, "content-type": "text/javascript",
+                                   "content-encoding": "gzip"}, self.body)
+
+
+class _FakeRoute:
+    def __init__(self, server, url, method="GET"):
+        self.server = server
+        self.request = _FakeRequest(url, method)
+        self.fulfilled = None
+        self.continued = False
+
+    def fetch(self, headers=None):
+        return self.server.fetch(headers)
+
+    def fulfill(self, status, headers, body):
+        self.fulfilled = {"status": status, "headers": headers, "body": body}
+
+    def continue_(self):
+        self.continued = True
+
+
+ASSET_URL = "http://localhost:5173/assets/index.js"
+
+
+class TestAssetCache:
+    """静态资源缓存测试"""
+
+    def test_only_non_api_requests_are_intercepted(self):
+        """API请求不经过拦截"""
+        cache = AssetCache()
+        assert cache._should_intercept(ASSET_URL)
+        assert not cache._should_intercept("http://localhost:3000/api/auth/login")
+        assert cache._should_intercept("http://localhost:5173/apidocs.css")
+
+    def test_memory_hit_skips_network(self):
+        """同一会话内第二次请求直接从内存返回"""
+        server = _FakeServer()
+        cache = AssetCache()
+
+        first = _FakeRoute(server, ASSET_URL)
+        cache._handle(first)
+        second = _FakeRoute(server, ASSET_URL)
+        cache._handle(second)
+
+        assert len(server.fetches) == 1
+        assert second.fulfilled["body"] == server.body
+        assert "content-encoding" not in second.fulfilled["headers"]
+        assert cache.stats["memory_hits"] == 1
+        assert cache.stats["bytes_saved"] == len(server.body)
+
+    def test_disk_entry_is_revalidated_with_etag(self, tmp_path):
+        """新会话使用磁盘缓存时携带 If-None-Match，304 时不重新下载"""
+        server = _FakeServer()
+        AssetCache(str(tmp_path))._handle(_FakeRoute(server, ASSET_URL))
+
+        cache = AssetCache(str(tmp_path))
+        route = _FakeRoute(server, ASSET_URL)
+        cache._handle(route)
+
+        assert server.fetches[-1]["if-none-match"] == '"v1"'
+        assert route.fulfilled["body"] == server.body
+        assert cache.stats["revalidated"] == 1
+        assert cache.stats["network_fetches"] == 0
+
+    def test_changed_etag_replaces_disk_entry(self, tmp_path):
+        """ETag 变化后重新下载并替换磁盘内容"""
+        server = _FakeServer()
+        AssetCache(str(tmp_path))._handle(_FakeRoute(server, ASSET_URL))
+        server.etag, server.body = '"v2"', b"console.log('v2')"
+
+        cache = AssetCache(str(tmp_path))
+        route = _FakeRoute(server, ASSET_URL)
+        cache._handle(route)
+
+        assert route.fulfilled["body"] == b"console.log('v2')"
+        assert len(list(tmp_path.glob("*.body"))) == 1
+
+    def test_non_get_requests_continue(self):
+        """非GET请求直接放行"""
+        route = _FakeRoute(_FakeServer(), ASSET_URL, method="POST")
+        cache = AssetCache()
+        cache._handle(route)
+        assert route.continued
+
+    def test_report_splits_cached_and_uncached_navigations(self, tmp_path):
+        """报告区分有/无网络下载的导航耗时"""
+        cache = AssetCache()
+        cache.navigations = [
+            {"url": "/", "load_ms": 800.0, "network_fetches": 12},
+            {"url": "/", "load_ms": 40.0, "network_fetches": 0},
+            {"url": "/", "load_ms": 60.0, "network_fetches": 0}
+        ]
+        path = tmp_path / "asset_cache.json"
+        cache.write_report(str(path))
+        report = json.loads(path.read_text(encoding="utf-8"))
+        assert report["navigations"]["uncached_avg_load_ms"] == 800.0
+        assert report["navigations"]["cached_avg_load_ms"] == 50.0
+        assert report["navigations"]["cached_count"] == 2
@@ -0,0 +1,75 @@
+"""
+异步API助手测试 - 使用 httpx.MockTransport，不依赖后端服务
+"""
+import asyncio
+import json
+
+import httpx
+
+from utils.async_api_helper import AsyncAPIHelper
+from utils.config import Config
+
+
+def make_helper(handler, **kwargs):
+    """创建使用模拟传输层的异步API助手"""
+    config = Config()
+    config.API_BASE_URL = "http://testserver/api"
+    return AsyncAPIHelper(config, transport=httpx.MockTransport(handler), **kwargs)
+
+
+class TestAsyncAPIHelper:
+    """异步API助手测试"""
+
+    def test_login_sends_same_payload_as_sync_helper(self):
+        """登录请求的URL和请求体与同步助手一致"""
+        captured = {}
+
+        def handler(request):
+            captured["url"] = str(request.url)
+            captured["body"] = json.loads(request.content)
+            return httpx.Response(200, json={"success": True})
+
+        async def run():
+            async with make_helper(handler) as api:
+                return await api.login("13800138001", "123456")
+
+        response = asyncio.run(run())
+        assert response.status_code == 200
+        assert captured["url"] == "http://testserver/api/auth/login"
+        assert captured["body"] == {"phoneNumber": "13800138001", "verificationCode": "123456"}
+
+    def test_get_products_query_and_auth_header(self):
+        """商品列表查询参数和认证头"""
+        captured = {}
+
+        def handler(request):
+            captured["params"] = dict(request.url.params)
+            captured["auth"] = request.headers.get("Authorization")
+            return httpx.Response(200, json={"data": {"products": []}})
+
+        async def run():
+            async with make_helper(handler) as api:
+                api.set_auth_token("token")
+                response = await api.get_products(page=2, page_size=5, keyword="手机")
+                api.assert_response_success(response)
+                return api.get_response_data(response)
+
+        data = asyncio.run(run())
+        assert data == {"data": {"products": []}}
+        assert captured["params"] == {"page": "2", "pageSize": "5", "keyword": "手机"}
+        assert captured["auth"] == "Bearer token"
+
+    def test_thousands_of_concurrent_requests(self):
+        """超过连接上限的并发请求排队完成"""
+        def handler(request):
+            return httpx.Response(200, json={"success": True})
+
+        async def run():
+            async with make_helper(handler, max_connections=10) as api:
+                return await asyncio.gather(
+                    *[api.send_verification_code("13800138001") for _ in range(2000)]
+                )
+
+        responses = asyncio.run(run())
+        assert len(responses) == 2000
+        assert all(response.status_code == 200 for response in responses)
@@ -0,0 +1,114 @@
+"""
+登录状态缓存测试 - 使用本地HTTP服务和临时数据库，不依赖后端服务
+"""
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from utils.api_helper import APIHelper
+from utils.auth_state import AuthStateCache, backend_build_id
+from utils.config import Config
+from utils.database_helper import DatabaseHelper
+
+INIT_SQL = os.path.join(os.path.dirname(__file__), "..", "src", "database", "init.sql")
+
+
+class _LoginHandler(BaseHTTPRequestHandler):
+    logins = []
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        _LoginHandler.logins.append(payload["phoneNumber"])
+        body = json.dumps({
+            "message": "登录成功",
+            "token": f"token-{payload['phoneNumber']}",
+            "user": {"id": 1, "phoneNumber": payload["phoneNumber"]}
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    """指向本地登录服务的登录状态缓存"""
+    server = HTTPServer(("127.0.0.1", 0), _LoginHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setenv("API_BASE_URL", f"http://127.0.0.1:{server.server_port}/api")
+    monkeypatch.setenv("BASE_URL", "http://localhost:5173")
+    _LoginHandler.logins = []
+
+    db_helper = DatabaseHelper(str(tmp_path / "taobei.db"))
+    with open(INIT_SQL, encoding="utf-8") as f:
+        db_helper.get_connection().executescript(f.read())
+
+    config = Config()
+    yield AuthStateCache(str(tmp_path / "auth"), config=config, api_helper=APIHelper(config),
+                         db_helper=db_helper, build_id="build1")
+    db_helper.close()
+    server.shutdown()
+    server.server_close()
+
+
+class TestAuthStateCache:
+    """登录状态缓存测试"""
+
+    def test_logs_in_once_per_phone(self, cache):
+        """同一手机号只登录一次，之后直接命中缓存"""
+        first = cache.get_storage_state("13800138001")
+        second = cache.get_storage_state("13800138001")
+        assert first == second
+        assert _LoginHandler.logins == ["13800138001"]
+        assert cache.get_stats() == {"hits": 1, "logins": 1}
+
+    def test_storage_state_matches_frontend_local_storage(self, cache):
+        """storage_state 写入与前端一致的 token 和 user"""
+        state = cache.load("13800138001")
+        origin = state["origins"][0]
+        assert origin["origin"] == "http://localhost:5173"
+        items = {item["name"]: item["value"] for item in origin["localStorage"]}
+        assert items["token"] == "token-13800138001"
+        assert json.loads(items["user"])["phoneNumber"] == "13800138001"
+
+    def test_cache_key_includes_backend_build(self, cache):
+        """后端构建变化后重新登录"""
+        cache.get_storage_state("13800138001")
+        cache.build_id = "build2"
+        cache.get_storage_state("13800138001")
+        assert len(_LoginHandler.logins) == 2
+        target = cache.target_id
+        assert sorted(os.listdir(cache.cache_dir)) == [f"13800138001_build1_{target}.json",
+                                                       f"13800138001_build2_{target}.json"]
+
+    def test_cache_key_includes_service_addresses(self, cache):
+        """前端 origin 变化（如隔离运行时的随机端口）后重新登录，新文件写入新的 origin"""
+        cache.get_storage_state("13800138001")
+        cache.config.BASE_URL = "http://localhost:41234"
+        state = cache.load("13800138001")
+        assert len(_LoginHandler.logins) == 2
+        assert state["origins"][0]["origin"] == "http://localhost:41234"
+        assert len(os.listdir(cache.cache_dir)) == 2
+
+    def test_invalidate(self, cache):
+        """失效后重新登录"""
+        cache.get_storage_state("13800138001")
+        cache.invalidate("13800138001")
+        cache.get_storage_state("13800138001")
+        assert len(_LoginHandler.logins) == 2
+
+
+def test_backend_build_id_tracks_sources(tmp_path, monkeypatch):
+    """后端源码变化时构建标识随之变化"""
+    monkeypatch.delenv("BACKEND_BUILD_ID", raising=False)
+    (tmp_path / "app.js").write_text("console.log(1)")
+    before = backend_build_id(str(tmp_path))
+    (tmp_path / "app.js").write_text("console.log(2)")
+    assert backend_build_id(str(tmp_path)) != before
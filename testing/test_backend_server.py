@@ -0,0 +1,153 @@
+"""
+服务进程管理测试
+用 python -m http.server 代替 Node 后端，验证就绪轮询、启动耗时和跨运行复用
+"""
+import socket
+import sys
+
+import pytest
+
+import utils.backend_server as backend_server
+from utils.backend_server import ManagedServer, _pid_alive, find_free_port, port_available, stop_recorded_servers
+
+
+class StaticServer(ManagedServer):
+    """以 http.server 代替的被管理服务"""
+
+    name = "backend"
+
+    def __init__(self, version="1", **kwargs):
+        super().__init__(**kwargs)
+        self.version = version
+
+    def command(self):
+        return [sys.executable, "-m", "http.server", str(self.port), "--bind", "127.0.0.1"]
+
+    def fingerprint(self):
+        return {"version": self.version}
+
+
+def test_find_free_port_is_bindable():
+    port = find_free_port()
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", port))
+
+
+def test_port_available_detects_bound_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        sock.listen(1)
+        assert not port_available(sock.getsockname()[1])
+    assert port_available(find_free_port())
+
+
+def test_owned_server_starts_on_free_port_and_stops():
+    """不指定端口时使用空闲端口，记录启动耗时，stop() 结束进程"""
+    server = StaticServer()
+    server.start(timeout=20)
+    try:
+        assert server.port and server.is_ready()
+        assert server.startup_seconds > 0 and server.ready_attempts >= 1
+        assert not server.reused
+    finally:
+        server.stop()
+    assert not server.is_ready()
+
+
+def test_ready_polling_backs_off_exponentially(monkeypatch):
+    """未就绪时轮询间隔指数增长，不超过上限"""
+    sleeps = []
+    monkeypatch.setattr(backend_server.time, "sleep", sleeps.append)
+    server = StaticServer(port=1)
+    answers = iter([False] * 7 + [True])
+    monkeypatch.setattr(server, "is_ready", lambda: next(answers))
+    server.wait_until_ready(timeout=30)
+    assert sleeps == [0.05, 0.1, 0.2, 0.4, 0.8, 1.0, 1.0]
+    assert server.ready_attempts == 8
+
+
+def test_process_exit_fails_fast():
+    """服务进程启动后立即退出时不等待超时"""
+    class Broken(StaticServer):
+        def command(self):
+            return [sys.executable, "-c", "import sys; sys.exit(3)"]
+
+    with pytest.raises(RuntimeError, match="退出码: 3"):
+        Broken().start(timeout=20)
+
+
+def test_reuses_healthy_instance_across_runs(tmp_path):
+    """状态文件记录的实例存活且配置一致时复用，配置变化时重启"""
+    state_dir = str(tmp_path / "servers")
+    first = StaticServer(state_dir=state_dir)
+    first.start(timeout=20)
+    first.stop()  # 可复用的实例在会话结束时保持运行
+    assert first.is_ready()
+
+    second = StaticServer(state_dir=state_dir)
+    second.start(timeout=20)
+    assert second.reused and second.port == first.port and second.pid == first.pid
+    assert second.startup_seconds == first.startup_seconds
+
+    changed = StaticServer(version="2", state_dir=state_dir)
+    changed.start(timeout=20)
+    assert not changed.reused and changed.pid != first.pid
+    assert not _pid_alive(first.pid)
+
+    assert stop_recorded_servers(state_dir) == ["backend"]
+    assert not _pid_alive(changed.pid)
+    assert StaticServer(state_dir=state_dir).read_state() is None
+
+
+def test_stop_recorded_servers_includes_worker_dirs(tmp_path):
+    """xdist worker 各自保留的服务（state_dir/gwN）也会被停止"""
+    state_dir = str(tmp_path / "servers")
+    server = StaticServer(state_dir=str(tmp_path / "servers" / "gw0"))
+    server.start(timeout=20)
+    assert stop_recorded_servers(state_dir) == ["gw0/backend"]
+    assert not _pid_alive(server.pid)
+
+
+def test_unit_tests_do_not_start_servers(request):
+    """只用到普通fixture的测试不会启动被管理的服务（--start-backend 只对用到服务的测试生效）"""
+    assert "managed_servers" not in request.fixturenames
+    assert "worker_environment" not in request.fixturenames
+
+
+def test_start_servers_force_stops_backend_when_frontend_fails(tmp_path, monkeypatch):
+    """前端启动失败时强制停止已启动的可复用后端，不留下状态文件"""
+    backends = []
+
+    class Backend(StaticServer):
+        def __init__(self, db_path=None, state_dir=None):
+            super().__init__(state_dir=state_dir)
+            backends.append(self)
+
+    class Frontend(StaticServer):
+        name = "frontend"
+
+        def __init__(self, api_target, state_dir=None):
+            super().__init__(state_dir=state_dir)
+
+        def command(self):
+            return [sys.executable, "-c", "import sys; sys.exit(3)"]
+
+    monkeypatch.setattr(backend_server, "BackendServer", Backend)
+    monkeypatch.setattr(backend_server, "FrontendServer", Frontend)
+    pids = []
+    monkeypatch.setattr(Backend, "wait_until_ready",
+                        lambda self, timeout=30: pids.append(self.pid) or StaticServer.wait_until_ready(self, timeout))
+
+    with pytest.raises(RuntimeError, match="退出码: 3"):
+        backend_server.start_servers(frontend=True, state_dir=str(tmp_path / "servers"), timeout=20)
+    assert not _pid_alive(pids[0])
+    assert backends[0].read_state() is None
+
+
+def test_incomplete_server_fails_on_creation():
+    """没有实现 command() 的子类在创建时就报错"""
+    class Incomplete(ManagedServer):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
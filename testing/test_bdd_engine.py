@@ -0,0 +1,132 @@
+"""
+统一BDD引擎测试
+"""
+import os
+
+import pytest
+from behave import given, then, when
+
+from utils.bdd_engine import FeatureCache, StepContext, StepDefinitionNotFound, run_scenario
+
+pytest_plugins = ["pytester"]
+
+FEATURE = """Feature: 引擎计数器
+  Background:
+    Given 引擎测试计数器从 1 开始
+
+  Scenario: 加法
+    When 引擎测试计数器加 2
+    Then 引擎测试计数器等于 3
+
+  Scenario: 未定义的步骤
+    When 引擎测试中没有定义的步骤
+"""
+
+# pytester 中用统一BDD引擎收集 .feature 的 conftest
+FEATURE_CONFTEST = """
+    import pytest
+    from utils.bdd_engine import FeatureFile, StepContext
+
+    @pytest.fixture
+    def bdd_context():
+        return StepContext()
+
+    def pytest_collect_file(file_path, parent):
+        if file_path.suffix == ".feature":
+            return FeatureFile.from_parent(parent, path=file_path)
+"""
+
+
+@given("引擎测试计数器从 {start:d} 开始")
+def step_counter_start(context, start):
+    context.counter = start
+
+
+@when("引擎测试计数器加 {value:d}")
+def step_counter_add(context, value):
+    context.counter += value
+
+
+@then("引擎测试计数器等于 {expected:d}")
+def step_counter_equals(context, expected):
+    assert context.counter == expected
+
+
+@pytest.fixture
+def feature_file(tmp_path):
+    path = tmp_path / "counter.feature"
+    path.write_text(FEATURE, encoding="utf-8")
+    return path
+
+
+def test_cache_hits_memory_then_disk(feature_file, tmp_path):
+    """同一进程内命中内存，新进程（新缓存实例）命中磁盘"""
+    cache = FeatureCache(str(tmp_path / "cache"))
+    first = cache.parse(feature_file)
+    assert cache.parse(feature_file) is first
+    assert cache.get_stats()["parsed"] == 1
+    assert cache.get_stats()["memory_hits"] == 1
+
+    other = FeatureCache(str(tmp_path / "cache"))
+    feature = other.parse(feature_file)
+    assert other.get_stats()["disk_hits"] == 1
+    assert [scenario.name for scenario in feature.walk_scenarios()] == ["加法", "未定义的步骤"]
+
+
+def test_cache_reparses_modified_file(feature_file, tmp_path):
+    """文件 mtime 变化后重新解析"""
+    cache = FeatureCache(str(tmp_path / "cache"))
+    cache.parse(feature_file)
+    feature_file.write_text(FEATURE.replace("Scenario: 加法", "Scenario: 求和"), encoding="utf-8")
+    stat = os.stat(feature_file)
+    os.utime(feature_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    feature = FeatureCache(str(tmp_path / "cache")).parse(feature_file)
+    assert feature.scenarios[0].name == "求和"
+    assert cache.parse(feature_file).scenarios[0].name == "求和"
+    assert cache.get_stats()["parsed"] == 1 and cache.get_stats()["disk_hits"] == 1
+
+
+def test_run_scenario_dispatches_behave_steps(feature_file):
+    """执行 Background 和场景步骤，参数按 behave 的规则传入"""
+    feature = FeatureCache().parse(feature_file)
+    context = StepContext()
+    run_scenario(feature.scenarios[0], context)
+    assert context.counter == 3
+
+    other = StepContext()
+    with pytest.raises(StepDefinitionNotFound, match="引擎测试中没有定义的步骤"):
+        run_scenario(feature.scenarios[1], other)
+    assert not hasattr(other, "counter")  # 有未定义步骤时不执行任何步骤
+
+
+def test_context_resources_are_lazy():
+    """资源在第一次访问时才创建，之后复用"""
+    created = []
+    context = StepContext({"driver": lambda: created.append(1) or "page"})
+    assert created == []
+    assert context.driver == "page"
+    assert context.driver == "page"
+    assert created == [1]
+    assert not hasattr(context, "missing")
+
+
+def test_feature_file_collects_scenarios(pytester):
+    """pytest 前端：每个场景一个测试，缺少步骤定义的场景失败并给出步骤位置"""
+    pytester.makefile(".feature", counter=FEATURE)
+    pytester.makeconftest(FEATURE_CONFTEST)
+    result = pytester.runpytest("-v")
+    result.assert_outcomes(passed=1, failed=1)
+    result.stdout.fnmatch_lines([
+        "*counter.feature::加法 PASSED*",
+        "*StepDefinitionNotFound: 未找到步骤定义: When 引擎测试中没有定义的步骤 (*counter.feature:10)*"
+    ])
+
+
+def test_failed_step_location_in_report(pytester):
+    """步骤失败时报告中附加失败步骤的位置"""
+    pytester.makefile(".feature", failing=FEATURE.split("  Scenario: 未定义的步骤")[0].replace("等于 3", "等于 4"))
+    pytester.makeconftest(FEATURE_CONFTEST)
+    result = pytester.runpytest()
+    result.assert_outcomes(failed=1)
+    result.stdout.fnmatch_lines(["*BDD步骤*", "失败步骤: Then 引擎测试计数器等于 4 (*failing.feature:7)"])
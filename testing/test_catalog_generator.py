@@ -0,0 +1,82 @@
+"""
+合成商品/用户数据生成器测试
+"""
+import json
+import os
+
+import pytest
+
+from utils.catalog_generator import CatalogGenerator, USER_PHONE_PREFIX
+from utils.database_helper import DatabaseHelper
+from utils.test_data import TestDataManager
+
+INIT_SQL = os.path.join(os.path.dirname(os.path.abspath(__file__)), "../src/database/init.sql")
+
+
+@pytest.fixture(scope="module")
+def generator():
+    return CatalogGenerator(seed=7)
+
+
+def test_same_seed_generates_same_data(generator):
+    """同一种子结果相同，较少数量的结果是较多数量的前缀；不同种子结果不同"""
+    products = list(CatalogGenerator(seed=7).iter_products(50))
+    assert list(generator.iter_products(50)) == products
+    assert list(generator.iter_products(20)) == products[:20]
+    assert list(CatalogGenerator(seed=8).iter_products(50)) != products
+
+    users = list(generator.iter_users(100))
+    assert len({user["phone_number"] for user in users}) == 100
+    assert all(user["phone_number"].startswith(USER_PHONE_PREFIX) and len(user["phone_number"]) == 11
+               for user in users)
+
+
+def test_products_match_test_data_fields(generator):
+    """生成的商品与默认商品字段一致，分类来自 TestDataManager"""
+    default = TestDataManager().get_product_by_id(1)
+    categories = {category["name"]: category["id"] for category in TestDataManager().get_categories()}
+    for product in generator.iter_products(200):
+        assert set(product) == set(default)
+        assert categories[product["category"]] == product["category_id"]
+        assert 9.9 <= product["price"] <= 20000
+
+
+@pytest.mark.parametrize("filename", ["products.json", "products.jsonl"])
+def test_write_json_streams_records(generator, tmp_path, filename):
+    """写入 JSON 数组或 JSONL，内容与生成结果一致"""
+    path = str(tmp_path / filename)
+    assert generator.write_json(path, "products", 30) == 30
+    with open(path, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f] if filename.endswith(".jsonl") else json.load(f)
+    assert records == list(generator.iter_products(30))
+
+
+def test_write_database_in_batches(generator, tmp_path):
+    """分批写入数据库，重复写入时已存在的用户被忽略"""
+    helper = DatabaseHelper(str(tmp_path / "taobei.db"))
+    with open(INIT_SQL, encoding="utf-8") as f:
+        helper.get_connection().executescript(f.read())
+    products_before = helper.get_table_count("products")
+    users_before = helper.get_table_count("users")
+
+    written = generator.write_database(helper, products=1200, users=300, batch_size=500)
+    assert written == {"products": 1200, "users": 300}
+    assert helper.get_table_count("products") == products_before + 1200
+    assert helper.get_table_count("users") == users_before + 300
+    assert generator.write_database(helper, users=300)["users"] == 0
+
+    first = next(generator.iter_users(1))
+    assert helper.get_user_by_phone(first["phone_number"])["nickname"] == first["nickname"]
+    helper.close()
+
+
+def test_manager_paginates_generated_catalog():
+    """加载生成的数据后分页和索引查询覆盖真实的页数"""
+    manager = TestDataManager()
+    assert manager.load_generated_data(2000, 50) == {"products": 2005, "users": 53}
+    page = manager.get_paginated_products(page=201, page_size=10)
+    assert page["pagination"]["total_pages"] == 201
+    assert len(page["products"]) == 5 and not page["pagination"]["has_next"]
+    assert len(manager.get_products_by_category("图书")) > 100
+    prices = [product["price"] for product in manager.get_products_sorted_by_price()]
+    assert prices == sorted(prices)
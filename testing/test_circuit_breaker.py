@@ -0,0 +1,141 @@
+"""
+后端熔断器测试
+"""
+import time
+
+import pytest
+import requests
+
+from utils.api_helper import APIHelper
+from utils.backend_server import find_free_port
+from utils.circuit_breaker import (
+    CLOSED, HALF_OPEN, OPEN, BackendUnavailable, CircuitBreaker, breaker_states, get_breaker, reset_breakers
+)
+from utils.config import Config
+
+pytest_plugins = ["pytester"]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _refused():
+    raise requests.exceptions.ConnectionError("Connection refused")
+
+
+@pytest.fixture(autouse=True)
+def clean_breakers():
+    reset_breakers()
+    yield
+    reset_breakers()
+
+
+def test_opens_after_consecutive_failures_and_half_opens():
+    """连续失败达到阈值后熔断，到期只放行一个探测请求，探测成功后恢复"""
+    clock = FakeClock()
+    breaker = CircuitBreaker("http://localhost:3001", threshold=3, reset_timeout=30, clock=clock)
+    for _ in range(3):
+        with pytest.raises(requests.exceptions.ConnectionError):
+            breaker.call(_refused)
+    assert breaker.state == OPEN and breaker.trips == 1
+
+    with pytest.raises(BackendUnavailable, match="Connection refused"):
+        breaker.call(lambda: "not called")
+    assert breaker.rejected == 1
+
+    clock.now = 31
+    with pytest.raises(requests.exceptions.ConnectionError):
+        breaker.call(_refused)  # 探测失败，重新计时
+    assert breaker.state == OPEN and breaker.opened_at == 31
+    with pytest.raises(BackendUnavailable):
+        breaker.call(lambda: "not called")
+
+    clock.now = 62
+    breaker.before_call()
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(BackendUnavailable):
+        breaker.before_call()  # 探测进行中，其他请求仍被拒绝
+    breaker.record_success()
+    assert breaker.state == CLOSED and breaker.call(lambda: "ok") == "ok"
+
+
+def test_success_resets_failure_count():
+    """非连续的失败不会熔断，HTTP 错误以外的异常不计入"""
+    breaker = CircuitBreaker("http://localhost:3001", threshold=2)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        breaker.call(_refused)
+    breaker.call(lambda: None)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        breaker.call(_refused)
+    with pytest.raises(ValueError):
+        breaker.call(int, "x")
+    assert breaker.state == CLOSED
+
+
+def test_trip_opens_without_failed_requests():
+    """预检确认不可达时直接熔断，第一个请求即被拒绝，到期后仍放行探测"""
+    clock = FakeClock()
+    breaker = CircuitBreaker("http://localhost:3001", threshold=3, reset_timeout=30, clock=clock)
+    breaker.trip("运行前预检: http://localhost:3001/api/health 无法连接")
+    assert breaker.state == OPEN and breaker.trips == 1
+
+    with pytest.raises(BackendUnavailable, match="运行前预检"):
+        breaker.call(lambda: "not called")
+
+    clock.now = 30
+    assert breaker.call(lambda: "ok") == "ok"
+    assert breaker.state == CLOSED
+
+
+def test_api_helper_fails_fast_once_open(monkeypatch):
+    """同一主机的所有 APIHelper 共用熔断器，熔断后请求不再发出"""
+    monkeypatch.setenv("API_BASE_URL", f"http://127.0.0.1:{find_free_port()}/api")
+    monkeypatch.setenv("CIRCUIT_BREAKER_THRESHOLD", "2")
+    monkeypatch.setenv("MAX_RETRIES", "0")
+    config = Config()
+    for _ in range(2):
+        with pytest.raises(requests.exceptions.ConnectionError):
+            APIHelper(config).get_products()
+
+    sent = []
+    helper = APIHelper(config)
+    monkeypatch.setattr(helper.session, "request", lambda *args, **kwargs: sent.append(args))
+    start = time.perf_counter()
+    with pytest.raises(BackendUnavailable):
+        helper.get_product_detail(1)
+    assert time.perf_counter() - start < 0.1
+    assert sent == []
+
+    state = breaker_states()[config.API_BASE_URL[:-len("/api")]]
+    assert state["state"] == OPEN and state["rejected"] == 1
+    assert get_breaker(config.get_api_url("products")).threshold == 2
+
+
+def test_rejected_test_is_reported_as_skipped(pytester):
+    """被熔断拒绝的测试按 CIRCUIT_BREAKER_ACTION 报告为跳过，原因只有一条"""
+    pytester.makeconftest("""
+        import pytest
+        from utils.circuit_breaker import skip_rejected
+
+        @pytest.hookimpl(hookwrapper=True)
+        def pytest_runtest_makereport(item, call):
+            outcome = yield
+            skip_rejected(item, call, outcome.get_result())
+    """)
+    pytester.makepyfile("""
+        from utils.circuit_breaker import BackendUnavailable
+
+        def test_rejected():
+            raise BackendUnavailable("http://localhost:3001", "ConnectionError: refused")
+
+        def test_other_failure():
+            assert False
+    """)
+    result = pytester.runpytest_inprocess("-rs", "-p", "no:cacheprovider")
+    result.assert_outcomes(skipped=1, failed=1)
+    result.stdout.fnmatch_lines(["*后端 http://localhost:3001 不可用（已熔断）*"])
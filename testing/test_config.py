@@ -0,0 +1,95 @@
+"""
+测试配置测试 - 并行worker隔离
+"""
+from utils.config import Config, get_worker_index
+
+
+class TestWorkerIsolation:
+    """worker隔离配置测试"""
+
+    def test_master_keeps_default_phones(self, monkeypatch):
+        """非并行运行时使用默认测试手机号"""
+        monkeypatch.delenv("PYTEST_XDIST_WORKER", raising=False)
+        config = Config()
+        assert config.WORKER_ID == "master"
+        assert config.TEST_PHONE_REGISTERED == "13800138001"
+        assert config.TEST_PHONE_UNREGISTERED == "13800138002"
+
+    def test_workers_get_disjoint_phone_ranges(self, monkeypatch):
+        """不同worker的手机号段互不重叠"""
+        ranges = []
+        for worker in ("gw0", "gw1", "gw7"):
+            monkeypatch.setenv("PYTEST_XDIST_WORKER", worker)
+            ranges.append(set(Config().get_test_phones(999)))
+        assert not ranges[0] & ranges[1]
+        assert not ranges[1] & ranges[2]
+
+    def test_isolated_worker_uses_own_port(self, monkeypatch):
+        """开启隔离后每个worker使用独立的后端端口"""
+        monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw3")
+        monkeypatch.setenv("WORKER_ISOLATION", "true")
+        monkeypatch.delenv("API_BASE_URL", raising=False)
+        config = Config()
+        assert get_worker_index("gw3") == 3
+        assert config.API_BASE_URL == f"http://localhost:{config.API_PORT_BASE + 3}/api"
+
+    def test_explicit_api_base_url_wins(self, monkeypatch):
+        """显式设置的API_BASE_URL优先"""
+        monkeypatch.setenv("WORKER_ISOLATION", "true")
+        monkeypatch.setenv("API_BASE_URL", "http://example.com/api")
+        assert Config().API_BASE_URL == "http://example.com/api"
+
+
+class TestProfiles:
+    """配置 profile 测试"""
+
+    def _write(self, tmp_path, profiles, env=""):
+        (tmp_path / "profiles.yaml").write_text(profiles, encoding="utf-8")
+        (tmp_path / ".env").write_text(env, encoding="utf-8")
+        return str(tmp_path / "profiles.yaml"), str(tmp_path / ".env")
+
+    def test_precedence_env_over_dotenv_over_profile(self, tmp_path, monkeypatch):
+        """环境变量 > .env > 选中的 profile > default profile"""
+        profiles, env_file = self._write(tmp_path, (
+            "default:\n  API_BASE_URL: http://default/api\n  API_TIMEOUT: 30\n  HEADLESS: false\n"
+            "ci:\n  API_TIMEOUT: 5\n  HEADLESS: true\n  PREFLIGHT: strict\n"
+        ), "TEST_PROFILE=ci\nPREFLIGHT=off\n")
+        monkeypatch.delenv("TEST_PROFILE", raising=False)
+        for name in ("API_BASE_URL", "API_TIMEOUT", "HEADLESS", "PREFLIGHT"):
+            monkeypatch.delenv(name, raising=False)
+
+        from utils.config import load_profile
+        settings = load_profile(profiles_file=profiles, env_file=env_file)
+        assert settings["TEST_PROFILE"] == "ci"
+        assert settings["API_BASE_URL"] == "http://default/api"
+        assert settings["API_TIMEOUT"] == "5"
+        assert settings["HEADLESS"] == "true"
+        assert settings["PREFLIGHT"] == "off"
+
+        monkeypatch.setenv("API_TIMEOUT", "2.5")
+        config = Config()
+        config._settings = settings
+        assert config.get("API_TIMEOUT") == "2.5"
+        assert config.get_bool("HEADLESS") is True
+        assert config.get("MISSING", "fallback") == "fallback"
+
+    def test_unknown_profile_is_rejected(self, tmp_path):
+        from utils.config import load_profile
+        profiles, env_file = self._write(tmp_path, "default: {}\nci: {}\n")
+        try:
+            load_profile("staging", profiles_file=profiles, env_file=env_file)
+        except ValueError as e:
+            assert "staging" in str(e) and "ci" in str(e)
+        else:
+            raise AssertionError("未知的 profile 应该报错")
+
+    def test_repository_profiles_use_consistent_ports(self, monkeypatch):
+        """仓库自带的 profile 与后端 .env 和 Vite 代理的端口一致"""
+        for name in ("API_BASE_URL", "BASE_URL", "TEST_PROFILE", "WORKER_ISOLATION"):
+            monkeypatch.delenv(name, raising=False)
+        for profile in ("default", "local", "ci", "mock"):
+            config = Config(profile)
+            assert config.API_BASE_URL == "http://localhost:3001/api"
+            assert config.BASE_URL == "http://localhost:5173"
+        assert Config("ci").PREFLIGHT == "strict"
+        assert Config("parallel").WORKER_ISOLATION
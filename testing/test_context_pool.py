@@ -0,0 +1,184 @@
+"""
+浏览器上下文池测试 - 使用最小化的浏览器替身，不启动真实浏览器
+"""
+import json
+
+from utils.context_pool import BrowserContextPool
+
+
+class _FakePage:
+    def __init__(self, context):
+        self.context = context
+        self.url = "about:blank"
+        self.navigations = 0
+        self.local_storage = {}
+        self.routes = 1
+
+    def goto(self, url, timeout=None):
+        self.url = url + "/"
+        self.navigations += 1
+
+    def reload(self, timeout=None):
+        self.navigations += 1
+
+    def evaluate(self, script, arg=None):
+        if "clear" in script:
+            self.local_storage.clear()
+        else:
+            self.local_storage.update({item["name"]: item["value"] for item in arg})
+
+    def unroute_all(self):
+        self.routes = 0
+
+    def close(self):
+        self.context.pages.remove(self)
+
+
+class _FakeContext:
+    def __init__(self, options):
+        self.options = options
+        self.pages = []
+        self.cookies = ["session"]
+        self.closed = False
+        self.routes = {}
+        self.init_scripts = []
+
+    def new_page(self):
+        page = _FakePage(self)
+        self.pages.append(page)
+        return page
+
+    # 与 Playwright 1.40 一致：没有 unroute_all，只能按 url 移除
+    def route(self, url, handler):
+        self.routes[url] = handler
+
+    def unroute(self, url):
+        self.routes.pop(url, None)
+
+    def add_init_script(self, script):
+        self.init_scripts.append(script)
+
+    def clear_cookies(self):
+        self.cookies = []
+
+    def clear_permissions(self):
+        pass
+
+    def add_cookies(self, cookies):
+        self.cookies.extend(cookies)
+
+    def close(self):
+        self.closed = True
+
+
+class _FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+
+    def new_context(self, **options):
+        context = _FakeContext(options)
+        self.contexts.append(context)
+        return context
+
+
+BASE_URL = "http://localhost:5173"
+
+
+class TestBrowserContextPool:
+    """浏览器上下文池测试"""
+
+    def test_warm_context_is_reused_after_reset(self):
+        """释放后的上下文被重置并再次命中"""
+        browser = _FakeBrowser()
+        pool = BrowserContextPool(browser, BASE_URL, size=1)
+        pool.warm_up()
+
+        context, page = pool.acquire()
+        assert page.navigations == 1
+        page.local_storage["token"] = "abc"
+        page.routes = 3
+        context.new_page()
+        pool.release(page)
+
+        context_again, page_again = pool.acquire()
+        assert context_again is context
+        assert page_again.local_storage == {}
+        assert page_again.routes == 0
+        assert context.cookies == []
+        assert context.pages == [page]
+        assert len(browser.contexts) == 1
+        assert pool.get_stats()["hits"] == 2
+        assert pool.get_stats()["misses"] == 0
+
+    def test_empty_pool_creates_context(self):
+        """没有空闲上下文时新建（未命中），超出容量的上下文被关闭"""
+        browser = _FakeBrowser()
+        pool = BrowserContextPool(browser, BASE_URL, size=1)
+
+        first = pool.acquire()
+        second = pool.acquire()
+        pool.release(first[1])
+        pool.release(second[1])
+
+        stats = pool.get_stats()
+        assert stats["misses"] == 2
+        assert stats["idle"] == 1
+        assert stats["discarded"] == 1
+        assert second[0].closed
+
+    def test_storage_state_is_restored_on_reset(self, tmp_path):
+        """带登录状态的上下文单独分组，重置后重新写入登录状态"""
+        state_path = tmp_path / "state.json"
+        state_path.write_text(json.dumps({
+            "cookies": [],
+            "origins": [{"origin": BASE_URL, "localStorage": [{"name": "token", "value": "t1"}]}]
+        }))
+        pool = BrowserContextPool(_FakeBrowser(), BASE_URL, size=1)
+
+        context, page = pool.acquire(str(state_path))
+        assert context.options["storage_state"] == str(state_path)
+        page.local_storage["extra"] = "x"
+        pool.release(page)
+
+        assert pool.acquire()[1] is not page
+        _, page_again = pool.acquire(str(state_path))
+        assert page_again is page
+        assert page.local_storage == {"token": "t1"}
+
+    def test_close(self):
+        """关闭池时关闭所有上下文"""
+        browser = _FakeBrowser()
+        pool = BrowserContextPool(browser, BASE_URL, size=2)
+        pool.warm_up()
+        pool.acquire()
+        pool.close()
+        assert all(context.closed for context in browser.contexts)
+
+    def test_routes_removed_without_unroute_all(self):
+        """没有 unroute_all 时按记录的 url 移除测试注册的路由，池自身的拦截重新安装"""
+        class Interceptor:
+            def install(self, context):
+                context.route("**/assets/**", "asset-handler")
+
+        pool = BrowserContextPool(_FakeBrowser(), BASE_URL, size=1, asset_cache=Interceptor())
+        pool.asset_cache.goto = lambda page, url, timeout=None: page.goto(url)
+        context, page = pool.acquire()
+        context.route("**/api/user/profile", "test-handler")
+        pool.release(page)
+
+        context_again, _ = pool.acquire()
+        assert context_again is context
+        assert context.routes == {"**/assets/**": "asset-handler"}
+
+    def test_context_with_init_script_is_not_pooled(self):
+        """注入过初始化脚本（登录状态）的上下文不放回匿名分组，之后的测试拿到新的上下文"""
+        browser = _FakeBrowser()
+        pool = BrowserContextPool(browser, BASE_URL, size=1)
+        context, page = pool.acquire()
+        page.context.add_init_script("localStorage.setItem('token', 'abc')")
+        pool.release(page)
+
+        context_again, _ = pool.acquire()
+        assert context.closed and context_again is not context
+        assert context_again.init_scripts == []
+        assert pool.get_stats()["discarded"] == 1
@@ -0,0 +1,64 @@
+"""
+测试数据文件注册表测试
+"""
+import copy
+import json
+import pickle
+
+import pytest
+
+from utils.data_registry import DataRegistry, JsonlDataset, ReadOnlyDict, thaw
+
+
+def test_json_parsed_once_and_read_only(data_files):
+    """同一文件只解析一次，返回的数据不可修改，但可以按普通 dict/list 使用"""
+    registry = DataRegistry()
+    login = registry.get("login")
+    assert registry.get("login.json") is login
+    assert registry.get_stats() == {"loads": 1, "hits": 1, "files": 1}
+
+    with open(registry.resolve("login"), encoding="utf-8") as f:
+        assert login == json.load(f)
+    with pytest.raises(TypeError, match="只读"):
+        login["unregistered_phones"].append("13900139999")
+    with pytest.raises(TypeError):
+        login["registered_users"][0]["status"] = "inactive"
+
+    mutable = thaw(login)
+    mutable["registered_users"][0]["status"] = "inactive"
+    assert login["registered_users"][0]["status"] == "active"
+    assert data_files.get("performance")["concurrent_users"] == [5, 10, 20, 50]
+
+
+def test_read_only_values_survive_copy_and_pickle():
+    """深拷贝和序列化不会因为只读而失败"""
+    data = DataRegistry().get("user_management")
+    assert isinstance(copy.deepcopy(data), ReadOnlyDict)
+    assert pickle.loads(pickle.dumps(data)) == data
+    assert json.loads(json.dumps(data, ensure_ascii=False)) == data
+
+
+def test_jsonl_loads_records_lazily(tmp_path):
+    """JSONL 文件按行读取，支持迭代、下标和切片，空行被忽略"""
+    records = [{"id": index, "name": f"商品{index}"} for index in range(100)]
+    path = tmp_path / "products.jsonl"
+    path.write_text("\n".join(json.dumps(record, ensure_ascii=False) for record in records[:50]) + "\n\n"
+                    + "\n".join(json.dumps(record, ensure_ascii=False) for record in records[50:]),
+                    encoding="utf-8")
+
+    registry = DataRegistry(str(tmp_path))
+    dataset = registry.get("products")
+    assert isinstance(dataset, JsonlDataset)
+    assert next(iter(dataset)) == records[0]
+    assert dataset._offsets is None  # 顺序读取不建立索引
+    assert len(dataset) == 100
+    assert dataset[73] == records[73]
+    assert dataset[-1] == records[-1]
+    assert dataset[10:13] == records[10:13]
+    assert list(dataset) == records
+    with pytest.raises(TypeError):
+        dataset[0]["name"] = "changed"
+
+    (tmp_path / "empty.jsonl").write_text("", encoding="utf-8")
+    assert list(registry.get("empty")) == []
+    registry.clear()
@@ -0,0 +1,183 @@
+"""
+数据库操作助手测试 - 连接池与统计计数
+"""
+import os
+import sqlite3
+import threading
+
+import pytest
+
+from utils.config import Config
+from utils.database_helper import DatabaseHelper, ConnectionPool
+
+INIT_SQL = os.path.join(os.path.dirname(os.path.abspath(__file__)), "../src/database/init.sql")
+
+
+@pytest.fixture
+def db_helper(tmp_path):
+    """基于临时数据库文件的数据库助手"""
+    db_path = str(tmp_path / "taobei.db")
+    helper = DatabaseHelper(db_path, wal=True)
+    with open(INIT_SQL, encoding="utf-8") as f:
+        helper.get_connection().executescript(f.read())
+    helper.reset_stats()
+    yield helper
+    helper.close()
+
+
+class TestConnectionPool:
+    """连接池测试"""
+
+    def test_reuses_connection_in_same_thread(self, db_helper):
+        """同一线程内多次操作复用同一个连接"""
+        db_helper.create_user_if_not_exists("13800138001")
+        db_helper.create_user_if_not_exists("13800138001")
+        assert db_helper.user_exists("13800138001")
+
+        stats = db_helper.get_stats()
+        assert stats["connections_opened"] == 0
+        assert stats["queries"] == 4
+
+    def test_helpers_share_pool_for_same_path(self, db_helper):
+        """相同数据库路径的助手实例共享连接池"""
+        other = DatabaseHelper(db_helper.db_path)
+        assert other.pool is db_helper.pool
+        assert other.get_connection() is db_helper.get_connection()
+
+    def test_wal_journal_mode(self, db_helper):
+        """wal=True 时连接池连接开启WAL日志模式"""
+        mode = db_helper.execute_query("PRAGMA journal_mode")[0]["journal_mode"]
+        assert mode == "wal"
+
+    def test_keeps_journal_mode_by_default(self, tmp_path):
+        """默认不改动数据库文件的日志模式"""
+        helper = DatabaseHelper(str(tmp_path / "other.db"))
+        try:
+            helper.execute_update("CREATE TABLE t (id INTEGER)")
+            assert helper.execute_query("PRAGMA journal_mode")[0]["journal_mode"] == "delete"
+        finally:
+            helper.close()
+
+    def test_one_connection_per_thread(self, db_helper):
+        """每个线程拥有独立的连接"""
+        phones = [f"1380013900{i}" for i in range(4)]
+        threads = [
+            threading.Thread(target=db_helper.create_test_user, args=(phone,))
+            for phone in phones
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert all(db_helper.user_exists(phone) for phone in phones)
+        assert db_helper.get_stats()["connections_opened"] == 4
+
+    def test_failed_write_releases_write_lock(self, db_helper):
+        """写入失败后回滚事务，复用的连接不再持有写锁"""
+        db_helper.create_test_user("13800138001")
+        with pytest.raises(sqlite3.IntegrityError):
+            db_helper.create_test_user("13800138001")
+        assert not db_helper.get_connection().in_transaction
+
+        other = DatabaseHelper(db_helper.db_path, pooled=False, busy_timeout=100)
+        other.create_test_user("13800138002")
+        assert db_helper.user_exists("13800138002")
+
+    def test_unpooled_mode_opens_connection_per_query(self, db_helper):
+        """关闭连接池时每次操作新建连接"""
+        helper = DatabaseHelper(db_helper.db_path, pooled=False)
+        helper.user_exists("13800138001")
+        helper.user_exists("13800138001")
+        assert helper.get_stats()["connections_opened"] == 2
+        assert helper.pool is not ConnectionPool.for_path(db_helper.db_path)
+
+
+class TestBulkOperations:
+    """批量造数与清理测试"""
+
+    def test_bulk_create_and_delete(self, db_helper):
+        """批量创建用户和验证码后批量删除"""
+        phones = [f"1390000{i:04d}" for i in range(100)]
+
+        assert db_helper.bulk_create_users(phones) == 100
+        assert db_helper.bulk_create_verification_codes(phones) == 100
+        assert db_helper.get_table_count("users") == 100
+        assert db_helper.is_verification_code_valid(phones[0], "123456")
+
+        assert db_helper.bulk_delete_by_phones(phones) == 200
+        assert db_helper.get_table_count("users") == 0
+        assert db_helper.get_table_count("verification_codes") == 0
+
+    def test_bulk_create_users_ignores_existing(self, db_helper):
+        """已存在的手机号不会重复创建"""
+        db_helper.create_test_user("13800138001", "测试用户1")
+        created = db_helper.bulk_create_users([
+            "13800138001",
+            {"phone_number": "13800138002", "nickname": "测试用户2"}
+        ])
+        assert created == 1
+        assert db_helper.get_user_by_phone("13800138002")["nickname"] == "测试用户2"
+
+    def test_bulk_operation_runs_in_single_transaction(self, db_helper):
+        """批量操作失败时整体回滚"""
+        db_helper.bulk_create_users(["13800138001"])
+        with pytest.raises(Exception):
+            db_helper.execute_batch([
+                ("DELETE FROM users WHERE phone_number = ?", [("13800138001",)]),
+                ("INSERT INTO missing_table VALUES (?)", [(1,)])
+            ])
+        assert db_helper.user_exists("13800138001")
+
+    def test_clean_and_setup_test_data(self, db_helper):
+        """清理与初始化测试数据"""
+        config = Config()
+        db_helper.bulk_create_users(config.get_test_phones(2, start=2))
+        db_helper.setup_test_data()
+        assert db_helper.user_exists(config.TEST_PHONE_REGISTERED)
+        assert not db_helper.user_exists(config.TEST_PHONE_UNREGISTERED)
+
+        db_helper.clean_test_data()
+        assert db_helper.get_table_count("users") == 0
+
+
+class TestDatabaseSnapshot:
+    """数据库快照测试"""
+
+    def test_restore_discards_all_changes(self, clean_database, database_snapshot):
+        """还原后任意手机号写入的数据都会被丢弃"""
+        clean_database.bulk_create_users(["13912345678", "13800138002"])
+        clean_database.create_verification_code("13912345678", "123456")
+        clean_database.delete_user_by_phone(Config().TEST_PHONE_REGISTERED)
+        assert clean_database.get_table_count("users") == 2
+
+        database_snapshot.restore(clean_database)
+        assert clean_database.get_table_count("users") == 1
+        assert clean_database.get_table_count("verification_codes") == 0
+        assert not clean_database.user_exists("13912345678")
+        assert clean_database.user_exists(Config().TEST_PHONE_REGISTERED)
+
+    def test_helper_uses_worker_copy(self, database_helper, worker_db_path):
+        """fixture 和 DatabaseHelper() 都指向worker的数据库副本，不会改动后端源码目录下的数据库"""
+        assert database_helper.db_path == worker_db_path == Config().DB_PATH
+        assert os.path.dirname(worker_db_path) != os.path.abspath(os.path.join(INIT_SQL, ".."))
+
+    def test_create_copy_overwrites_in_place(self, database_snapshot, tmp_path):
+        """工作库已存在时原地还原，已打开该文件的连接看到的是基准数据"""
+        target = str(tmp_path / "copy.db")
+        database_snapshot.create_copy(target)
+        holder = DatabaseHelper(target, pooled=False)
+        holder.bulk_create_users(["13912345678"])
+        inode = os.stat(target).st_ino
+
+        database_snapshot.create_copy(target)
+        assert os.stat(target).st_ino == inode
+        assert not holder.user_exists("13912345678")
+        assert holder.user_exists(Config().TEST_PHONE_REGISTERED)
+
+    def test_starts_from_snapshot(self, clean_database, database_snapshot):
+        """每个测试都从基准快照开始"""
+        assert clean_database.get_table_count("users") == 1
+        assert clean_database.get_table_count("verification_codes") == 0
+        assert clean_database.user_exists(Config().TEST_PHONE_REGISTERED)
+        assert database_snapshot.restore_count >= 1
@@ -0,0 +1,82 @@
+"""
+按历史耗时调度测试
+"""
+from utils.duration_scheduler import DurationStore, base_nodeid, lpt, plan_schedule
+
+pytest_plugins = ["pytester"]
+
+
+def test_lpt_balances_longest_first():
+    """最长的测试先分配，每次放到负载最小的分组"""
+    groups = lpt({"a": 7.0, "b": 5.0, "c": 4.0, "d": 3.0, "e": 1.0}, 2)
+    assert sorted(round(group["load"], 1) for group in groups) == [10.0, 10.0]
+    assert groups[0]["tests"][0] == "a"
+
+
+def test_plan_separates_browser_and_api_tests():
+    """浏览器测试和API测试分在不同的 worker，按预计总耗时最短划分 worker 数"""
+    tests = [(f"ui_{index}", "browser", 10.0) for index in range(6)] + \
+            [(f"api_{index}", "api", 0.5) for index in range(10)]
+    plan = plan_schedule(tests, 4)
+
+    assert plan["split"] == {"browser": 3, "api": 1}
+    assert plan["makespan"] == 20.0
+    for group in plan["groups"]:
+        kinds = {nodeid.split("_")[0] for nodeid in group["tests"]}
+        assert kinds == ({"ui"} if group["kind"] == "browser" else {"api"})
+    assert sum(len(group["tests"]) for group in plan["groups"]) == 16
+
+
+def test_plan_single_worker_uses_one_group():
+    """只有一个 worker 时所有测试在同一分组"""
+    plan = plan_schedule([("ui", "browser", 3.0), ("api", "api", 1.0)], 1)
+    assert [group["name"] for group in plan["groups"]] == ["lpt-mixed-0"]
+    assert plan["makespan"] == 4.0
+
+
+def test_store_smooths_and_estimates_unknown(tmp_path):
+    """历史耗时平滑更新；没有历史的测试取同类测试的中位数"""
+    store = DurationStore(str(tmp_path / "durations.json"))
+    store.update({"ui_a": 8.0, "ui_b": 4.0, "api_a": 0.2})
+    store.update({"ui_a": 4.0})
+    store.save()
+
+    store = DurationStore(str(tmp_path / "durations.json"))
+    assert store.durations["ui_a"] == 6.0
+    estimates = store.estimate([("ui_a", "browser"), ("ui_b", "browser"), ("ui_new", "browser"),
+                                ("api_a", "api"), ("api_new", "api")])
+    assert estimates == {"ui_a": 6.0, "ui_b": 4.0, "ui_new": 5.0, "api_a": 0.2, "api_new": 0.2}
+    assert store.estimate([("x", "browser")]) == {"x": 10.0}
+
+
+def test_base_nodeid_strips_group_suffix():
+    """去掉 loadgroup 的分组后缀，参数中的 @ 保留"""
+    assert base_nodeid("test_a.py::test_x@lpt-api-0") == "test_a.py::test_x"
+    assert base_nodeid("test_a.py::test_x[a@b]") == "test_a.py::test_x[a@b]"
+
+
+def test_recorder_writes_durations(pytester, tmp_path):
+    """会话结束后写入每个测试的耗时，跳过的测试不记录"""
+    path = tmp_path / "durations.json"
+    pytester.makeconftest(f"""
+        from utils.duration_scheduler import DurationRecorder, DurationStore
+
+        def pytest_configure(config):
+            config.pluginmanager.register(DurationRecorder(DurationStore({str(path)!r})), "duration_recorder")
+    """)
+    pytester.makepyfile("""
+        import time
+        import pytest
+
+        def test_slow():
+            time.sleep(0.05)
+
+        @pytest.mark.skip
+        def test_skipped():
+            pass
+    """)
+    pytester.runpytest().assert_outcomes(passed=1, skipped=1)
+
+    durations = DurationStore(str(path)).durations
+    assert list(durations) == ["test_recorder_writes_durations.py::test_slow"]
+    assert durations["test_recorder_writes_durations.py::test_slow"] >= 0.05
@@ -0,0 +1,69 @@
+"""
+收集耗时基准：纯API测试的收集不应加载浏览器相关模块
+
+在子进程中用 python -X importtime 收集 test_api_modules.py，检查导入的模块和
+本仓库模块（conftest 引入的 utils 等）的累计导入耗时。预算可用环境变量
+IMPORT_BUDGET_MS 调整。
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+TESTING_DIR = Path(__file__).resolve().parent
+
+# 纯API测试收集时不应导入的模块
+BROWSER_MODULES = ("playwright", "behave", "pages", "features", "utils.bdd_engine")
+
+# 本仓库模块的累计导入耗时预算（毫秒）
+IMPORT_BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", "300"))
+
+
+def _importtime(*args):
+    """在子进程中运行并解析 -X importtime 的输出，返回 [(模块名, 缩进层级, 累计微秒)]"""
+    result = subprocess.run([sys.executable, "-X", "importtime", *args], cwd=TESTING_DIR,
+                            capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stdout + result.stderr
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        stripped = name.lstrip(" ")
+        modules.append((stripped, (len(name) - len(stripped) - 1) // 2, int(cumulative)))
+    return modules
+
+
+def _loaded(modules, prefixes):
+    return sorted({name for name, _, _ in modules if name.split(".")[0] in prefixes or name in prefixes})
+
+
+def test_api_only_collection_stays_within_budget():
+    """收集纯API测试不导入 Playwright/behave/页面对象，本仓库模块导入耗时在预算内"""
+    modules = _importtime("-m", "pytest", "--collect-only", "-q", "-s", "-p", "no:cacheprovider",
+                          "-o", "addopts=", "test_api_modules.py")
+
+    assert _loaded(modules, BROWSER_MODULES) == []
+
+    # 只统计顶层导入，子模块的耗时已包含在累计值中
+    repo_ms = sum(cumulative for name, depth, cumulative in modules
+                  if depth == 0 and name.split(".")[0] in ("utils", "conftest")) / 1000
+    assert repo_ms <= IMPORT_BUDGET_MS, f"本仓库模块导入耗时 {repo_ms:.1f}ms 超出预算 {IMPORT_BUDGET_MS}ms"
+
+
+def test_step_modules_do_not_load_playwright():
+    """步骤模块只在步骤用到页面对象时才导入 Playwright
+
+    步骤模块通过 importlib 导入，-X importtime 不记录，这里直接检查 sys.modules。
+    """
+    script = ("import json, sys\n"
+              "from utils.bdd_engine import load_step_definitions\n"
+              "load_step_definitions()\n"
+              "print(json.dumps(sorted(sys.modules)))")
+    result = subprocess.run([sys.executable, "-c", script], cwd=TESTING_DIR,
+                            capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    loaded = json.loads(result.stdout.splitlines()[-1])
+    assert "features.steps.login_steps" in loaded
+    assert [name for name in loaded if name.split(".")[0] == "playwright"] == []
@@ -0,0 +1,116 @@
+"""
+负载生成器测试 - 使用 httpx.MockTransport；冒烟测试需要后端服务
+"""
+import asyncio
+import os
+
+import httpx
+import pytest
+import requests
+
+from utils.circuit_breaker import BackendUnavailable, guarded_request
+from utils.config import Config
+from utils.database_helper import DatabaseHelper
+from utils.load_generator import LoadGenerator, load_performance_settings, percentile
+
+INIT_SQL = os.path.join(os.path.dirname(os.path.abspath(__file__)), "../src/database/init.sql")
+
+
+def test_percentile():
+    """分位数计算"""
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 99) == 99
+    assert percentile([], 50) == 0.0
+
+
+def test_performance_settings():
+    """读取 performance.json 中的负载配置"""
+    settings = load_performance_settings()
+    assert settings["concurrent_users"] == [5, 10, 20, 50]
+    assert len(settings["stress_test_phones"]) == 1000
+
+
+# src/backend/app.js 提供的接口，其他路径返回 404
+BACKEND_ROUTES = {("POST", "/api/auth/login"), ("POST", "/api/auth/logout"), ("GET", "/api/health")}
+
+
+def test_run_level_reports_per_endpoint_stats():
+    """按接口统计吞吐量、延迟、错误率和状态码；流程只调用后端实际提供的接口"""
+    def handler(request):
+        if (request.method, request.url.path) not in BACKEND_ROUTES:
+            return httpx.Response(404, json={"error": "接口不存在"})
+        if request.url.path.endswith("/auth/login"):
+            if b"13800131001" in request.content:
+                return httpx.Response(400, json={"error": "该手机号未注册，请先完成注册"})
+            return httpx.Response(200, json={"token": "token"})
+        return httpx.Response(200, json={"message": "ok"})
+
+    config = Config()
+    config.API_BASE_URL = "http://testserver/api"
+    generator = LoadGenerator(
+        config,
+        phones=["13800131000", "13800131001"],
+        code_provider=lambda phone: "123456",
+        transport=httpx.MockTransport(handler)
+    )
+
+    result = asyncio.run(generator.run_level(concurrency=4, duration=0.2))
+
+    endpoints = result["endpoints"]
+    assert result["concurrent_users"] == 4
+    assert endpoints["login"]["requests"] > 0
+    assert endpoints["login"]["error_rate"] == 0.5
+    assert set(endpoints["login"]["status_codes"]) == {"200", "400"}
+    assert endpoints["logout"]["requests"] == endpoints["login"]["status_codes"]["200"]
+    assert endpoints["health"]["error_rate"] == 0.0
+    assert endpoints["health"]["p99_ms"] >= endpoints["health"]["p50_ms"]
+    assert all("404" not in item["status_codes"] for item in endpoints.values())
+    assert result["total_requests"] == sum(item["requests"] for item in endpoints.values())
+
+
+def test_cleanup_removes_seeded_users_and_codes(tmp_path):
+    """压测写入的用户和验证码在 cleanup() 后删除，其他数据保留"""
+    helper = DatabaseHelper(str(tmp_path / "taobei.db"))
+    with open(INIT_SQL, encoding="utf-8") as f:
+        helper.get_connection().executescript(f.read())
+    helper.create_test_user("13800138000")
+
+    config = Config()
+    config.DB_PATH = helper.db_path
+    generator = LoadGenerator(config, phones=["13800131000", "13800131001", "13800131002"])
+    generator.prepare_users(2)
+    generator.code_provider("13800131000")
+    generator.code_provider("13800131002")
+    assert helper.get_table_count("users") == 3
+
+    assert generator.cleanup() == 4
+    assert helper.get_table_count("users") == 1
+    assert helper.get_table_count("verification_codes") == 0
+    assert helper.user_exists("13800138000")
+    helper.close()
+
+
+@pytest.mark.usefixtures("preflight")
+def test_smoke_against_backend(database_helper):
+    """对真实后端跑一小段负载：流程中的每个接口都存在且没有服务端错误"""
+    config = Config()
+    try:
+        guarded_request("GET", config.get_api_url("health"), timeout=5)
+    except BackendUnavailable:
+        raise  # 后端已熔断：交给 skip_rejected 统一跳过
+    except requests.exceptions.ConnectionError:
+        pytest.skip(f"无法连接到后端服务 {config.API_BASE_URL}，可使用 --start-backend 自动启动")
+
+    generator = LoadGenerator(config, phones=config.get_test_phones(2, start=10))
+    try:
+        generator.prepare_users(2)
+        result = asyncio.run(generator.run_level(concurrency=2, duration=0.5))
+    finally:
+        generator.cleanup()
+
+    for endpoint, stats in result["endpoints"].items():
+        assert stats["requests"] > 0, endpoint
+        codes = stats["status_codes"]
+        assert "404" not in codes and not any(code.startswith("5") for code in codes), f"{endpoint}: {codes}"
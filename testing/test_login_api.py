@@ -12,8 +12,13 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from utils.api_helper import APIHelper
+from utils.circuit_breaker import BackendUnavailable, guarded_request
+from utils.config import Config
 from utils.database_helper import DatabaseHelper
 
+# 需要后端服务：会话中第一次用到时执行运行前预检（并按配置自动启动后端）
+pytestmark = pytest.mark.usefixtures("preflight")
+
 class TestLoginAPI:
     """登录API测试类"""
     
@@ -21,7 +26,7 @@ class TestLoginAPI:
         """测试前准备"""
         self.api_helper = APIHelper()
         self.db_helper = DatabaseHelper()
-        self.base_url = "http://localhost:3001/api"
+        self.base_url = Config().API_BASE_URL
         print("API测试环境准备完成")
     
     def test_get_verification_code_valid_phone(self):
@@ -30,7 +35,8 @@ class TestLoginAPI:
         
         try:
             # 发送获取验证码请求
-            response = requests.post(
+            response = guarded_request(
+                "POST",
                 f"{self.base_url}/auth/send-verification-code",
                 json={"phone": phone_number},
                 timeout=10
@@ -51,9 +57,11 @@ class TestLoginAPI:
                 print(f"⚠ 服务器响应状态码: {response.status_code}")
                 print("注意: 这可能是因为后端服务未启动或接口路径不正确")
                 
+        except BackendUnavailable:
+            raise  # 后端已熔断：交给 skip_rejected 统一跳过
         except requests.exceptions.ConnectionError:
             print("⚠ 无法连接到后端服务，请确保后端服务正在运行")
-            print("提示: 请检查 http://localhost:3000 是否可访问")
+            print(f"提示: 请检查 {self.base_url} 是否可访问，或使用 --start-backend 自动启动后端")
         except Exception as e:
             print(f"⚠ 测试过程中发生异常: {str(e)}")
     
@@ -63,7 +71,8 @@ class TestLoginAPI:
         
         try:
             # 发送获取验证码请求
-            response = requests.post(
+            response = guarded_request(
+                "POST",
                 f"{self.base_url}/auth/send-verification-code",
                 json={"phone": invalid_phone},
                 timeout=10
@@ -83,6 +92,8 @@ class TestLoginAPI:
             else:
                 print(f"⚠ 预期状态码400，实际状态码: {response.status_code}")
                 
+        except BackendUnavailable:
+            raise  # 后端已熔断：交给 skip_rejected 统一跳过
         except requests.exceptions.ConnectionError:
             print("⚠ 无法连接到后端服务，请确保后端服务正在运行")
         except Exception as e:
@@ -95,7 +106,8 @@ class TestLoginAPI:
         
         try:
             # 发送登录请求
-            response = requests.post(
+            response = guarded_request(
+                "POST",
                 f"{self.base_url}/auth/login",
                 json={
                     "phone": phone_number,
@@ -120,6 +132,8 @@ class TestLoginAPI:
             else:
                 print(f"⚠ 服务器响应状态码: {response.status_code}")
                 
+        except BackendUnavailable:
+            raise  # 后端已熔断：交给 skip_rejected 统一跳过
         except requests.exceptions.ConnectionError:
             print("⚠ 无法连接到后端服务，请确保后端服务正在运行")
         except Exception as e:
@@ -132,7 +146,8 @@ class TestLoginAPI:
         
         try:
             # 发送登录请求
-            response = requests.post(
+            response = guarded_request(
+                "POST",
                 f"{self.base_url}/auth/login",
                 json={
                     "phone": phone_number,
@@ -154,6 +169,8 @@ class TestLoginAPI:
             else:
                 print(f"⚠ 预期状态码400或401，实际状态码: {response.status_code}")
                 
+        except BackendUnavailable:
+            raise  # 后端已熔断：交给 skip_rejected 统一跳过
         except requests.exceptions.ConnectionError:
             print("⚠ 无法连接到后端服务，请确保后端服务正在运行")
         except Exception as e:
@@ -162,24 +179,16 @@ class TestLoginAPI:
     def test_backend_service_health(self):
         """测试后端服务健康状态"""
         try:
-            # 测试根路径
-            response = requests.get("http://localhost:3001", timeout=5)
-            print(f"后端服务根路径状态码: {response.status_code}")
-            
-            # 测试API路径
-            api_response = requests.get(f"{self.base_url}/health", timeout=5)
-            print(f"API健康检查状态码: {api_response.status_code}")
-            
-            if response.status_code == 200:
-                print("✓ 后端服务运行正常")
-            else:
-                print("⚠ 后端服务可能存在问题")
-                
+            api_response = guarded_request("GET", f"{self.base_url}/health", timeout=5)
+        except BackendUnavailable:
+            raise  # 后端已熔断：交给 skip_rejected 统一跳过
         except requests.exceptions.ConnectionError:
-            print("❌ 无法连接到后端服务")
-            print("请确保后端服务正在 http://localhost:3001 运行")
-        except Exception as e:
-            print(f"⚠ 健康检查过程中发生异常: {str(e)}")
+            pytest.skip(f"无法连接到后端服务 {self.base_url}，可使用 --start-backend 自动启动")
+        
+        print(f"API健康检查状态码: {api_response.status_code}")
+        assert api_response.status_code == 200, "后端健康检查应该返回200"
+        assert api_response.json().get("status") == "OK"
+        print("✓ 后端服务运行正常")
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "-s"])
\ No newline at end of file
@@ -1,183 +0,0 @@
-"""
-修复后的登录BDD测试
-解决中文关键词识别问题
-"""
-import pytest
-from pytest_bdd import scenarios, given, when, then, parsers
-import sys
-import os
-
-# 添加项目路径
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-
-# 导入必要的模块
-from utils.database_helper import DatabaseHelper
-from utils.api_helper import APIHelper
-from pages.login_page import LoginPage
-
-# 加载登录功能的场景
-scenarios('features/login.feature')
-
-# 步骤定义 - 背景步骤
-@given('系统已经启动')
-def system_started():
-    """系统已经启动"""
-    print("步骤：系统已经启动")
-    return True
-
-@given('数据库已经初始化')
-def database_initialized():
-    """数据库已经初始化"""
-    print("步骤：数据库已经初始化")
-    db_helper = DatabaseHelper()
-    db_helper.setup_test_data()
-    return True
-
-# 步骤定义 - 登录场景步骤
-@given('用户在登录页面')
-def user_on_login_page():
-    """用户在登录页面"""
-    print("步骤：用户在登录页面")
-    return True
-
-@given(parsers.parse('一个手机号"{phone}"未被注册'))
-def phone_not_registered(phone):
-    """确保手机号未被注册"""
-    print(f"步骤：确保手机号 {phone} 未被注册")
-    db_helper = DatabaseHelper()
-    db_helper.delete_user_by_phone(phone)
-    return True
-
-@given(parsers.parse('一个手机号"{phone}"已被注册'))
-def phone_already_registered(phone):
-    """确保手机号已被注册"""
-    print(f"步骤：确保手机号 {phone} 已被注册")
-    db_helper = DatabaseHelper()
-    if not db_helper.user_exists(phone):
-        db_helper.create_test_user(phone, "测试用户")
-    return True
-
-@when(parsers.parse('用户在登录页面输入一个无效的手机号"{phone}"并点击"获取验证码"'))
-def enter_invalid_phone_and_click_get_code(phone):
-    """用户输入无效手机号并点击获取验证码"""
-    print(f"步骤：用户输入无效手机号 {phone} 并点击获取验证码")
-    api_helper = APIHelper()
-    
-    try:
-        response = api_helper.send_verification_code(phone)
-        return response
-    except Exception as e:
-        print(f"预期的错误：{e}")
-        return None
-
-@then('系统不发送验证码')
-def system_does_not_send_code():
-    """系统不发送验证码"""
-    print("步骤：系统不发送验证码")
-    return True
-
-@then(parsers.parse('页面提示"{message}"'))
-def page_shows_message(message):
-    """页面显示指定消息"""
-    print(f"步骤：页面提示 {message}")
-    return True
-
-@when(parsers.parse('用户在登录页面输入一个格式正确的手机号"{phone}"并点击"获取验证码"'))
-def enter_valid_phone_and_click_get_code(phone):
-    """用户输入有效手机号并点击获取验证码"""
-    print(f"步骤：用户输入有效手机号 {phone} 并点击获取验证码")
-    api_helper = APIHelper()
-    
-    try:
-        response = api_helper.send_verification_code(phone)
-        print(f"验证码发送响应：{response.status_code}")
-        return response
-    except Exception as e:
-        print(f"发送验证码时出错：{e}")
-        return None
-
-@then('系统为该手机号生成一个6位验证码并打印在控制台')
-def system_generates_and_prints_code():
-    """系统生成6位验证码并打印"""
-    print("步骤：系统为该手机号生成一个6位验证码并打印在控制台")
-    print("生成的验证码：123456")  # 模拟验证码
-    return True
-
-@when(parsers.parse('用户输入手机号"{phone}"和验证码"{code}"并点击登录'))
-def enter_phone_code_and_login(phone, code):
-    """用户输入手机号和验证码并登录"""
-    print(f"步骤：用户输入手机号 {phone} 和验证码 {code} 并点击登录")
-    api_helper = APIHelper()
-    
-    try:
-        response = api_helper.login_user({
-            "phone_number": phone,
-            "verification_code": code
-        })
-        return response
-    except Exception as e:
-        print(f"登录时出错：{e}")
-        return None
-
-@then('用户成功登录')
-def user_successfully_logged_in():
-    """用户成功登录"""
-    print("步骤：用户成功登录")
-    return True
-
-@then('页面跳转到首页')
-def page_redirects_to_home():
-    """页面跳转到首页"""
-    print("步骤：页面跳转到首页")
-    return True
-
-@then('"获取验证码"按钮进入60秒倒计时且不可点击')
-def get_code_button_countdown():
-    """获取验证码按钮进入倒计时"""
-    print("步骤：获取验证码按钮进入60秒倒计时且不可点击")
-    return True
-
-@then('数据库记录手机号和验证码，有效期为60秒')
-def database_records_phone_and_code():
-    """数据库记录手机号和验证码"""
-    print("步骤：数据库记录手机号和验证码，有效期为60秒")
-    return True
-
-@when(parsers.parse('用户使用该未注册的手机号和正确的验证码点击"登录"'))
-def login_with_unregistered_phone():
-    """使用未注册手机号登录"""
-    print("步骤：用户使用该未注册的手机号和正确的验证码点击登录")
-    return True
-
-@then('系统不让用户登录')
-def system_denies_login():
-    """系统拒绝登录"""
-    print("步骤：系统不让用户登录")
-    return True
-
-@when(parsers.parse('用户使用该手机号和错误的验证码"{code}"点击"登录"'))
-def login_with_wrong_code(code):
-    """使用错误验证码登录"""
-    print(f"步骤：用户使用该手机号和错误的验证码 {code} 点击登录")
-    return True
-
-@when('用户使用该手机号和正确的验证码点击"登录"')
-def login_with_correct_code():
-    """使用正确验证码登录"""
-    print("步骤：用户使用该手机号和正确的验证码点击登录")
-    return True
-
-@then('系统验证成功')
-def system_verification_success():
-    """系统验证成功"""
-    print("步骤：系统验证成功")
-    return True
-
-@then('页面自动跳转到首页')
-def page_auto_redirects_to_home():
-    """页面自动跳转到首页"""
-    print("步骤：页面自动跳转到首页")
-    return True
-
-if __name__ == "__main__":
-    pytest.main([__file__, "-v", "-s"])
\ No newline at end of file
@@ -0,0 +1,87 @@
+"""
+模拟后端测试
+"""
+from utils.mock_api import MockBackend
+
+
+class TestMockProducts:
+    """商品接口测试"""
+
+    def test_pagination(self):
+        """分页信息与商品数量一致"""
+        status, data = MockBackend().handle("GET", "/api/products", {"page": "2", "pageSize": "2"})
+        assert status == 200
+        assert [product["id"] for product in data["products"]] == [3, 4]
+        assert data["pagination"] == {
+            "current_page": 2, "page_size": 2, "total_items": 5,
+            "total_pages": 3, "has_next": True, "has_prev": True
+        }
+
+    def test_invalid_pagination(self):
+        """非法分页参数返回与后端一致的错误"""
+        backend = MockBackend()
+        for params in backend.data.get_invalid_pagination_params():
+            status, data = backend.handle("GET", "/api/products",
+                                          {"page": str(params["page"]), "pageSize": str(params["pageSize"])})
+            assert status == 400
+            assert data["error"] == params["error"]
+
+    def test_search_filter_and_sort(self):
+        """关键词、分类和排序组合"""
+        status, data = MockBackend().handle("GET", "/api/products", {
+            "category": "电子产品", "sortBy": "price", "sortOrder": "DESC"
+        })
+        prices = [product["price"] for product in data["products"]]
+        assert status == 200
+        assert prices == sorted(prices, reverse=True)
+        assert {product["category"] for product in data["products"]} == {"电子产品"}
+
+        _, data = MockBackend().handle("GET", "/api/products", {"keyword": "iphone"})
+        assert [product["name"] for product in data["products"]] == ["iPhone 15 Pro"]
+
+    def test_product_detail(self):
+        """商品详情和不存在的商品"""
+        backend = MockBackend()
+        assert backend.handle("GET", "/api/products/1")[1]["name"] == "iPhone 15 Pro"
+        assert backend.handle("GET", "/api/products/99999")[0] == 404
+        assert backend.handle("GET", "/api/products/abc")[0] == 400
+
+
+class TestMockAuth:
+    """认证接口测试"""
+
+    def test_login_requires_sent_code(self):
+        """先发送验证码才能登录，验证码只能使用一次"""
+        backend = MockBackend()
+        body = {"phoneNumber": "13800138001", "verificationCode": "123456"}
+        assert backend.handle("POST", "/api/auth/login", body=body)[0] == 400
+
+        assert backend.handle("POST", "/api/auth/send-verification-code", body={"phoneNumber": "13800138001"})[0] == 200
+        status, data = backend.handle("POST", "/api/auth/login", body=body)
+        assert status == 200
+        assert data["user"]["phoneNumber"] == "13800138001"
+        assert data["token"]
+        assert backend.handle("POST", "/api/auth/login", body=body)[0] == 400
+
+    def test_register_then_reset(self):
+        """注册新用户，reset 后恢复初始数据"""
+        backend = MockBackend(registered_phones=["13800139001"])
+        phone = "13900000000"
+        backend.handle("POST", "/api/auth/send-verification-code", body={"phone": phone})
+        status, data = backend.handle("POST", "/api/auth/register", body={
+            "phone": phone, "code": "123456", "agreeToTerms": "true"
+        })
+        assert status == 201
+        assert data["message"] == "注册成功"
+
+        backend.reset()
+        assert backend.data.get_user_by_phone(phone) is None
+        assert backend.data.get_user_by_phone("13800139001") is not None
+
+    def test_unregistered_phone_cannot_login(self):
+        """未注册手机号登录失败"""
+        backend = MockBackend()
+        backend.handle("POST", "/api/auth/send-verification-code", body={"phone": "13900000001"})
+        status, data = backend.handle("POST", "/api/auth/login", body={"phone": "13900000001", "code": "123456"})
+        assert status == 400
+        assert data["error"] == "该手机号未注册，请先完成注册"
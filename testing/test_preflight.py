@@ -0,0 +1,38 @@
+"""
+运行前预检测试
+"""
+import socket
+import time
+
+from utils.backend_server import find_free_port
+from utils.preflight import format_results, run_preflight
+
+
+def test_preflight_stays_within_budget(tmp_path):
+    """无响应的地址不会拖慢预检，所有目标并行检查"""
+    hanging = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    hanging.bind(("127.0.0.1", 0))
+    hanging.listen(8)  # 接受连接但从不响应
+    database = tmp_path / "taobei.db"
+    database.write_bytes(b"")
+    targets = [
+        {"name": "backend", "url": f"http://127.0.0.1:{hanging.getsockname()[1]}/api/health"},
+        {"name": "frontend", "url": f"http://127.0.0.1:{find_free_port()}"},
+        {"name": "database", "path": str(database)},
+        {"name": "missing", "path": str(tmp_path / "missing.db")},
+    ]
+    try:
+        start = time.perf_counter()
+        results = run_preflight(targets, budget=0.5)
+        elapsed = time.perf_counter() - start
+    finally:
+        hanging.close()
+
+    assert elapsed < 1.0
+    by_name = {result["name"]: result for result in results}
+    assert [result["name"] for result in results] == ["backend", "frontend", "database", "missing"]
+    assert not by_name["backend"]["ok"]
+    assert by_name["frontend"]["error"] == "无法连接"
+    assert by_name["database"]["ok"]
+    assert by_name["missing"]["error"] == "文件不存在"
+    assert "❌ 无法连接" in format_results(results, "ci")
@@ -1,198 +0,0 @@
-"""
-修复后的注册BDD测试
-解决中文关键词识别问题并实现完整的步骤定义
-"""
-import pytest
-from pytest_bdd import scenarios, given, when, then, parsers
-import sys
-import os
-
-# 添加项目路径
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-
-# 导入必要的模块
-from utils.database_helper import DatabaseHelper
-from utils.api_helper import APIHelper
-from pages.register_page import RegisterPage
-
-# 加载注册功能的场景
-scenarios('features/register.feature')
-
-# 步骤定义 - 背景步骤
-@given('系统已经启动')
-def system_started():
-    """系统已经启动"""
-    print("步骤：系统已经启动")
-    return True
-
-@given('数据库已经初始化')
-def database_initialized():
-    """数据库已经初始化"""
-    print("步骤：数据库已经初始化")
-    db_helper = DatabaseHelper()
-    db_helper.setup_test_data()
-    return True
-
-# 步骤定义 - 注册场景步骤
-@given('用户在注册页面')
-def user_on_register_page():
-    """用户在注册页面"""
-    print("步骤：用户在注册页面")
-    return True
-
-@given(parsers.parse('一个手机号"{phone}"已被注册'))
-def phone_already_registered(phone):
-    """确保手机号已被注册"""
-    print(f"步骤：确保手机号 {phone} 已被注册")
-    db_helper = DatabaseHelper()
-    if not db_helper.user_exists(phone):
-        db_helper.create_test_user(phone, "测试用户")
-    return True
-
-@when(parsers.parse('用户输入一个无效的手机号"{phone}"并点击"获取验证码"'))
-def enter_invalid_phone_and_click_get_code(phone):
-    """用户输入无效手机号并点击获取验证码"""
-    print(f"步骤：用户输入无效手机号 {phone} 并点击获取验证码")
-    api_helper = APIHelper()
-    
-    try:
-        response = api_helper.send_verification_code(phone)
-        return response
-    except Exception as e:
-        print(f"预期的错误：{e}")
-        return None
-
-@then('系统不发送验证码')
-def system_does_not_send_code():
-    """系统不发送验证码"""
-    print("步骤：系统不发送验证码")
-    return True
-
-@then(parsers.parse('页面提示"{message}"'))
-def page_shows_message(message):
-    """页面显示指定消息"""
-    print(f"步骤：页面提示 {message}")
-    return True
-
-@when(parsers.parse('用户输入一个格式正确的手机号"{phone}"并点击"获取验证码"'))
-def enter_valid_phone_and_click_get_code(phone):
-    """用户输入有效手机号并点击获取验证码"""
-    print(f"步骤：用户输入有效手机号 {phone} 并点击获取验证码")
-    api_helper = APIHelper()
-    
-    try:
-        response = api_helper.send_verification_code(phone)
-        print(f"验证码发送响应：{response.status_code}")
-        return response
-    except Exception as e:
-        print(f"发送验证码时出错：{e}")
-        return None
-
-@then('系统为该手机号生成一个6位验证码并打印在控制台')
-def system_generates_and_prints_code():
-    """系统生成6位验证码并打印"""
-    print("步骤：系统为该手机号生成一个6位验证码并打印在控制台")
-    print("生成的验证码：123456")  # 模拟验证码
-    return True
-
-@then('"获取验证码"按钮进入60秒倒计时且不可点击')
-def get_code_button_countdown():
-    """获取验证码按钮进入倒计时"""
-    print("步骤：获取验证码按钮进入60秒倒计时且不可点击")
-    return True
-
-@then('数据库记录手机号和验证码，有效期为60秒')
-def database_records_phone_and_code():
-    """数据库记录手机号和验证码"""
-    print("步骤：数据库记录手机号和验证码，有效期为60秒")
-    return True
-
-@when('用户使用该手机号和正确的验证码点击"注册"')
-def user_register_with_existing_phone():
-    """使用已注册手机号进行注册"""
-    print("步骤：用户使用该手机号和正确的验证码点击注册")
-    return True
-
-@then('系统不创建新用户')
-def system_does_not_create_new_user():
-    """系统不创建新用户"""
-    print("步骤：系统不创建新用户")
-    return True
-
-@then('用户成功登录并跳转到首页')
-def user_login_and_redirect_to_home():
-    """用户成功登录并跳转到首页"""
-    print("步骤：用户成功登录并跳转到首页")
-    return True
-
-@given('用户在注册页面输入了手机号和验证码')
-def user_entered_phone_and_code():
-    """用户在注册页面输入了手机号和验证码"""
-    print("步骤：用户在注册页面输入了手机号和验证码")
-    return True
-
-@when('用户未勾选"同意《淘贝用户协议》"复选框')
-def user_not_agree_terms():
-    """用户未勾选用户协议"""
-    print("步骤：用户未勾选同意《淘贝用户协议》复选框")
-    return True
-
-@when('用户勾选"同意《淘贝用户协议》"复选框')
-def user_agree_terms():
-    """用户勾选用户协议"""
-    print("步骤：用户勾选同意《淘贝用户协议》复选框")
-    return True
-
-@then('"注册"按钮为不可点击状态')
-def register_button_disabled():
-    """注册按钮为不可点击状态"""
-    print("步骤：注册按钮为不可点击状态")
-    return True
-
-@then('"注册"按钮变为可点击状态')
-def register_button_enabled():
-    """注册按钮变为可点击状态"""
-    print("步骤：注册按钮变为可点击状态")
-    return True
-
-@when(parsers.parse('用户输入未注册的手机号"{phone}"和正确的验证码，勾选协议并点击"注册"'))
-def register_new_user_with_agreement(phone):
-    """用户输入未注册手机号并完成注册"""
-    print(f"步骤：用户输入未注册的手机号 {phone} 和正确的验证码，勾选协议并点击注册")
-    
-    # 确保手机号未被注册
-    db_helper = DatabaseHelper()
-    db_helper.delete_user_by_phone(phone)
-    
-    # 模拟注册过程
-    api_helper = APIHelper()
-    try:
-        # 先发送验证码
-        response = api_helper.send_verification_code(phone)
-        print(f"验证码发送响应：{response.status_code}")
-        
-        # 然后进行注册
-        register_response = api_helper.register_user({
-            "phone_number": phone,
-            "verification_code": "123456"
-        })
-        print(f"注册响应：{register_response.status_code}")
-        return register_response
-    except Exception as e:
-        print(f"注册时出错：{e}")
-        return None
-
-@then('系统在数据库中创建新用户')
-def system_creates_new_user():
-    """系统在数据库中创建新用户"""
-    print("步骤：系统在数据库中创建新用户")
-    return True
-
-@then('用户成功登录并自动跳转到首页')
-def user_auto_login_and_redirect():
-    """用户成功登录并自动跳转到首页"""
-    print("步骤：用户成功登录并自动跳转到首页")
-    return True
-
-if __name__ == "__main__":
-    pytest.main([__file__, "-v", "-s"])
\ No newline at end of file
@@ -0,0 +1,189 @@
+"""
+重试策略测试
+"""
+import random
+
+import pytest
+import requests
+from playwright.sync_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+
+from pages.base_page import BasePage, _ui_retry_reason
+from utils.api_helper import APIHelper
+from utils.circuit_breaker import BackendUnavailable
+from utils.config import Config
+from utils.retry_policy import RetryPolicy, RetryStats, api_retry_reason
+
+
+def _response(status: int, text: str = "{}") -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response._content = text.encode("utf-8")
+    return response
+
+
+@pytest.fixture
+def stats():
+    stats = RetryStats()
+    stats.start_test("test_retry_policy.py::case")
+    return stats
+
+
+def _helper(stats, outcomes, **kwargs):
+    """按顺序返回 outcomes 中的响应或抛出其中的异常"""
+    sleeps = []
+    policy = RetryPolicy(max_retries=3, base_delay=1.0, jitter=0, stats=stats, sleep=sleeps.append, **kwargs)
+    helper = APIHelper(Config(), retry_policy=policy)
+    outcomes = iter(outcomes)
+
+    def send(method, endpoint, url, **kwargs):
+        outcome = next(outcomes)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    helper._send = send
+    helper.config.CIRCUIT_BREAKER = False
+    return helper, sleeps
+
+
+def test_backoff_is_exponential_with_bounded_jitter():
+    policy = RetryPolicy(base_delay=1.0, max_delay=8.0, jitter=0)
+    assert [policy.backoff(attempt) for attempt in range(5)] == [1.0, 2.0, 4.0, 8.0, 8.0]
+
+    jittered = RetryPolicy(base_delay=1.0, max_delay=8.0, jitter=0.5, rng=random.Random(1))
+    delays = [jittered.backoff(2) for _ in range(100)]
+    assert all(2.0 <= delay <= 4.0 for delay in delays) and len(set(delays)) > 1
+
+
+def test_config_drives_policy(monkeypatch):
+    monkeypatch.setenv("MAX_RETRIES", "0")
+    monkeypatch.setenv("RETRY_DELAY", "250")
+    policy = RetryPolicy.from_config()
+    assert policy.max_retries == 0 and policy.base_delay == 0.25
+
+
+def test_idempotent_request_retries_transient_errors(stats):
+    """GET 在 5xx 和连接错误后退避重试，成功后返回，每次重试都被记录"""
+    helper, sleeps = _helper(stats, [_response(503), requests.exceptions.ConnectionError("reset"), _response(200)])
+    assert helper.get_product_detail(7).status_code == 200
+    assert sleeps == [1.0, 2.0]
+    entry = stats.tests["test_retry_policy.py::case"]
+    assert entry["retries"] == 2 and entry["delay_s"] == 3.0
+    assert entry["reasons"] == {"GET /products/{id} http_503": 1, "GET /products/{id} connection_error": 1}
+
+
+def test_post_only_retries_when_request_was_not_applied(stats):
+    """POST 的 5xx 不重试；连接未建立或 SQLITE_BUSY 时写入未执行，可以重试"""
+    helper, sleeps = _helper(stats, [_response(500)])
+    assert helper.login("13800138000", "123456").status_code == 500
+    assert sleeps == []
+
+    helper, sleeps = _helper(stats, [requests.exceptions.ConnectTimeout("connect"),
+                                     _response(500, '{"error": "SQLITE_BUSY: database is locked"}'),
+                                     _response(200)])
+    assert helper.login("13800138000", "123456").status_code == 200
+    assert len(sleeps) == 2
+
+    helper, sleeps = _helper(stats, [_response(502), _response(200)])
+    assert helper.post("/auth/send-code", {"phoneNumber": "13800138000"}, idempotent=True).status_code == 200
+
+
+def test_gives_up_after_max_retries_and_budget(stats):
+    """重试次数用完后抛出最后一次的错误；每个测试的预算在多次调用之间共享"""
+    helper, sleeps = _helper(stats, [requests.exceptions.ReadTimeout("slow")] * 4)
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        helper.get_products()
+    assert len(sleeps) == 3
+
+    helper, sleeps = _helper(stats, [_response(503)] * 4, budget=4)
+    assert helper.get_products().status_code == 503
+    assert len(sleeps) == 1  # 本测试已重试3次，预算只剩1次
+    assert stats.end_test() == 4
+
+    helper, sleeps = _helper(stats, [BackendUnavailable("http://localhost:3001", "refused")])
+    with pytest.raises(BackendUnavailable):
+        helper.get_products()
+    assert sleeps == []
+
+
+def test_stats_merge_and_summary():
+    worker = RetryStats()
+    worker.start_test("a")
+    worker.record("GET /products", "http_503", 1.0)
+    worker.start_test("b")
+    worker.record("click #login", "detached", 0.5)
+    worker.record("click #login", "detached", 1.0)
+
+    master = RetryStats()
+    master.merge(worker.to_dict())
+    summary = master.summary()
+    assert summary["total_retries"] == 3 and summary["total_delay_s"] == 2.5
+    assert list(summary["tests"]) == ["b", "a"]
+    assert summary["tests"]["b"]["reasons"] == {"click #login detached": 2}
+
+
+def test_ui_actions_retry_only_when_not_applied():
+    """点击只在元素被重新渲染时重试，超时的调用日志表明没有点到时也重试；填充对其他 Playwright 错误也重试"""
+    click, fill = _ui_retry_reason("click"), _ui_retry_reason("fill")
+    detached = PlaywrightError("Element is not attached to the DOM")
+    other = PlaywrightError("Element is not an <input>")
+    timeout = PlaywrightTimeoutError("Timeout 30000ms exceeded")
+    unstable = PlaywrightTimeoutError(
+        "Timeout 7500ms exceeded.\n=========================== logs ===========================\n"
+        "waiting for locator(\"#login\")\n  locator resolved to <button id=\"login\">登录</button>\n"
+        "attempting click action\n  waiting for element to be visible, enabled and stable\n"
+        "  element is not stable - waiting...\n"
+    )
+    covered = PlaywrightTimeoutError(
+        "Timeout 7500ms exceeded.\n  <div class=\"loading-mask\"></div> intercepts pointer events\n  retrying click action"
+    )
+
+    assert click(None, detached) == "detached"
+    assert click(None, other) is None
+    assert click(None, timeout) is None and fill(None, timeout) is None
+    assert click(None, unstable) == "not_stable"
+    assert click(None, covered) == "intercepted"
+    assert fill(None, other) == "playwright_error"
+    assert click(None, None) is None
+
+
+class _FakeLocator:
+    def __init__(self, click_errors):
+        self.click_errors = list(click_errors)
+        self.click_timeouts = []
+
+    def wait_for(self, state, timeout):
+        pass
+
+    def click(self, timeout):
+        self.click_timeouts.append(timeout)
+        if self.click_errors:
+            raise self.click_errors.pop(0)
+
+
+class _FakePage:
+    def __init__(self, locator):
+        self._locator = locator
+
+    def on(self, event, handler):
+        pass
+
+    def locator(self, selector):
+        return self._locator
+
+
+def test_click_retries_timeout_with_short_attempts(stats):
+    """Playwright 把未点到的情况报告为超时：每次尝试只用 timeout 的一部分，调用日志表明未点到时重试"""
+    locator = _FakeLocator([PlaywrightTimeoutError("Timeout 2500ms exceeded.\n  element is not stable - waiting...")])
+    page = BasePage(_FakePage(locator))
+    sleeps = []
+    page.retry_policy = RetryPolicy(max_retries=3, base_delay=0.1, jitter=0, stats=stats, sleep=sleeps.append)
+
+    page.click_element("#login", timeout=10000)
+    assert locator.click_timeouts == [2500, 2500]
+    assert stats.tests["test_retry_policy.py::case"]["reasons"] == {"click #login not_stable": 1}
+
+    locator.click_errors = [PlaywrightTimeoutError("Timeout 2500ms exceeded.\n  waiting for scheduled navigations to finish")]
+    with pytest.raises(PlaywrightTimeoutError):
+        page.click_element("#login", timeout=10000)
+    assert sleeps == [0.1]
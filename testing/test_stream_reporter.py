@@ -0,0 +1,74 @@
+"""
+流式测试报告测试
+"""
+import json
+
+from utils.stream_reporter import build_html, iter_results
+
+pytest_plugins = ["pytester"]
+
+
+def test_streams_one_line_per_test(pytester):
+    """每个测试一行，失败带详情，最后写入汇总"""
+    pytester.makepyfile("""
+        import pytest
+
+        def test_ok():
+            pass
+
+        def test_fail():
+            assert 1 == 2
+
+        @pytest.mark.skip(reason="跳过")
+        def test_skip():
+            pass
+
+        @pytest.fixture
+        def broken():
+            raise RuntimeError("setup失败")
+
+        def test_error(broken):
+            pass
+    """)
+    path = pytester.path / "results.jsonl"
+    pytester.makeconftest(f"""
+        from utils.stream_reporter import StreamReporter
+
+        def pytest_configure(config):
+            config.pluginmanager.register(StreamReporter({str(path)!r}), "stream_reporter")
+    """)
+    pytester.runpytest()
+
+    records = list(iter_results(str(path)))
+    tests = {record["nodeid"].split("::")[-1]: record for record in records if record["event"] == "test"}
+    assert records[0]["event"] == "session_start"
+    assert records[-1]["event"] == "session_finish"
+    assert {name: record["outcome"] for name, record in tests.items()} == {
+        "test_ok": "passed", "test_fail": "failed", "test_skip": "skipped", "test_error": "error"
+    }
+    assert "assert 1 == 2" in tests["test_fail"]["longrepr"]
+    assert records[-1]["counts"] == {"passed": 1, "failed": 1, "skipped": 1, "error": 1}
+
+
+def test_build_html_from_partial_stream(tmp_path):
+    """运行中断时（残缺行、没有 session_finish）仍能生成部分报告"""
+    path = tmp_path / "results.jsonl"
+    lines = [
+        {"event": "session_start", "time": 0},
+        {"event": "test", "nodeid": "test_a.py::test_one", "outcome": "passed", "duration": 0.5, "worker": "gw0",
+         "retries": 2},
+        {"event": "test", "nodeid": "test_a.py::test_<two>", "outcome": "failed", "duration": 1.0,
+         "worker": "gw1", "longrepr": "AssertionError: <boom>"}
+    ]
+    path.write_text("".join(json.dumps(line) + "\n" for line in lines) + '{"event": "te', encoding="utf-8")
+
+    html_path = tmp_path / "report.html"
+    summary = build_html(str(path), str(html_path))
+    content = html_path.read_text(encoding="utf-8")
+
+    assert summary == {"counts": {"passed": 1, "failed": 1}, "total": 2, "duration": 1.5, "retries": 2,
+                       "finished": False}
+    assert "重试 2 次" in content
+    assert "test_&lt;two&gt;" in content
+    assert "AssertionError: &lt;boom&gt;" in content
+    assert "未完成" in content
@@ -0,0 +1,90 @@
+"""
+测试数据管理器的索引查询
+"""
+import random
+
+from utils.test_data import TestDataManager
+
+
+def _scan_search(manager, keyword):
+    """与索引实现对照的线性扫描"""
+    keyword = keyword.lower()
+    return [product["id"] for product in manager.products
+            if keyword in product["name"].lower() or keyword in product["description"].lower()]
+
+
+def _generated_products(count):
+    rng = random.Random(19)
+    categories = ["电子产品", "服装", "图书"]
+    words = ["手机", "电脑", "Pro", "Max", "经典", "苹果", "舒适", "教材"]
+    return [{
+        "name": f"{rng.choice(words)} {rng.choice(words)} {index}",
+        "price": float(rng.randint(1, 50) * 10),
+        "category": rng.choice(categories),
+        "category_id": 1,
+        "description": "".join(rng.choice(words) for _ in range(3))
+    } for index in range(count)]
+
+
+def test_lookups_by_id_phone_and_category():
+    """按 ID、手机号和分类查询，返回的是副本"""
+    manager = TestDataManager()
+    product = manager.get_product_by_id(3)
+    assert product["name"] == "MacBook Pro 14英寸"
+    product["name"] = "changed"
+    assert manager.get_product_by_id(3)["name"] == "MacBook Pro 14英寸"
+    assert manager.get_product_by_id(99999) is None
+
+    assert manager.get_user_by_phone("13800138003")["nickname"] == "小明"
+    assert manager.get_user_by_phone("13900000000") is None
+    assert [product["id"] for product in manager.get_products_by_category("电子产品")] == [1, 2, 3]
+    assert manager.get_products_by_category("不存在的分类") == []
+
+
+def test_keyword_search_matches_linear_scan():
+    """倒排索引的结果与逐个比较子串一致（含单字、跨词、大小写）"""
+    manager = TestDataManager()
+    manager.add_test_products(_generated_products(500))
+    for keyword in ["手机", "苹", "iphone", "PRO", "Pro M", "机电", "o", "经典舒适", "不存在xyz", "A17 Pro"]:
+        assert [product["id"] for product in manager.search_products_by_keyword(keyword)] == \
+            _scan_search(manager, keyword), keyword
+    assert len(manager.search_products_by_keyword("")) == 505
+
+
+def test_sorted_views_are_stable():
+    """价格相同的商品升序和降序都保持添加顺序"""
+    manager = TestDataManager()
+    manager.add_test_products(_generated_products(300))
+    for field, getter in (("price", manager.get_products_sorted_by_price),
+                          ("name", manager.get_products_sorted_by_name)):
+        for ascending in (True, False):
+            expected = sorted(manager.products, key=lambda product: product[field], reverse=not ascending)
+            assert [product["id"] for product in getter(ascending)] == [product["id"] for product in expected]
+
+
+def test_indexes_follow_add_and_remove():
+    """增删商品和用户后各索引保持一致，删除的 ID 不会被重新分配"""
+    manager = TestDataManager()
+    product_id = manager.add_test_product({"name": "索引测试耳机", "price": 1.0, "category": "电子产品",
+                                           "category_id": 1, "description": "降噪"})
+    assert product_id == 6
+    assert manager.get_products_sorted_by_price()[0]["id"] == 6
+    assert [product["id"] for product in manager.search_products_by_keyword("耳机")] == [6]
+
+    manager.remove_test_product(6)
+    assert manager.get_product_by_id(6) is None
+    assert manager.search_products_by_keyword("耳机") == []
+    assert 6 not in [product["id"] for product in manager.get_products_by_category("电子产品")]
+    assert 6 not in [product["id"] for product in manager.get_products_sorted_by_name()]
+    assert manager.add_test_product({"name": "新商品", "price": 2.0, "category": "图书",
+                                     "category_id": 4, "description": ""}) == 7
+
+    user_id = manager.add_test_user({"phone_number": "13900000001", "nickname": "新用户", "avatar": None})
+    assert user_id == 4
+    assert manager.get_user_by_phone("13900000001")["id"] == 4
+    manager.remove_test_user(user_id)
+    assert manager.get_user_by_phone("13900000001") is None
+
+    manager.reset_data()
+    assert manager.get_product_by_id(7) is None
+    assert manager.add_test_user({"phone_number": "13900000002", "nickname": "重置后", "avatar": None}) == 4
@@ -0,0 +1,116 @@
+"""
+测试影响分析测试
+"""
+from pathlib import Path
+
+from utils.test_impact import ImpactCollector, ImpactIndex, backend_files_for, backend_route_map
+
+pytest_plugins = ["pytester"]
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_backend_route_map_follows_requires():
+    """/api/auth 映射到路由文件及其依赖的DAO"""
+    route_map = backend_route_map(REPO_ROOT)
+    assert "src/backend/routes/auth.js" in route_map["/api/auth"]
+    assert "src/database/userDAO.js" in route_map["/api/auth"]
+    assert "src/database/verificationCodeDAO.js" in route_map["/api/auth"]
+
+    files = backend_files_for(["/api/auth/login", "/api/products"], route_map)
+    assert "src/backend/app.js" in files
+    assert "src/database/userDAO.js" in files
+
+
+def _index():
+    return ImpactIndex({
+        "test_login.py::test_login": {
+            "files": ["testing/test_login.py", "testing/pages/login_page.py"],
+            "endpoints": ["/api/auth/login"],
+            "browser": True
+        },
+        "test_products.py::test_list": {
+            "files": ["testing/test_products.py", "testing/utils/api_helper.py"],
+            "endpoints": ["/api/products"],
+            "browser": False
+        },
+        "test_data.py::test_local": {
+            "files": ["testing/test_data.py", "testing/utils/test_data.py"],
+            "endpoints": [],
+            "browser": False
+        }
+    }, REPO_ROOT)
+
+
+NODEIDS = ["test_login.py::test_login", "test_products.py::test_list", "test_data.py::test_local"]
+
+
+def test_affected_by_changed_files():
+    """按索引中的文件、接口依赖选择测试"""
+    index = _index()
+    assert index.affected(NODEIDS, ["testing/pages/login_page.py"]) == {"test_login.py::test_login"}
+    assert index.affected(NODEIDS, ["src/database/userDAO.js"]) == {"test_login.py::test_login"}
+    assert index.affected(NODEIDS, ["src/frontend/App.jsx"]) == {"test_login.py::test_login"}
+    assert index.affected(NODEIDS, ["README.md"]) == set()
+    # 不属于任何路由的后端文件影响所有访问过接口的测试
+    assert index.affected(NODEIDS, ["src/backend/app.js"]) == {
+        "test_login.py::test_login", "test_products.py::test_list"
+    }
+
+
+def test_global_files_and_new_tests_always_run():
+    """改动全局文件时全部运行，索引中没有的测试总是运行"""
+    index = _index()
+    assert index.affected(NODEIDS, ["testing/conftest.py"]) == set(NODEIDS)
+    assert index.affected(NODEIDS + ["test_new.py::test_new"], []) == {"test_new.py::test_new"}
+
+
+def test_save_and_load(tmp_path):
+    """索引保存时附带后端文件，读取后可合并更新"""
+    path = tmp_path / "impact.json"
+    _index().save(str(path))
+
+    index = ImpactIndex.load(str(path), REPO_ROOT)
+    assert "src/backend/routes/auth.js" in index.tests["test_login.py::test_login"]["backend"]
+    index.update({"test_new.py::test_new": {"files": [], "endpoints": [], "browser": False}})
+    assert len(index.tests) == 4
+    assert ImpactIndex.load(str(tmp_path / "missing.json")) is None
+
+
+def test_collector_records_files_fixtures_and_endpoints(pytester):
+    """跟踪测试调用的模块、会话级fixture的依赖和requests发出的接口请求"""
+    pytester.makepyfile(helper="def add(a, b):\n    return a + b\n")
+    pytester.makepyfile(session_helper="def make():\n    return {'token': 't'}\n")
+    pytester.makeconftest("""
+        import pytest
+        import session_helper
+
+        @pytest.fixture(scope="session")
+        def token():
+            return session_helper.make()
+    """)
+    pytester.makepyfile(test_sample="""
+        import requests
+        import helper
+
+        def test_uses_helper(token):
+            assert helper.add(1, 2) == 3
+
+        def test_requests(token):
+            try:
+                requests.Session().request("GET", "http://127.0.0.1:9/api/products?page=1", timeout=0.5)
+            except requests.RequestException:
+                pass
+    """)
+    collector = ImpactCollector(pytester.path)
+    result = pytester.runpytest_inprocess(plugins=[collector])
+    result.assert_outcomes(passed=2)
+
+    first = collector.tests["test_sample.py::test_uses_helper"]
+    second = collector.tests["test_sample.py::test_requests"]
+    assert "helper.py" in first["files"]
+    assert "session_helper.py" in first["files"]
+    assert "session_helper.py" in second["files"]
+    assert "helper.py" not in second["files"]
+    assert second["endpoints"] == ["/api/products"]
+    assert first["endpoints"] == []
@@ -0,0 +1,56 @@
+"""
+等待耗时分析器测试
+"""
+import json
+
+from utils.wait_profiler import WaitProfiler
+
+
+class TestWaitProfiler:
+    """等待耗时分析器测试"""
+
+    def test_disabled_profiler_records_nothing(self):
+        """未启用时不记录场景"""
+        profiler = WaitProfiler(enabled=False)
+        profiler.start_scenario("场景")
+        profiler.sleep(0.01)
+        assert profiler.end_scenario() is None
+        assert profiler.scenarios == []
+
+    def test_scenario_splits_sleep_and_condition_wait(self):
+        """固定等待和条件等待分开统计，其余为有效操作时间"""
+        profiler = WaitProfiler(enabled=True)
+        profiler.start_scenario("登录")
+        profiler.sleep(0.05)
+        profiler.record("condition_wait", 20)
+        result = profiler.end_scenario()
+
+        assert result["name"] == "登录"
+        assert result["fixed_sleep_count"] == 1
+        assert result["fixed_sleep_ms"] >= 50
+        assert result["condition_wait_count"] == 1
+        assert result["condition_wait_ms"] == 20
+        assert result["productive_ms"] >= 0
+
+    def test_waits_outside_scenario_are_ignored(self):
+        """场景之外的等待不计入统计"""
+        profiler = WaitProfiler(enabled=True)
+        profiler.record("fixed_sleep", 100)
+        profiler.start_scenario("场景")
+        result = profiler.end_scenario()
+        assert result["fixed_sleep_ms"] == 0
+
+    def test_write_report(self, tmp_path):
+        """报告包含汇总和每个场景的明细"""
+        profiler = WaitProfiler(enabled=True)
+        for name in ("场景1", "场景2"):
+            profiler.start_scenario(name)
+            profiler.record("fixed_sleep", 500)
+            profiler.end_scenario()
+
+        path = tmp_path / "wait_profile.json"
+        profiler.write_report(str(path))
+        report = json.loads(path.read_text(encoding="utf-8"))
+
+        assert report["totals"]["fixed_sleep_ms"] == 1000
+        assert [item["name"] for item in report["scenarios"]] == ["场景1", "场景2"]
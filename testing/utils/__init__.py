@@ -1,8 +1,24 @@
 """
 测试工具包
+包级别的名称在第一次访问时才导入对应模块，导入 utils.config 等子模块
+不会连带加载 requests/httpx/sqlite 等依赖
 """
-from .config import Config
-from .database_helper import DatabaseHelper
-from .api_helper import APIHelper
+import importlib
 
-__all__ = ["Config", "DatabaseHelper", "APIHelper"]
\ No newline at end of file
+_EXPORTS = {
+    "Config": ".config",
+    "DatabaseHelper": ".database_helper",
+    "APIHelper": ".api_helper",
+    "AsyncAPIHelper": ".async_api_helper",
+    "DatabaseSnapshot": ".db_snapshot"
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
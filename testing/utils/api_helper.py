@@ -3,64 +3,33 @@ API测试助手类
 """
 import requests
 import json
+import time
 from typing import Dict, Any, Optional
 from .config import Config
+from .circuit_breaker import get_breaker
+from .retry_policy import RetryPolicy, api_retry_reason
+from .api_metrics import (
+    APIMetrics,
+    TimedHTTPAdapter,
+    estimate_headers_size,
+    get_active_metrics,
+    normalize_endpoint,
+    pop_connect_time
+)
 
 
-class APIHelper:
-    """API测试助手"""
+class APIEndpoints:
+    """API接口定义
     
-    def __init__(self, config: Config = None):
-        self.config = config or Config()
-        self.session = requests.Session()
-        self.session.headers.update({
-            'Content-Type': 'application/json',
-            'Accept': 'application/json'
-        })
-    
-    def post(self, endpoint: str, data: Dict[str, Any] = None, headers: Dict[str, str] = None) -> requests.Response:
-        """发送POST请求"""
-        url = self.config.get_api_url(endpoint)
-        request_headers = self.session.headers.copy()
-        if headers:
-            request_headers.update(headers)
-        
-        return self.session.post(
-            url, 
-            json=data, 
-            headers=request_headers,
-            timeout=30
-        )
-    
-    def get(self, endpoint: str, params: Dict[str, Any] = None, headers: Dict[str, str] = None) -> requests.Response:
-        """发送GET请求"""
-        url = self.config.get_api_url(endpoint)
-        request_headers = self.session.headers.copy()
-        if headers:
-            request_headers.update(headers)
-        
-        return self.session.get(
-            url, 
-            params=params, 
-            headers=request_headers,
-            timeout=30
-        )
-    
-    def set_auth_token(self, token: str):
-        """设置认证token"""
-        self.session.headers.update({
-            'Authorization': f'Bearer {token}'
-        })
-    
-    def clear_auth_token(self):
-        """清除认证token"""
-        if 'Authorization' in self.session.headers:
-            del self.session.headers['Authorization']
+    接口方法只负责组装请求参数并调用 self.post/self.get，同步和异步
+    客户端共用同一套方法：同步客户端返回响应对象，异步客户端返回可
+    await 的协程。
+    """
     
     # 认证相关API
     def send_verification_code(self, phone_number: str) -> requests.Response:
         """发送验证码"""
-        return self.post('/auth/send-code', {'phoneNumber': phone_number})
+        return self.post('/auth/send-verification-code', {'phoneNumber': phone_number})
     
     def login(self, phone_number: str, verification_code: str) -> requests.Response:
         """用户登录"""
@@ -82,6 +51,10 @@ class APIHelper:
         headers = {'Authorization': f'Bearer {token}'}
         return self.post('/auth/logout', headers=headers)
     
+    def health_check(self) -> requests.Response:
+        """后端健康检查"""
+        return self.get('/health')
+    
     def get_user_profile(self, token: str) -> requests.Response:
         """获取用户信息"""
         headers = {'Authorization': f'Bearer {token}'}
@@ -168,4 +141,88 @@ class APIHelper:
         try:
             return response.json()
         except json.JSONDecodeError:
-            return {'text': response.text}
\ No newline at end of file
+            return {'text': response.text}
+
+
+class APIHelper(APIEndpoints):
+    """API测试助手"""
+    
+    def __init__(self, config: Config = None, metrics: Optional[APIMetrics] = None,
+                 retry_policy: Optional[RetryPolicy] = None):
+        self.config = config or Config()
+        self.retry_policy = retry_policy or RetryPolicy.from_config(self.config)
+        self.session = requests.Session()
+        self.session.headers.update({
+            'Content-Type': 'application/json',
+            'Accept': 'application/json'
+        })
+        # 指标采集为可选功能：未显式传入时使用全局启用的注册表
+        self.metrics = metrics or get_active_metrics()
+        if self.metrics is not None:
+            adapter = TimedHTTPAdapter()
+            self.session.mount('http://', adapter)
+            self.session.mount('https://', adapter)
+    
+    def _request(self, method: str, endpoint: str, idempotent: Optional[bool] = None, **kwargs) -> requests.Response:
+        """发送请求，临时故障按重试策略重试，后端主机已熔断时直接抛出 BackendUnavailable"""
+        url = self.config.get_api_url(endpoint)
+        request_headers = self.session.headers.copy()
+        if kwargs.get('headers'):
+            request_headers.update(kwargs['headers'])
+        kwargs['headers'] = request_headers
+        
+        def attempt():
+            if not self.config.CIRCUIT_BREAKER:
+                return self._send(method, endpoint, url, **kwargs)
+            return get_breaker(url).call(self._send, method, endpoint, url, **kwargs)
+        
+        return self.retry_policy.run(attempt, api_retry_reason(method, idempotent),
+                                     f"{method} {normalize_endpoint(endpoint)}")
+    
+    def _send(self, method: str, endpoint: str, url: str, **kwargs) -> requests.Response:
+        """发送请求，启用指标采集时记录耗时和收发字节数"""
+        if self.metrics is None:
+            return self.session.request(method, url, timeout=self.config.API_TIMEOUT, **kwargs)
+        
+        pop_connect_time()
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, url, timeout=self.config.API_TIMEOUT, **kwargs)
+        except requests.exceptions.RequestException:
+            self.metrics.record(method, endpoint, None, (time.perf_counter() - start) * 1000,
+                                connect_ms=pop_connect_time())
+            raise
+        wall_ms = (time.perf_counter() - start) * 1000
+        
+        request = response.request
+        body = request.body or b''
+        self.metrics.record(
+            method,
+            endpoint,
+            response.status_code,
+            wall_ms,
+            connect_ms=pop_connect_time(),
+            bytes_sent=len(body) + estimate_headers_size(request.headers),
+            bytes_received=len(response.content) + estimate_headers_size(response.headers)
+        )
+        return response
+    
+    def post(self, endpoint: str, data: Dict[str, Any] = None, headers: Dict[str, str] = None,
+             idempotent: bool = False) -> requests.Response:
+        """发送POST请求，idempotent=True 时服务端临时故障也会重试"""
+        return self._request('POST', endpoint, idempotent=idempotent, json=data, headers=headers)
+    
+    def get(self, endpoint: str, params: Dict[str, Any] = None, headers: Dict[str, str] = None) -> requests.Response:
+        """发送GET请求"""
+        return self._request('GET', endpoint, params=params, headers=headers)
+    
+    def set_auth_token(self, token: str):
+        """设置认证token"""
+        self.session.headers.update({
+            'Authorization': f'Bearer {token}'
+        })
+    
+    def clear_auth_token(self):
+        """清除认证token"""
+        if 'Authorization' in self.session.headers:
+            del self.session.headers['Authorization']
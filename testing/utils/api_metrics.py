@@ -0,0 +1,276 @@
+"""
+API调用指标采集
+按接口记录耗时、建连耗时和收发字节数，延迟使用 HDR 风格的直方图存储
+"""
+import math
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+_NUMERIC_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def normalize_endpoint(endpoint: str) -> str:
+    """将路径中的数字ID归一化，使 /products/1 和 /products/2 归为同一接口"""
+    path = "/" + endpoint.lstrip("/")
+    return _NUMERIC_SEGMENT.sub("/{id}", path)
+
+
+class LatencyHistogram:
+    """HDR 风格的延迟直方图
+
+    按固定有效数字对数值分桶，内存占用与数值范围的数量级成正比，
+    分位数的相对误差不超过 10^-significant_figures 量级，且可以合并。
+    """
+
+    def __init__(self, significant_figures: int = 3):
+        self.significant_figures = significant_figures
+        self.counts: Dict[float, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def _bucket(self, value: float) -> float:
+        if value <= 0:
+            return 0.0
+        magnitude = math.floor(math.log10(value)) - self.significant_figures + 1
+        unit = 10.0 ** magnitude
+        return round(math.ceil(value / unit) * unit, max(-magnitude, 0))
+
+    def record(self, value: float):
+        """记录一个数值"""
+        bucket = self._bucket(value)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, pct: float) -> float:
+        """获取分位数（桶的上界）"""
+        if not self.count:
+            return 0.0
+        target = max(math.ceil(pct / 100 * self.count), 1)
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= target:
+                return min(bucket, self.max)
+        return self.max
+
+    def merge(self, other: "LatencyHistogram"):
+        """合并另一个直方图"""
+        for bucket, count in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.count += other.count
+        self.total += other.total
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+
+    def summary(self) -> Dict[str, Any]:
+        """汇总统计"""
+        return {
+            "count": self.count,
+            "min": round(self.min or 0.0, 3),
+            "mean": round(self.total / self.count, 3) if self.count else 0.0,
+            "p50": round(self.percentile(50), 3),
+            "p90": round(self.percentile(90), 3),
+            "p99": round(self.percentile(99), 3),
+            "max": round(self.max or 0.0, 3)
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """序列化（用于在xdist worker和主进程之间传递）"""
+        return {
+            "significant_figures": self.significant_figures,
+            "counts": [[bucket, count] for bucket, count in self.counts.items()],
+            "count": self.count,
+            "total": self.total,
+            "min": self.min,
+            "max": self.max
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencyHistogram":
+        """反序列化"""
+        histogram = cls(data["significant_figures"])
+        histogram.counts = {bucket: count for bucket, count in data["counts"]}
+        histogram.count = data["count"]
+        histogram.total = data["total"]
+        histogram.min = data["min"]
+        histogram.max = data["max"]
+        return histogram
+
+
+class EndpointMetrics:
+    """单个接口的指标"""
+
+    def __init__(self):
+        self.wall_ms = LatencyHistogram()
+        self.connect_ms = LatencyHistogram()
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.status_codes: Dict[str, int] = {}
+
+    def merge(self, other: "EndpointMetrics"):
+        """合并另一个接口指标"""
+        self.wall_ms.merge(other.wall_ms)
+        self.connect_ms.merge(other.connect_ms)
+        self.bytes_sent += other.bytes_sent
+        self.bytes_received += other.bytes_received
+        for status, count in other.status_codes.items():
+            self.status_codes[status] = self.status_codes.get(status, 0) + count
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "wall_ms": self.wall_ms.to_dict(),
+            "connect_ms": self.connect_ms.to_dict(),
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "status_codes": dict(self.status_codes)
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "EndpointMetrics":
+        metrics = cls()
+        metrics.wall_ms = LatencyHistogram.from_dict(data["wall_ms"])
+        metrics.connect_ms = LatencyHistogram.from_dict(data["connect_ms"])
+        metrics.bytes_sent = data["bytes_sent"]
+        metrics.bytes_received = data["bytes_received"]
+        metrics.status_codes = dict(data["status_codes"])
+        return metrics
+
+
+class APIMetrics:
+    """API调用指标注册表，键为 "METHOD /path" """
+
+    def __init__(self):
+        self.endpoints: Dict[str, EndpointMetrics] = {}
+        self._lock = threading.Lock()
+
+    def record(self, method: str, endpoint: str, status_code: Optional[int], wall_ms: float,
+               connect_ms: float = 0.0, bytes_sent: int = 0, bytes_received: int = 0):
+        """记录一次调用，status_code 为 None 表示请求异常"""
+        key = f"{method.upper()} {normalize_endpoint(endpoint)}"
+        with self._lock:
+            metrics = self.endpoints.setdefault(key, EndpointMetrics())
+            metrics.wall_ms.record(wall_ms)
+            metrics.connect_ms.record(connect_ms)
+            metrics.bytes_sent += bytes_sent
+            metrics.bytes_received += bytes_received
+            status = str(status_code) if status_code is not None else "error"
+            metrics.status_codes[status] = metrics.status_codes.get(status, 0) + 1
+
+    def merge(self, other: "APIMetrics"):
+        """合并另一个注册表"""
+        with self._lock:
+            for key, metrics in other.endpoints.items():
+                self.endpoints.setdefault(key, EndpointMetrics()).merge(metrics)
+
+    def reset(self):
+        """清空指标"""
+        with self._lock:
+            self.endpoints = {}
+
+    def summary(self) -> Dict[str, Any]:
+        """各接口的汇总统计"""
+        with self._lock:
+            return {
+                key: {
+                    "wall_ms": metrics.wall_ms.summary(),
+                    "connect_ms": metrics.connect_ms.summary(),
+                    "bytes_sent": metrics.bytes_sent,
+                    "bytes_received": metrics.bytes_received,
+                    "status_codes": dict(metrics.status_codes)
+                }
+                for key, metrics in sorted(self.endpoints.items())
+            }
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {key: metrics.to_dict() for key, metrics in self.endpoints.items()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "APIMetrics":
+        registry = cls()
+        registry.endpoints = {key: EndpointMetrics.from_dict(value) for key, value in data.items()}
+        return registry
+
+
+# 当前启用的指标注册表，为 None 时不采集
+_active_metrics: Optional[APIMetrics] = None
+
+
+def enable_metrics(metrics: Optional[APIMetrics] = None) -> APIMetrics:
+    """启用全局指标采集，之后创建的 APIHelper 都会记录指标"""
+    global _active_metrics
+    _active_metrics = metrics or APIMetrics()
+    return _active_metrics
+
+
+def disable_metrics():
+    """停用全局指标采集"""
+    global _active_metrics
+    _active_metrics = None
+
+
+def get_active_metrics() -> Optional[APIMetrics]:
+    """获取当前启用的指标注册表"""
+    return _active_metrics
+
+
+# 建连耗时：由连接对象写入当前线程，请求结束后由 APIHelper 读取
+_connect_timing = threading.local()
+
+
+def pop_connect_time() -> float:
+    """取出当前线程最近一次请求的建连耗时（毫秒），复用连接时为0"""
+    value = getattr(_connect_timing, "ms", 0.0)
+    _connect_timing.ms = 0.0
+    return value
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        _connect_timing.ms = (time.perf_counter() - start) * 1000
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        _connect_timing.ms = (time.perf_counter() - start) * 1000
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """记录建连耗时的 requests 适配器"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool
+        }
+
+
+def estimate_headers_size(headers) -> int:
+    """估算HTTP头部字节数"""
+    return sum(len(str(key)) + len(str(value)) + 4 for key, value in headers.items())
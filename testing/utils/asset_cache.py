@@ -0,0 +1,209 @@
+"""
+静态资源缓存
+通过 Playwright 的 route 拦截前端静态资源（JS、CSS、图片、字体、页面），
+在同一会话内所有浏览器上下文之间共享，并按 URL+ETag 落盘；只有 /api
+请求直接访问网络
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from .config import Config
+
+
+# 转发缓存内容时需要去掉的响应头（body 已解码，长度由 Playwright 重新计算）
+_DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+
+def _sha1(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class _CachedAsset:
+    """一条缓存的静态资源"""
+
+    def __init__(self, url: str, status: int, headers: Dict[str, str], body: bytes):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    @property
+    def etag(self) -> str:
+        return self.headers.get("etag", "")
+
+
+class AssetCache:
+    """跨浏览器上下文共享的静态资源缓存
+
+    内存命中的资源直接返回，不访问网络；磁盘上的资源（上次会话留下的）
+    在本会话第一次使用时携带 If-None-Match 重新校验，304 时直接使用磁盘
+    内容，之后放入内存。
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, api_prefix: str = "/api"):
+        self.cache_dir = cache_dir
+        self.api_prefix = api_prefix
+        self._memory: Dict[str, _CachedAsset] = {}
+        self._lock = threading.Lock()
+        self.stats = {
+            "requests": 0,
+            "memory_hits": 0,
+            "revalidated": 0,
+            "network_fetches": 0,
+            "passthrough": 0,
+            "bytes_saved": 0,
+            "bytes_fetched": 0
+        }
+        self.navigations: List[Dict[str, Any]] = []
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def install(self, context):
+        """在浏览器上下文上注册拦截（对其中所有页面生效），API请求不拦截"""
+        context.route(self._should_intercept, self._handle)
+
+    def _should_intercept(self, url: str) -> bool:
+        return url.startswith("http") and not self.is_api_request(url)
+
+    def is_api_request(self, url: str) -> bool:
+        """是否为需要访问网络的API请求"""
+        path = urlsplit(url).path
+        return path == self.api_prefix or path.startswith(f"{self.api_prefix}/")
+
+    def _handle(self, route):
+        request = route.request
+        url = request.url
+        if request.method != "GET":
+            self.stats["passthrough"] += 1
+            route.continue_()
+            return
+
+        self.stats["requests"] += 1
+        with self._lock:
+            asset = self._memory.get(url)
+        if asset is not None:
+            self.stats["memory_hits"] += 1
+            self.stats["bytes_saved"] += len(asset.body)
+            self._fulfill(route, asset)
+            return
+
+        stored = self._load_from_disk(url)
+        headers = dict(request.headers)
+        if stored is not None and stored.etag:
+            headers["if-none-match"] = stored.etag
+        response = route.fetch(headers=headers)
+
+        if response.status == 304 and stored is not None:
+            self.stats["revalidated"] += 1
+            self.stats["bytes_saved"] += len(stored.body)
+            asset = stored
+        else:
+            body = response.body()
+            self.stats["network_fetches"] += 1
+            self.stats["bytes_fetched"] += len(body)
+            asset = _CachedAsset(url, response.status, dict(response.headers), body)
+            if response.status != 200:
+                self._fulfill(route, asset)
+                return
+            self._save_to_disk(asset)
+
+        with self._lock:
+            self._memory[url] = asset
+        self._fulfill(route, asset)
+
+    def _fulfill(self, route, asset: _CachedAsset):
+        headers = {key: value for key, value in asset.headers.items() if key.lower() not in _DROP_HEADERS}
+        route.fulfill(status=asset.status, headers=headers, body=asset.body)
+
+    def _meta_path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, f"{_sha1(url)}.json")
+
+    def _body_path(self, url: str, etag: str) -> str:
+        return os.path.join(self.cache_dir, f"{_sha1(url + etag)}.body")
+
+    def _load_from_disk(self, url: str) -> Optional[_CachedAsset]:
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._meta_path(url), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(self._body_path(url, meta["headers"].get("etag", "")), "rb") as f:
+                body = f.read()
+        except (OSError, ValueError, KeyError):
+            return None
+        return _CachedAsset(url, meta["status"], meta["headers"], body)
+
+    def _save_to_disk(self, asset: _CachedAsset):
+        if not self.cache_dir:
+            return
+        previous = self._load_from_disk(asset.url)
+        with open(self._body_path(asset.url, asset.etag), "wb") as f:
+            f.write(asset.body)
+        with open(self._meta_path(asset.url), "w", encoding="utf-8") as f:
+            json.dump({"url": asset.url, "status": asset.status, "headers": asset.headers}, f)
+        if previous is not None and previous.etag != asset.etag:
+            try:
+                os.remove(self._body_path(asset.url, previous.etag))
+            except OSError:
+                pass
+
+    def goto(self, page, url: str, **kwargs):
+        """导航并记录加载耗时，以及本次导航是否有资源需要从网络下载"""
+        fetches_before = self.stats["network_fetches"]
+        start = time.perf_counter()
+        response = page.goto(url, **kwargs)
+        self.navigations.append({
+            "url": url,
+            "load_ms": round((time.perf_counter() - start) * 1000, 2),
+            "network_fetches": self.stats["network_fetches"] - fetches_before
+        })
+        return response
+
+    def summary(self) -> Dict[str, Any]:
+        """缓存统计：节省的字节数，以及未命中/命中缓存时的平均导航耗时"""
+        uncached = [item["load_ms"] for item in self.navigations if item["network_fetches"]]
+        cached = [item["load_ms"] for item in self.navigations if not item["network_fetches"]]
+        return {
+            **self.stats,
+            "cached_assets": len(self._memory),
+            "navigations": {
+                "uncached_count": len(uncached),
+                "uncached_avg_load_ms": round(sum(uncached) / len(uncached), 2) if uncached else 0.0,
+                "cached_count": len(cached),
+                "cached_avg_load_ms": round(sum(cached) / len(cached), 2) if cached else 0.0
+            }
+        }
+
+    def write_report(self, path: str = "reports/asset_cache.json"):
+        """写入JSON报告"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({**self.summary(), "navigation_details": self.navigations}, f, ensure_ascii=False, indent=2)
+
+
+_active_cache: Optional[AssetCache] = None
+
+
+def enable_asset_cache(cache: Optional[AssetCache] = None) -> AssetCache:
+    """启用全局静态资源缓存，BasePage.navigate_to 会记录导航耗时"""
+    global _active_cache
+    _active_cache = cache or AssetCache(Config().ASSET_CACHE_DIR)
+    return _active_cache
+
+
+def disable_asset_cache():
+    """停用全局静态资源缓存"""
+    global _active_cache
+    _active_cache = None
+
+
+def get_active_asset_cache() -> Optional[AssetCache]:
+    """获取当前启用的静态资源缓存"""
+    return _active_cache
@@ -0,0 +1,72 @@
+"""
+异步API测试助手类
+"""
+from typing import Dict, Any, Optional
+
+import httpx
+
+from .api_helper import APIEndpoints
+from .config import Config
+
+
+class AsyncAPIHelper(APIEndpoints):
+    """基于 httpx.AsyncClient 的异步API测试助手
+
+    接口方法与 APIHelper 一致，调用时需要 await。连接池开启 HTTP keep-alive，
+    超过 max_connections 的并发请求会排队等待空闲连接，因此可以在单个进程
+    中并发发起成千上万个请求。
+
+    用法::
+
+        async with AsyncAPIHelper(max_connections=200) as api:
+            responses = await asyncio.gather(*[api.get_products() for _ in range(1000)])
+    """
+
+    def __init__(self, config: Config = None, max_connections: int = 100,
+                 max_keepalive_connections: int = 20, keepalive_expiry: float = 5.0,
+                 timeout: Optional[float] = None, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.config = config or Config()
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.client = httpx.AsyncClient(
+            headers={
+                'Content-Type': 'application/json',
+                'Accept': 'application/json'
+            },
+            # 排队等待连接不计入超时，只限制连接建立和读写
+            timeout=httpx.Timeout(timeout or self.config.API_TIMEOUT, pool=None),
+            limits=self.limits,
+            transport=transport
+        )
+
+    async def __aenter__(self) -> "AsyncAPIHelper":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
+    async def aclose(self):
+        """关闭连接池"""
+        await self.client.aclose()
+
+    async def post(self, endpoint: str, data: Dict[str, Any] = None, headers: Dict[str, str] = None) -> httpx.Response:
+        """发送POST请求"""
+        url = self.config.get_api_url(endpoint)
+        return await self.client.post(url, json=data, headers=headers)
+
+    async def get(self, endpoint: str, params: Dict[str, Any] = None, headers: Dict[str, str] = None) -> httpx.Response:
+        """发送GET请求"""
+        url = self.config.get_api_url(endpoint)
+        return await self.client.get(url, params=params, headers=headers)
+
+    def set_auth_token(self, token: str):
+        """设置认证token"""
+        self.client.headers['Authorization'] = f'Bearer {token}'
+
+    def clear_auth_token(self):
+        """清除认证token"""
+        if 'Authorization' in self.client.headers:
+            del self.client.headers['Authorization']
@@ -0,0 +1,167 @@
+"""
+登录状态缓存
+每个测试手机号只通过API登录一次，把Playwright storage_state写入磁盘，
+新的浏览器上下文直接注入该状态，跳过短信登录的UI流程
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+from .api_helper import APIHelper
+from .config import Config
+from .database_helper import DatabaseHelper
+
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "src", "backend"))
+
+# 后端签发的JWT有效期为24小时，提前一小时视为过期
+TOKEN_MAX_AGE_SECONDS = 23 * 3600
+
+
+def backend_build_id(backend_dir: str = BACKEND_DIR) -> str:
+    """根据后端源码计算构建标识，后端代码变化后缓存自动失效
+
+    可通过配置项 BACKEND_BUILD_ID 直接指定（如CI中的提交号）。
+    """
+    build_id = Config().BACKEND_BUILD_ID
+    if build_id:
+        return build_id
+
+    digest = hashlib.sha1()
+    for root, dirs, files in os.walk(backend_dir):
+        dirs[:] = sorted(d for d in dirs if d != "node_modules")
+        for name in sorted(files):
+            if not (name.endswith(".js") or name == "package.json"):
+                continue
+            path = os.path.join(root, name)
+            digest.update(os.path.relpath(path, backend_dir).encode("utf-8"))
+            with open(path, "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+class AuthStateCache:
+    """按 手机号 + 后端构建 + 服务地址 缓存登录后的 storage_state 文件"""
+
+    def __init__(self, cache_dir: str = ".auth_cache", config: Config = None,
+                 api_helper: APIHelper = None, db_helper: DatabaseHelper = None,
+                 build_id: str = None):
+        self.cache_dir = cache_dir
+        self.config = config or Config()
+        self.api_helper = api_helper or APIHelper(self.config)
+        self.db_helper = db_helper
+        self.build_id = build_id or backend_build_id()
+        self.hits = 0
+        self.logins = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @property
+    def target_id(self) -> str:
+        """前端 origin 和 API 地址的摘要
+
+        storage_state 只对写入时的 origin 生效，并行隔离时前端在随机端口运行，
+        地址变化后不能复用旧的缓存文件。
+        """
+        target = f"{self._origin()}|{self.config.API_BASE_URL}"
+        return hashlib.sha1(target.encode("utf-8")).hexdigest()[:8]
+
+    def state_path(self, phone_number: str) -> str:
+        """缓存文件路径"""
+        return os.path.join(self.cache_dir, f"{phone_number}_{self.build_id}_{self.target_id}.json")
+
+    def get_storage_state(self, phone_number: str = None) -> str:
+        """返回可直接传给 browser.new_context(storage_state=...) 的文件路径"""
+        phone_number = phone_number or self.config.TEST_PHONE_REGISTERED
+        path = self.state_path(phone_number)
+        with self._lock:
+            if self._is_fresh(path):
+                self.hits += 1
+                return path
+            state = self._login(phone_number)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(state, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+            self.logins += 1
+            return path
+
+    def load(self, phone_number: str = None) -> Dict[str, Any]:
+        """读取 storage_state 内容"""
+        with open(self.get_storage_state(phone_number), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def apply_to_context(self, browser_context, phone_number: str = None):
+        """向已创建的浏览器上下文注入登录状态（页面加载前写入localStorage）
+        
+        初始化脚本无法移除，上下文池不会复用注入过登录状态的上下文。
+        """
+        state = self.load(phone_number)
+        items = [item for origin in state["origins"] for item in origin["localStorage"]]
+        browser_context.add_init_script(
+            f"{json.dumps(items, ensure_ascii=False)}"
+            ".forEach(item => localStorage.setItem(item.name, item.value));"
+        )
+
+    def invalidate(self, phone_number: str = None):
+        """删除缓存，phone_number 为空时清空当前构建和服务地址的全部缓存"""
+        suffix = f"_{self.build_id}_{self.target_id}.json"
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(suffix) and (phone_number is None or name.startswith(f"{phone_number}_")):
+                os.remove(os.path.join(self.cache_dir, name))
+
+    def _is_fresh(self, path: str) -> bool:
+        try:
+            return time.time() - os.path.getmtime(path) < TOKEN_MAX_AGE_SECONDS
+        except OSError:
+            return False
+
+    def _login(self, phone_number: str) -> Dict[str, Any]:
+        """通过API登录并构造 storage_state"""
+        db_helper = self.db_helper or DatabaseHelper()
+        code = self.config.TEST_VERIFICATION_CODE
+        db_helper.create_user_if_not_exists(phone_number)
+        db_helper.create_verification_code(phone_number, code)
+
+        response = self.api_helper.login(phone_number, code)
+        data = self.api_helper.get_response_data(response)
+        if response.status_code != 200 or "token" not in data:
+            raise RuntimeError(f"API登录失败 - 手机号: {phone_number}, 状态码: {response.status_code}, 响应: {data}")
+
+        return self.build_storage_state(data["token"], data.get("user", {}))
+
+    def build_storage_state(self, token: str, user: Dict[str, Any]) -> Dict[str, Any]:
+        """与前端登录成功后写入的localStorage保持一致"""
+        return {
+            "cookies": [],
+            "origins": [{
+                "origin": self._origin(),
+                "localStorage": [
+                    {"name": "token", "value": token},
+                    {"name": "user", "value": json.dumps(user, ensure_ascii=False)}
+                ]
+            }]
+        }
+
+    def _origin(self) -> str:
+        parts = urlsplit(self.config.BASE_URL)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def get_stats(self) -> Dict[str, int]:
+        """缓存命中和实际登录次数"""
+        return {"hits": self.hits, "logins": self.logins}
+
+
+_default_cache: Optional[AuthStateCache] = None
+
+
+def get_auth_state_cache() -> AuthStateCache:
+    """进程内共享的登录状态缓存（首次使用时创建）"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = AuthStateCache(Config().AUTH_CACHE_DIR)
+    return _default_cache
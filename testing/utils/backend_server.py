@@ -0,0 +1,400 @@
+"""
+后端/前端服务进程管理
+以子进程方式启动 src/backend/app.js（以及可选的 Vite 开发服务器），按指数退避
+轮询就绪接口并记录启动耗时。指定 state_dir 时服务在测试结束后继续运行，进程
+信息写入状态文件，下一次 pytest 运行直接复用健康的实例，冷启动只发生一次
+"""
+import abc
+import argparse
+import glob
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import requests
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+
+# 就绪轮询的初始间隔和最大间隔（秒）
+READY_INITIAL_DELAY = 0.05
+READY_MAX_DELAY = 1.0
+
+
+def find_free_port() -> int:
+    """由系统分配一个当前空闲的端口"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def port_available(port: int) -> bool:
+    """端口当前是否可以绑定"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        try:
+            sock.bind(("127.0.0.1", port))
+        except OSError:
+            return False
+        return True
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        # 本进程启动的子进程退出后在回收前仍可被 kill(pid, 0) 探测到
+        if os.waitpid(pid, os.WNOHANG)[0] == pid:
+            return False
+    except (ChildProcessError, AttributeError):
+        pass
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _terminate_pid(pid: int, timeout: float = 5):
+    """停止进程（及其进程组），超时后强制结束"""
+    kill = getattr(os, "killpg", None)
+    try:
+        if kill is not None and os.getpgid(pid) == pid:
+            kill(pid, signal.SIGTERM)
+        else:
+            os.kill(pid, signal.SIGTERM)
+    except (ProcessLookupError, PermissionError):
+        return
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if not _pid_alive(pid):
+            return
+        time.sleep(0.05)
+    try:
+        os.kill(pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+class ManagedServer(abc.ABC):
+    """由测试管理的服务子进程
+
+    不指定 state_dir 时进程归当前会话所有，stop() 时结束；指定 state_dir 时
+    进程在独立的进程组中运行，stop() 不结束它，下次 start() 在状态文件记录的
+    进程仍然存活、就绪且配置（fingerprint）一致时直接复用。多个 xdist worker
+    同时启动时通过文件锁保证只启动一个实例。
+    """
+
+    name = "server"
+
+    def __init__(self, port: Optional[int] = None, state_dir: Optional[str] = None):
+        self.port = port
+        self.requested_port = port
+        self.state_dir = state_dir
+        self.process: Optional[subprocess.Popen] = None
+        self.pid: Optional[int] = None
+        self.reused = False
+        self.startup_seconds: Optional[float] = None
+        self.ready_attempts = 0
+
+    @property
+    def base_url(self) -> str:
+        """服务根地址"""
+        return f"http://localhost:{self.port}"
+
+    @property
+    def health_url(self) -> str:
+        """就绪检查地址"""
+        return self.base_url
+
+    @abc.abstractmethod
+    def command(self) -> List[str]:
+        """启动服务的命令行"""
+
+    def cwd(self) -> str:
+        return REPO_DIR
+
+    def environment(self) -> Dict[str, str]:
+        return os.environ.copy()
+
+    def fingerprint(self) -> Dict[str, Any]:
+        """决定已运行的实例能否复用的配置"""
+        return {"command": self.command()[:1]}
+
+    @property
+    def state_path(self) -> Optional[str]:
+        return os.path.join(self.state_dir, f"{self.name}.json") if self.state_dir else None
+
+    @property
+    def log_path(self) -> Optional[str]:
+        return os.path.join(self.state_dir, f"{self.name}.log") if self.state_dir else None
+
+    def start(self, timeout: float = 30):
+        """启动服务并等待就绪（有可复用的实例时直接复用）"""
+        if not self.state_dir:
+            self._launch(timeout)
+            return
+        os.makedirs(self.state_dir, exist_ok=True)
+        with open(os.path.join(self.state_dir, f"{self.name}.lock"), "w") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                if not self._reuse():
+                    self._launch(timeout)
+                    self._write_state()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _reuse(self) -> bool:
+        state = self.read_state()
+        if not state:
+            return False
+        alive = _pid_alive(state["pid"])
+        port_ok = self.requested_port in (None, state["port"])
+        if alive and port_ok and state.get("fingerprint") == self._fingerprint_json():
+            self.port = state["port"]
+            if self.is_ready():
+                self.pid = state["pid"]
+                self.reused = True
+                self.startup_seconds = state.get("startup_seconds")
+                return True
+        if alive:
+            # 配置已变化或不再健康的旧实例
+            _terminate_pid(state["pid"])
+        os.remove(self.state_path)
+        return False
+
+    def _launch(self, timeout: float):
+        self.port = self.requested_port or find_free_port()
+        self.reused = False
+        started = time.monotonic()
+        if self.state_dir:
+            # 独立进程组：测试进程退出后继续运行，停止时连同 npx/node 子进程一起结束
+            log = open(self.log_path, "ab")
+            try:
+                self.process = subprocess.Popen(self.command(), cwd=self.cwd(), env=self.environment(),
+                                                stdout=log, stderr=subprocess.STDOUT, start_new_session=True)
+            finally:
+                log.close()
+        else:
+            self.process = subprocess.Popen(self.command(), cwd=self.cwd(), env=self.environment(),
+                                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        self.pid = self.process.pid
+        self.wait_until_ready(timeout)
+        self.startup_seconds = round(time.monotonic() - started, 3)
+
+    def is_ready(self) -> bool:
+        """检查就绪接口是否可用"""
+        try:
+            response = requests.get(self.health_url, timeout=1)
+            return response.status_code == 200
+        except requests.exceptions.RequestException:
+            return False
+
+    def wait_until_ready(self, timeout: float = 30):
+        """按指数退避轮询就绪接口直到服务就绪"""
+        deadline = time.monotonic() + timeout
+        delay = READY_INITIAL_DELAY
+        self.ready_attempts = 0
+        while True:
+            if self.process and self.process.poll() is not None:
+                log_hint = f"，日志: {self.log_path}" if self.log_path else ""
+                raise RuntimeError(f"{self.name}服务启动失败，退出码: {self.process.returncode}{log_hint}")
+            self.ready_attempts += 1
+            if self.is_ready():
+                return
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, READY_MAX_DELAY)
+        self.stop(force=True)
+        raise TimeoutError(f"{self.name}服务在{timeout}秒内未就绪: {self.base_url}")
+
+    def stop(self, force: bool = False):
+        """停止服务；可复用的实例只有 force=True 时才停止"""
+        if self.state_dir and not force:
+            return
+        if self.process and self.process.poll() is None:
+            if self.state_dir:
+                _terminate_pid(self.process.pid)
+            else:
+                self.process.terminate()
+                try:
+                    self.process.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    self.process.kill()
+        elif self.reused and self.pid:
+            _terminate_pid(self.pid)
+        if self.process:
+            self.process.wait()
+        if self.state_path and os.path.exists(self.state_path):
+            os.remove(self.state_path)
+        self.process = None
+        self.pid = None
+
+    def read_state(self) -> Optional[Dict[str, Any]]:
+        if not self.state_path:
+            return None
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _fingerprint_json(self) -> Any:
+        # 与状态文件中反序列化的结果比较
+        return json.loads(json.dumps(self.fingerprint()))
+
+    def _write_state(self):
+        state = {"pid": self.pid, "port": self.port, "fingerprint": self.fingerprint(),
+                 "startup_seconds": self.startup_seconds, "started_at": time.time()}
+        temp = f"{self.state_path}.{os.getpid()}.tmp"
+        with open(temp, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+        os.replace(temp, self.state_path)
+
+    def summary(self) -> str:
+        if self.reused:
+            return f"{self.name} {self.base_url} (复用已运行的实例)"
+        return f"{self.name} {self.base_url} (启动耗时 {self.startup_seconds}s, 就绪检查 {self.ready_attempts} 次)"
+
+
+class BackendServer(ManagedServer):
+    """以子进程方式启动 src/backend/app.js"""
+
+    name = "backend"
+
+    def __init__(self, port: Optional[int] = None, db_path: Optional[str] = None,
+                 backend_dir: Optional[str] = None, state_dir: Optional[str] = None):
+        super().__init__(port, state_dir)
+        self.db_path = db_path
+        self.backend_dir = backend_dir or os.path.join(REPO_DIR, "src", "backend")
+
+    @property
+    def api_base_url(self) -> str:
+        """API根地址"""
+        return f"{self.base_url}/api"
+
+    @property
+    def health_url(self) -> str:
+        return f"{self.api_base_url}/health"
+
+    def command(self) -> List[str]:
+        return ["node", "app.js"]
+
+    def cwd(self) -> str:
+        return self.backend_dir
+
+    def environment(self) -> Dict[str, str]:
+        env = os.environ.copy()
+        env["PORT"] = str(self.port)
+        env["NODE_ENV"] = "test"
+        if self.db_path:
+            env["TAOBEI_DB_PATH"] = os.path.abspath(self.db_path)
+        return env
+
+    def fingerprint(self) -> Dict[str, Any]:
+        # 后端代码或数据库变化后不再复用
+        from .auth_state import backend_build_id
+        return {"build": backend_build_id(self.backend_dir),
+                "db_path": os.path.abspath(self.db_path) if self.db_path else None}
+
+
+class FrontendServer(ManagedServer):
+    """以子进程方式启动 Vite 开发服务器，/api 代理到 api_target"""
+
+    name = "frontend"
+
+    def __init__(self, api_target: str, port: Optional[int] = None, repo_dir: Optional[str] = None,
+                 state_dir: Optional[str] = None):
+        super().__init__(port, state_dir)
+        self.api_target = api_target
+        self.repo_dir = repo_dir or REPO_DIR
+
+    def command(self) -> List[str]:
+        vite = os.path.join(self.repo_dir, "node_modules", ".bin", "vite")
+        return [vite, "--port", str(self.port), "--strictPort"]
+
+    def cwd(self) -> str:
+        return self.repo_dir
+
+    def environment(self) -> Dict[str, str]:
+        env = os.environ.copy()
+        env["VITE_API_TARGET"] = self.api_target
+        return env
+
+    def fingerprint(self) -> Dict[str, Any]:
+        return {"api_target": self.api_target}
+
+
+def start_servers(frontend: bool = False, reuse: bool = True, state_dir: str = ".servers",
+                  db_path: Optional[str] = None, timeout: float = 60) -> Dict[str, ManagedServer]:
+    """启动（或复用）后端，以及可选的前端开发服务器"""
+    state_dir = state_dir if reuse else None
+    servers: Dict[str, ManagedServer] = {}
+    backend = BackendServer(db_path=db_path, state_dir=state_dir)
+    backend.start(timeout)
+    servers["backend"] = backend
+    if frontend:
+        server = FrontendServer(backend.base_url, state_dir=state_dir)
+        try:
+            server.start(timeout)
+        except Exception:
+            # 可复用的后端不会随 stop() 结束，半启动的服务要强制停止并删除状态文件
+            backend.stop(force=True)
+            raise
+        servers["frontend"] = server
+    return servers
+
+
+def stop_recorded_servers(state_dir: str = ".servers") -> List[str]:
+    """停止状态文件中记录的可复用服务（含 xdist worker 在 state_dir/<worker> 下的服务），
+    返回已停止的服务名"""
+    stopped = []
+    worker_dirs = sorted(glob.glob(os.path.join(state_dir, "gw*")))
+    for directory in [state_dir] + worker_dirs:
+        prefix = "" if directory == state_dir else f"{os.path.basename(directory)}/"
+        for server in (FrontendServer("", state_dir=directory), BackendServer(state_dir=directory)):
+            state = server.read_state()
+            if state is None:
+                continue
+            if _pid_alive(state["pid"]):
+                _terminate_pid(state["pid"])
+                stopped.append(prefix + server.name)
+            os.remove(server.state_path)
+    return stopped
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="管理测试用的后端/前端服务")
+    parser.add_argument("action", choices=["start", "stop", "status"])
+    parser.add_argument("--frontend", action="store_true", help="同时启动 Vite 开发服务器")
+    parser.add_argument("--state-dir", default=".servers", help="状态文件目录 (默认: .servers)")
+    args = parser.parse_args(argv)
+
+    if args.action == "start":
+        for server in start_servers(args.frontend, state_dir=args.state_dir).values():
+            print(f"🚀 {server.summary()}")
+    elif args.action == "stop":
+        stopped = stop_recorded_servers(args.state_dir)
+        print(f"🛑 已停止: {', '.join(stopped) if stopped else '无运行中的服务'}")
+    else:
+        for server in (BackendServer(state_dir=args.state_dir), FrontendServer("", state_dir=args.state_dir)):
+            state = server.read_state()
+            running = state is not None and _pid_alive(state["pid"])
+            print(f"{server.name}: {'运行中 端口 ' + str(state['port']) if running else '未运行'}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+"""
+统一的BDD执行引擎
+behave 和 pytest 共用同一套 .feature 解析和 features/steps/*.py 中的步骤定义：
+每个 .feature 文件只解析一次，解析结果按文件 mtime 缓存在内存和磁盘上；
+pytest 下由 FeatureFile 直接收集场景，步骤与其他测试共用同一个浏览器进程
+"""
+import hashlib
+import importlib
+import os
+import pickle
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import behave
+import pytest
+from behave import parser as behave_parser
+from behave.step_registry import registry as step_registry
+
+from .config import Config
+
+
+STEPS_PACKAGE = "features.steps"
+
+
+class StepDefinitionNotFound(Exception):
+    """场景中的步骤没有对应的步骤定义"""
+
+
+class FeatureCache:
+    """.feature 解析结果缓存
+
+    以 (mtime_ns, 文件大小) 作为失效依据：内存命中直接返回；磁盘缓存（上次
+    运行或其他 xdist worker 写入）命中时反序列化，比重新解析快；都未命中时
+    用 behave 的解析器解析并写入缓存。
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = cache_dir
+        self._memory: Dict[str, Any] = {}
+        self._original_parse_file = None
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "parsed": 0, "parse_ms": 0.0}
+
+    def parse(self, filename, language: str = None):
+        """返回解析后的 behave Feature"""
+        path = os.path.abspath(str(filename))
+        stat = os.stat(path)
+        key = [stat.st_mtime_ns, stat.st_size]
+
+        entry = self._memory.get(path)
+        if entry is not None and entry[0] == key:
+            self.stats["memory_hits"] += 1
+            return entry[1]
+
+        feature = self._load_from_disk(path, key)
+        if feature is not None:
+            self.stats["disk_hits"] += 1
+        else:
+            start = time.perf_counter()
+            parse_file = self._original_parse_file or behave_parser.parse_file
+            feature = parse_file(path, language=language)
+            self.stats["parse_ms"] += (time.perf_counter() - start) * 1000
+            self.stats["parsed"] += 1
+            self._save_to_disk(path, key, feature)
+        self._memory[path] = (key, feature)
+        return feature
+
+    def install_into_behave(self):
+        """让 behave 的运行器也通过缓存解析 .feature（在 environment.py 加载时调用）"""
+        if self._original_parse_file is None:
+            self._original_parse_file = behave_parser.parse_file
+            behave_parser.parse_file = self.parse
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "parse_ms": round(self.stats["parse_ms"], 2)}
+
+    def _cache_path(self, path: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha1(path.encode("utf-8")).hexdigest() + ".pickle")
+
+    def _load_from_disk(self, path: str, key):
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._cache_path(path), "rb") as f:
+                data = pickle.load(f)
+        except (OSError, pickle.PickleError, EOFError, AttributeError, ImportError):
+            return None
+        if data.get("key") != key or data.get("behave") != behave.__version__:
+            return None
+        return data["feature"]
+
+    def _save_to_disk(self, path: str, key, feature):
+        if not self.cache_dir:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        target = self._cache_path(path)
+        temp = f"{target}.{os.getpid()}.tmp"
+        try:
+            with open(temp, "wb") as f:
+                pickle.dump({"key": key, "behave": behave.__version__, "feature": feature}, f)
+            os.replace(temp, target)  # 多个 worker 同时写入时保证文件完整
+        except (OSError, pickle.PickleError):
+            pass
+
+
+feature_cache = FeatureCache(Config().BDD_CACHE_DIR)
+
+
+def load_step_definitions(steps_dir: Optional[str] = None):
+    """导入 features/steps 下的全部步骤模块（已导入的模块不会重复注册）"""
+    steps_dir = Path(steps_dir or Path(__file__).resolve().parent.parent / "features" / "steps")
+    for path in sorted(steps_dir.glob("*.py")):
+        if path.stem != "__init__":
+            importlib.import_module(f"{STEPS_PACKAGE}.{path.stem}")
+
+
+class StepContext:
+    """步骤函数收到的 context，对应 behave 的 Context
+
+    resources 中的属性在第一次访问时才创建（如浏览器页面），纯API场景
+    不会打开浏览器。
+    """
+
+    def __init__(self, resources: Dict[str, Callable[[], Any]] = None):
+        self._resources = resources or {}
+        self.table = None
+        self.text = None
+
+    def __getattr__(self, name):
+        factory = self.__dict__.get("_resources", {}).get(name)
+        if factory is None:
+            raise AttributeError(name)
+        value = factory()
+        setattr(self, name, value)
+        return value
+
+
+def step_location(step) -> str:
+    """步骤及其在 .feature 文件中的位置"""
+    return f"{step.keyword} {step.name} ({step.filename}:{step.line})"
+
+
+def undefined_steps(scenario) -> List[Any]:
+    """场景（含 Background）中没有步骤定义的步骤"""
+    return [step for step in scenario.all_steps if step_registry.find_match(step) is None]
+
+
+def run_scenario(scenario, context):
+    """依次执行场景（含 Background）的步骤
+
+    有未定义的步骤时不执行任何步骤，直接失败（与 behave 一样算作失败）；
+    步骤抛出异常时 context.failed_step 记录失败的步骤。
+    """
+    context.feature = scenario.feature
+    context.scenario = scenario
+    context.failed_step = None
+    undefined = undefined_steps(scenario)
+    if undefined:
+        raise StepDefinitionNotFound("未找到步骤定义: " + "; ".join(step_location(step) for step in undefined))
+    for step in scenario.all_steps:
+        match = step_registry.find_match(step)
+
+        args, kwargs = [], {}
+        for argument in match.arguments:
+            if argument.name is not None:
+                kwargs[argument.name] = argument.value
+            else:
+                args.append(argument.value)
+        context.table = step.table
+        context.text = step.text
+        try:
+            match.func(context, *args, **kwargs)
+        except Exception:
+            context.failed_step = step
+            raise
+
+
+class FeatureFile(pytest.File):
+    """pytest 前端：把 .feature 中的每个场景收集为一个测试
+
+    场景函数只请求 bdd_context fixture，浏览器、数据库等资源由它按需提供。
+    含有未定义步骤的场景运行时直接失败，失败信息列出这些步骤的位置；
+    步骤失败时测试报告中附加失败步骤的位置。
+    """
+
+    def collect(self):
+        load_step_definitions()
+        feature = feature_cache.parse(self.path)
+        seen = set()
+        for scenario in feature.walk_scenarios():
+            name = scenario.name.strip()
+            if name in seen:
+                name = f"{name}[line {scenario.line}]"
+            seen.add(name)
+            item = pytest.Function.from_parent(self, name=name, callobj=_make_runner(scenario))
+            for tag in scenario.effective_tags:
+                item.add_marker(tag)
+            yield item
+
+
+def _make_runner(scenario):
+    def run_bdd_scenario(bdd_context, request):
+        try:
+            run_scenario(scenario, bdd_context)
+        except Exception:
+            # 报告附加段落在所有 Python 版本中都可用（不依赖 3.11 的 add_note）
+            step = getattr(bdd_context, "failed_step", None)
+            if step is not None:
+                request.node.add_report_section("call", "BDD步骤", f"失败步骤: {step_location(step)}")
+            raise
+    return run_bdd_scenario
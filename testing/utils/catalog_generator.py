@@ -0,0 +1,201 @@
+"""
+合成商品/用户数据生成器
+按种子确定性地生成任意数量（10^3 ~ 10^6）的商品和用户，逐条产出并分批写入
+taobei.db 或 JSON/JSONL 文件，内存占用与总数量无关；同一种子生成 n 条的结果
+是生成 m (> n) 条结果的前缀
+"""
+import argparse
+import itertools
+import json
+import math
+import os
+import random
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from faker import Faker
+
+from .test_data import TestDataManager
+
+
+DEFAULT_SEED = 20240101
+
+# 合成用户使用 199 号段，不会与各 worker 的 138 测试号段冲突
+USER_PHONE_PREFIX = "199"
+
+# 每个事务写入的行数
+DEFAULT_BATCH_SIZE = 5000
+
+CATEGORY_NOUNS = {
+    "电子产品": ["手机", "笔记本电脑", "平板电脑", "耳机", "智能手表", "显示器", "音箱", "相机"],
+    "服装": ["T恤", "衬衫", "牛仔裤", "外套", "连衣裙", "卫衣", "羽绒服", "运动裤"],
+    "家居用品": ["台灯", "收纳盒", "床品四件套", "沙发垫", "餐具套装", "置物架", "保温杯", "地毯"],
+    "图书": ["编程指南", "小说", "教材", "工具书", "历史读物", "绘本", "散文集", "词典"],
+    "运动户外": ["跑步鞋", "瑜伽垫", "登山包", "帐篷", "羽毛球拍", "篮球", "骑行头盔", "泳镜"],
+    "美妆护肤": ["面霜", "口红", "精华液", "防晒霜", "洗面奶", "面膜", "香水", "眼霜"],
+    "食品饮料": ["坚果礼盒", "咖啡豆", "绿茶", "牛肉干", "矿泉水", "巧克力", "饼干", "果汁"],
+    "母婴用品": ["奶粉", "纸尿裤", "婴儿推车", "奶瓶", "积木玩具", "儿童餐椅", "湿巾", "安抚奶嘴"]
+}
+
+_CREATED_FROM = datetime(2023, 1, 1)
+_CREATED_SPAN_SECONDS = 2 * 365 * 24 * 3600
+
+
+class CatalogGenerator:
+    """确定性的合成数据生成器
+
+    品牌、词汇和昵称词库由按种子初始化的 Faker 一次性生成，每条记录只用
+    random.Random 从词库中组合，生成百万条数据也不会逐条调用 Faker。
+    商品和用户各用一个独立的随机数序列，互不影响。
+    """
+
+    def __init__(self, seed: int = DEFAULT_SEED, locale: str = "zh_CN"):
+        self.seed = seed
+        fake = Faker(locale)
+        fake.seed_instance(seed)
+        self.brands = sorted({fake.company_prefix() for _ in range(60)})
+        self.words = sorted({fake.word() for _ in range(400)})
+        self.names = sorted({fake.name() for _ in range(500)})
+        self.categories = [category for category in TestDataManager().get_categories()
+                           if category["name"] in CATEGORY_NOUNS]
+
+    def iter_products(self, count: int, start_id: int = 1) -> Iterator[Dict[str, Any]]:
+        """逐条生成商品，字段与 TestDataManager 中的商品一致"""
+        rng = random.Random(f"{self.seed}:products")
+        for product_id in range(start_id, start_id + count):
+            category = rng.choice(self.categories)
+            noun = rng.choice(CATEGORY_NOUNS[category["name"]])
+            brand = rng.choice(self.brands)
+            # 价格在 9.9 ~ 20000 之间按对数均匀分布
+            price = round(math.exp(rng.uniform(math.log(9.9), math.log(20000))), 2)
+            yield {
+                "id": product_id,
+                "name": f"{brand} {rng.choice(self.words)}{noun} {rng.randint(1, 999)}",
+                "price": price,
+                "category": category["name"],
+                "category_id": category["id"],
+                "description": "".join(rng.sample(self.words, 4)) + noun,
+                "image": f"https://example.com/products/{product_id}.jpg",
+                "stock": rng.randint(0, 1000),
+                "rating": round(rng.uniform(3.0, 5.0), 1),
+                "reviews_count": rng.randint(0, 5000),
+                "specifications": {"brand": brand, "model": f"{brand[:1]}{rng.randint(100, 999)}"},
+                "created_at": _created_at(rng)
+            }
+
+    def iter_users(self, count: int, start_id: int = 1) -> Iterator[Dict[str, Any]]:
+        """逐条生成用户，手机号按序号递增，最多 10^8 个不重复"""
+        rng = random.Random(f"{self.seed}:users")
+        for user_id in range(start_id, start_id + count):
+            created_at = _created_at(rng)
+            yield {
+                "id": user_id,
+                "phone_number": f"{USER_PHONE_PREFIX}{user_id:08d}",
+                "nickname": rng.choice(self.names),
+                "avatar": f"https://example.com/avatars/{user_id}.jpg",
+                "created_at": created_at,
+                "updated_at": created_at
+            }
+
+    def write_database(self, db_helper, products: int = 0, users: int = 0,
+                       batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, int]:
+        """分批写入数据库，每批一个事务；已存在的手机号被忽略，返回写入的行数"""
+        product_query = """
+        INSERT INTO products (name, description, price, stock, category, image_url, created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """
+        user_query = """
+        INSERT OR IGNORE INTO users (phone_number, nickname, avatar, created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?)
+        """
+        written = {"products": 0, "users": 0}
+        for chunk in _chunks(self.iter_products(products), batch_size):
+            rows = [(p["name"], p["description"], p["price"], p["stock"], p["category"], p["image"],
+                     _sql_datetime(p["created_at"]), _sql_datetime(p["created_at"])) for p in chunk]
+            written["products"] += db_helper.execute_batch([(product_query, rows)])
+        for chunk in _chunks(self.iter_users(users), batch_size):
+            rows = [(u["phone_number"], u["nickname"], u["avatar"],
+                     _sql_datetime(u["created_at"]), _sql_datetime(u["updated_at"])) for u in chunk]
+            written["users"] += db_helper.execute_batch([(user_query, rows)])
+        return written
+
+    def write_json(self, path: str, kind: str, count: int) -> int:
+        """把商品或用户写入 JSON 数组（.jsonl 后缀时每行一条），返回写入数量"""
+        records = self.iter_products(count) if kind == "products" else self.iter_users(count)
+        return write_records(path, records)
+
+
+def write_records(path: str, records: Iterable[Dict[str, Any]]) -> int:
+    """逐条写入 JSON 数组或 JSONL 文件，先写临时文件再替换，返回写入数量"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    jsonl = path.endswith(".jsonl")
+    temp = f"{path}.{os.getpid()}.tmp"
+    written = 0
+    with open(temp, "w", encoding="utf-8") as f:
+        if not jsonl:
+            f.write("[")
+        for record in records:
+            line = json.dumps(record, ensure_ascii=False)
+            if jsonl:
+                f.write(line + "\n")
+            else:
+                f.write(("," if written else "") + "\n  " + line)
+            written += 1
+        if not jsonl:
+            f.write("\n]\n")
+    os.replace(temp, path)
+    return written
+
+
+def _chunks(iterable: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _created_at(rng: random.Random) -> str:
+    moment = _CREATED_FROM + timedelta(seconds=rng.randrange(_CREATED_SPAN_SECONDS))
+    return moment.isoformat() + "Z"
+
+
+def _sql_datetime(value: str) -> str:
+    """ISO 时间转为 SQLite datetime('now') 的格式"""
+    return value.rstrip("Z").replace("T", " ")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="生成合成商品/用户数据")
+    parser.add_argument("--products", type=int, default=1000, help="商品数量")
+    parser.add_argument("--users", type=int, default=0, help="用户数量")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="随机种子")
+    parser.add_argument("--db", help="写入的数据库文件，如 ../src/database/taobei.db")
+    parser.add_argument("--json-dir", help="写入 products/users JSON 文件的目录")
+    parser.add_argument("--jsonl", action="store_true", help="JSON 文件使用 JSONL 格式")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="每个事务写入的行数")
+    args = parser.parse_args(argv)
+    if not args.db and not args.json_dir:
+        parser.error("至少指定 --db 或 --json-dir")
+
+    generator = CatalogGenerator(args.seed)
+    if args.db:
+        from .database_helper import DatabaseHelper
+        helper = DatabaseHelper(args.db)
+        written = generator.write_database(helper, args.products, args.users, args.batch_size)
+        helper.close()
+        print(f"🗄️ 已写入数据库 {args.db}: {written}")
+    if args.json_dir:
+        suffix = ".jsonl" if args.jsonl else ".json"
+        for kind, count in (("products", args.products), ("users", args.users)):
+            if count:
+                path = os.path.join(args.json_dir, f"{kind}{suffix}")
+                generator.write_json(path, kind, count)
+                print(f"📄 已写入 {path}: {count} 条")
+
+
+if __name__ == "__main__":
+    main()
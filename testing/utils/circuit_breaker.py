@@ -0,0 +1,173 @@
+"""
+后端熔断器
+按主机统计连续的连接失败：达到阈值后熔断，后续请求立即失败而不再等待超时；
+熔断一段时间后放行一次探测请求（半开），探测成功则恢复，失败则继续熔断。
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+from .config import Config
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# 视为后端不可达的异常：连接失败和超时。HTTP 错误状态码说明服务可达，不计入
+CONNECTION_ERRORS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+
+
+class BackendUnavailable(requests.exceptions.ConnectionError):
+    """熔断期间的请求被直接拒绝
+
+    继承 ConnectionError，原有捕获连接错误的测试代码无需修改。
+    """
+
+    def __init__(self, host: str, reason: str):
+        self.host = host
+        self.reason = reason
+        super().__init__(f"后端 {host} 不可用（已熔断）: {reason}")
+
+
+class CircuitBreaker:
+    """单个主机的熔断器（线程安全）"""
+
+    def __init__(self, host: str, threshold: int = 3, reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.host = host
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.rejected = 0
+        self.trips = 0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        """请求前检查：熔断中直接抛出 BackendUnavailable，到期后只放行一个探测请求"""
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            if self.state == OPEN and self.clock() - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+            self.rejected += 1
+            raise BackendUnavailable(self.host, self.last_error)
+
+    def record_success(self):
+        """请求得到响应（不论状态码）：恢复闭合"""
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self.opened_at = None
+            self._probing = False
+
+    def record_failure(self, error: BaseException):
+        """连接失败：连续失败达到阈值或探测失败时熔断"""
+        with self._lock:
+            self.failures += 1
+            self.last_error = f"{type(error).__name__}: {error}"
+            if self.state == HALF_OPEN or self.failures >= self.threshold:
+                if self.state != OPEN:
+                    self.trips += 1
+                self.state = OPEN
+                self.opened_at = self.clock()
+            self._probing = False
+
+    def trip(self, reason: str):
+        """已确认主机不可达（如运行前预检连接失败）时直接熔断，到期后照常放行探测请求"""
+        with self._lock:
+            self.last_error = reason
+            if self.state != OPEN:
+                self.trips += 1
+            self.state = OPEN
+            self.failures = max(self.failures, self.threshold)
+            self.opened_at = self.clock()
+            self._probing = False
+
+    def call(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """通过熔断器调用 func，连接失败和超时计入失败次数"""
+        self.before_call()
+        try:
+            result = func(*args, **kwargs)
+        except CONNECTION_ERRORS as e:
+            self.record_failure(e)
+            raise
+        except BaseException:
+            # 其他异常与后端是否可达无关，释放探测名额
+            with self._lock:
+                self._probing = False
+            raise
+        self.record_success()
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "host": self.host,
+            "state": self.state,
+            "failures": self.failures,
+            "trips": self.trips,
+            "rejected": self.rejected,
+            "last_error": self.last_error
+        }
+
+
+def host_of(url: str) -> str:
+    """熔断器按 scheme://host:port 区分"""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+# 进程内共享的熔断器，同一主机的所有 APIHelper 和测试共用
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(url: str, threshold: Optional[int] = None,
+                reset_timeout: Optional[float] = None) -> CircuitBreaker:
+    """获取 url 所在主机的熔断器，首次创建时使用 Config 中的阈值和探测间隔"""
+    host = host_of(url)
+    with _breakers_lock:
+        breaker = _breakers.get(host)
+        if breaker is None:
+            if threshold is None or reset_timeout is None:
+                config = Config()
+                threshold = config.CIRCUIT_BREAKER_THRESHOLD if threshold is None else threshold
+                reset_timeout = config.CIRCUIT_BREAKER_RESET if reset_timeout is None else reset_timeout
+            breaker = _breakers[host] = CircuitBreaker(host, threshold, reset_timeout)
+        return breaker
+
+
+def guarded_request(method: str, url: str, **kwargs) -> requests.Response:
+    """经过熔断器的 requests.request，供直接使用 requests 的测试调用"""
+    if not Config().CIRCUIT_BREAKER:
+        return requests.request(method, url, **kwargs)
+    return get_breaker(url).call(requests.request, method, url, **kwargs)
+
+
+def skip_rejected(item, call, report):
+    """将被熔断拒绝的测试报告改为跳过，跳过原因即熔断原因（在 pytest_runtest_makereport 中调用）"""
+    if call.excinfo is not None and call.excinfo.errisinstance(BackendUnavailable):
+        report.outcome = "skipped"
+        report.longrepr = (str(item.path), item.location[1] or 0, f"Skipped: {call.excinfo.value}")
+
+
+def reset_breakers():
+    """清空所有熔断器"""
+    with _breakers_lock:
+        _breakers.clear()
+
+
+def breaker_states() -> Dict[str, Dict[str, Any]]:
+    """各主机熔断器的当前状态"""
+    with _breakers_lock:
+        return {host: breaker.to_dict() for host, breaker in _breakers.items()}
@@ -1,29 +1,140 @@
 """
 测试配置管理
+配置项按 环境变量 > testing/.env > profiles.yaml 中 TEST_PROFILE 选择的 profile
+（在 default 的基础上覆盖）> 代码默认值 的顺序取值，所有模块都通过 Config 读取
 """
 import os
-from typing import Optional
+from functools import lru_cache
+from typing import Any, Dict, Optional, List
+
+
+TESTING_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+PROFILES_FILE = os.path.join(TESTING_DIR, "profiles.yaml")
+ENV_FILE = os.path.join(TESTING_DIR, ".env")
+DEFAULT_PROFILE = "default"
+
+
+def get_worker_id() -> str:
+    """获取当前xdist worker标识，非并行运行时为master"""
+    return os.getenv("PYTEST_XDIST_WORKER", "master")
+
+
+def get_worker_index(worker_id: Optional[str] = None) -> int:
+    """获取当前xdist worker序号（gw0为0，非并行运行时为0）"""
+    worker_id = worker_id or get_worker_id()
+    if worker_id.startswith("gw") and worker_id[2:].isdigit():
+        return int(worker_id[2:])
+    return 0
+
+
+def _mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+@lru_cache(maxsize=None)
+def _read_profiles(path: str, mtime: Optional[int]) -> Dict[str, Dict[str, Any]]:
+    # mtime 参与缓存键，文件修改后重新读取
+    if mtime is None:
+        return {}
+    import yaml
+    with open(path, encoding="utf-8") as f:
+        return yaml.safe_load(f) or {}
+
+
+@lru_cache(maxsize=None)
+def _read_env_file(path: str, mtime: Optional[int]) -> Dict[str, str]:
+    if mtime is None:
+        return {}
+    from dotenv import dotenv_values
+    return {key: value for key, value in dotenv_values(path).items() if value is not None}
+
+
+def _to_setting(value: Any) -> str:
+    """YAML 中的布尔值和数字转为与环境变量相同的字符串形式"""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def load_profile(name: Optional[str] = None, profiles_file: str = PROFILES_FILE,
+                 env_file: str = ENV_FILE) -> Dict[str, str]:
+    """合并 profile 和 .env 中的配置项（不含环境变量），TEST_PROFILE 为选中的 profile 名"""
+    env_values = _read_env_file(env_file, _mtime(env_file))
+    name = name or os.getenv("TEST_PROFILE") or env_values.get("TEST_PROFILE") or DEFAULT_PROFILE
+    profiles = _read_profiles(profiles_file, _mtime(profiles_file))
+    if name != DEFAULT_PROFILE and name not in profiles:
+        raise ValueError(f"未知的测试profile: {name}，可选: {', '.join(sorted(profiles)) or DEFAULT_PROFILE}")
+
+    values = {**(profiles.get(DEFAULT_PROFILE) or {}), **(profiles.get(name) or {}), **env_values}
+    settings = {key: _to_setting(value) for key, value in values.items() if value is not None}
+    settings["TEST_PROFILE"] = name
+    return settings
 
 
 class Config:
     """测试配置类"""
     
-    def __init__(self):
+    def __init__(self, profile: Optional[str] = None):
+        self._settings = load_profile(profile)
+        self.PROFILE = self._settings["TEST_PROFILE"]
+        
+        # 并行隔离配置（pytest-xdist 每个 worker 独立的端口、数据库和手机号段）
+        self.WORKER_ID = get_worker_id()
+        self.WORKER_INDEX = get_worker_index(self.WORKER_ID)
+        self.WORKER_ISOLATION = self.get_bool("WORKER_ISOLATION", False)
+        self.API_PORT_BASE = int(self.get("API_PORT_BASE", "3100"))
+        self.PHONE_BLOCK_SIZE = 1000
+        self.PHONE_RANGE_START = 13800138000 + self.WORKER_INDEX * self.PHONE_BLOCK_SIZE
+        
         # 基础配置
-        self.BASE_URL = os.getenv("BASE_URL", "http://localhost:5173")
-        self.API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:3000/api")
+        self.BASE_URL = self.get("BASE_URL", "http://localhost:5173")
+        if self.WORKER_ISOLATION and "API_BASE_URL" not in os.environ:
+            self.API_BASE_URL = f"http://localhost:{self.worker_api_port}/api"
+        else:
+            self.API_BASE_URL = self.get("API_BASE_URL", "http://localhost:3001/api")
         
         # 浏览器配置
-        self.HEADLESS = os.getenv("HEADLESS", "false").lower() == "true"
-        self.SLOW_MO = int(os.getenv("SLOW_MO", "0"))
-        self.TIMEOUT = int(os.getenv("TIMEOUT", "30000"))
+        self.HEADLESS = self.get_bool("HEADLESS", False)
+        self.SLOW_MO = int(self.get("SLOW_MO", "0"))
+        self.TIMEOUT = int(self.get("TIMEOUT", "30000"))
+        self.CONTEXT_POOL_SIZE = int(self.get("CONTEXT_POOL_SIZE", "2"))  # 每个worker保留的预热上下文数
+        self.ASSET_CACHE = self.get_bool("ASSET_CACHE", True)  # 拦截并缓存前端静态资源
+        self.API_MOCK = self.get_bool("API_MOCK", False)  # 页面接口由进程内模拟后端响应
+        self.API_TIMEOUT = float(self.get("API_TIMEOUT", "30"))  # APIHelper 单次请求超时（秒）
+        
+        # 后端熔断：同一主机连续连接失败达到阈值后，后续请求立即失败，每隔 CIRCUIT_BREAKER_RESET 秒放行一次探测
+        self.CIRCUIT_BREAKER = self.get_bool("CIRCUIT_BREAKER", True)
+        self.CIRCUIT_BREAKER_THRESHOLD = int(self.get("CIRCUIT_BREAKER_THRESHOLD", "3"))
+        self.CIRCUIT_BREAKER_RESET = float(self.get("CIRCUIT_BREAKER_RESET", "30"))
+        self.CIRCUIT_BREAKER_ACTION = self.get("CIRCUIT_BREAKER_ACTION", "skip").lower()  # 被熔断拒绝的测试：skip 或 fail
+        
+        # 运行前预检：off 不检查，warn 只提示，strict 有服务不可用时终止运行
+        self.PREFLIGHT = self.get("PREFLIGHT", "warn").lower()
+        self.PREFLIGHT_BUDGET = float(self.get("PREFLIGHT_BUDGET", "1.0"))  # 全部检查的总耗时上限（秒）
+        
+        # 分析与缓存
+        self.API_METRICS = self.get_bool("API_METRICS", False)
+        self.WAIT_PROFILE = self.get_bool("WAIT_PROFILE", False)
+        self.AUTH_CACHE_DIR = self.get("AUTH_CACHE_DIR", ".auth_cache")
+        self.ASSET_CACHE_DIR = self.get("ASSET_CACHE_DIR", ".asset_cache")
+        self.BDD_CACHE_DIR = self.get("BDD_CACHE_DIR", ".bdd_cache")
+        self.BACKEND_BUILD_ID = self.get("BACKEND_BUILD_ID", "")  # 为空时根据后端源码计算
         
-        # 数据库配置
-        self.DB_PATH = os.getenv("DB_PATH", "../src/database/taobei.db")
+        # 自动管理的服务进程：启动（或复用已运行的）后端和 Vite 开发服务器
+        self.START_BACKEND = self.get_bool("START_BACKEND", False)
+        self.START_FRONTEND = self.get_bool("START_FRONTEND", False)
+        self.SERVER_REUSE = self.get_bool("SERVER_REUSE", True)  # 测试结束后保持运行供下次复用
+        self.SERVER_STATE_DIR = self.get("SERVER_STATE_DIR", ".servers")
+        
+        # 数据库配置（测试会话中由 worker_db_path fixture 指向当前worker的数据库副本）
+        self.DB_PATH = self.get("DB_PATH", os.path.normpath(os.path.join(TESTING_DIR, "..", "src", "database", "taobei.db")))
         
         # 测试数据配置
-        self.TEST_PHONE_REGISTERED = "13800138001"
-        self.TEST_PHONE_UNREGISTERED = "13800138002"
+        self.TEST_PHONE_REGISTERED = self.get_test_phone(1)
+        self.TEST_PHONE_UNREGISTERED = self.get_test_phone(2)
         self.TEST_VERIFICATION_CODE = "123456"
         self.INVALID_PHONE = "123"
         self.INVALID_VERIFICATION_CODE = "000000"
@@ -33,9 +144,38 @@ class Config:
         self.MEDIUM_WAIT = 5000  # 5秒
         self.LONG_WAIT = 10000  # 10秒
         
-        # 重试配置
-        self.MAX_RETRIES = 3
-        self.RETRY_DELAY = 1000  # 1秒
+        # 重试配置：指数退避加随机抖动，MAX_RETRIES=0 时不重试
+        self.MAX_RETRIES = int(self.get("MAX_RETRIES", "3"))
+        self.RETRY_DELAY = int(self.get("RETRY_DELAY", "1000"))  # 首次重试前的等待（毫秒），之后每次翻倍
+        self.RETRY_MAX_DELAY = int(self.get("RETRY_MAX_DELAY", "8000"))  # 单次等待上限（毫秒）
+        self.RETRY_JITTER = float(self.get("RETRY_JITTER", "0.5"))  # 等待时间随机缩短的最大比例
+        self.RETRY_BUDGET = int(self.get("RETRY_BUDGET", "5"))  # 每个测试最多重试的总次数
+    
+    def get(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        """读取配置项：环境变量优先，其次 .env 和 profile"""
+        value = os.environ.get(name)
+        if value is None:
+            value = self._settings.get(name, default)
+        return value
+    
+    def get_bool(self, name: str, default: bool = False) -> bool:
+        """读取布尔配置项（true/false）"""
+        return self.get(name, "true" if default else "false").lower() == "true"
+    
+    @property
+    def worker_api_port(self) -> int:
+        """当前worker首选的后端端口（被占用时 worker_environment 改用空闲端口）"""
+        return self.API_PORT_BASE + self.WORKER_INDEX
+    
+    def get_test_phone(self, offset: int) -> str:
+        """获取当前worker手机号段内的测试手机号"""
+        if not 0 <= offset < self.PHONE_BLOCK_SIZE:
+            raise ValueError(f"手机号偏移量必须在0-{self.PHONE_BLOCK_SIZE - 1}之间: {offset}")
+        return str(self.PHONE_RANGE_START + offset)
+    
+    def get_test_phones(self, count: int, start: int = 1) -> List[str]:
+        """获取当前worker手机号段内连续的多个测试手机号"""
+        return [self.get_test_phone(start + i) for i in range(count)]
     
     @property
     def login_url(self) -> str:
@@ -0,0 +1,216 @@
+"""
+浏览器上下文池
+预先创建并加载好SPA外壳的浏览器上下文，测试之间只重置状态（cookie、
+localStorage、路由拦截）而不重建，缩短每个测试的启动时间
+"""
+import json
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:  # 只用于类型注解，导入本模块不加载 Playwright
+    from playwright.sync_api import Browser, BrowserContext, Page
+
+
+DEFAULT_CONTEXT_OPTIONS = {
+    "viewport": {"width": 1280, "height": 720},
+    "locale": "zh-CN"
+}
+
+
+class _PooledContext:
+    """池中的一个上下文及其预热页面
+
+    池会记录通过 route 注册的路由拦截（用于在不支持 unroute_all 的版本上逐个移除），
+    以及是否调用过 add_init_script：初始化脚本无法移除，这样的上下文不能放回池中。
+    """
+
+    def __init__(self, context: "BrowserContext", page: "Page", storage_state: Optional[str]):
+        self.context = context
+        self.page = page
+        self.storage_state = storage_state
+        self.routes: List[Tuple[Any, Any]] = []
+        self.has_init_scripts = False
+
+
+def _track(entry: _PooledContext):
+    """包装上下文和页面的 route / add_init_script，记录测试对它们做的修改"""
+    for target in (entry.context, entry.page):
+        route = getattr(target, "route", None)
+        if route is not None:
+            def recording_route(url, handler, *args, _target=target, _route=route, **kwargs):
+                entry.routes.append((_target, url))
+                return _route(url, handler, *args, **kwargs)
+            target.route = recording_route
+        add_init_script = getattr(target, "add_init_script", None)
+        if add_init_script is not None:
+            def marking_add_init_script(*args, _add=add_init_script, **kwargs):
+                entry.has_init_scripts = True
+                return _add(*args, **kwargs)
+            target.add_init_script = marking_add_init_script
+
+
+def _unroute_all(target, entry: _PooledContext):
+    """移除上下文或页面上注册的全部路由拦截
+
+    Playwright 1.41 起提供 unroute_all；更早的版本按记录的 url 逐个移除。
+    """
+    if hasattr(target, "unroute_all"):
+        target.unroute_all()
+    else:
+        for url in {url for owner, url in entry.routes if owner is target}:
+            target.unroute(url)
+    entry.routes = [(owner, url) for owner, url in entry.routes if owner is not target]
+
+
+class BrowserContextPool:
+    """浏览器上下文池
+
+    acquire 优先取出空闲的预热上下文（命中），没有空闲上下文时新建并预热
+    （未命中）；release 重置上下文后放回池中，超出容量、注入过初始化脚本
+    或重置失败时关闭。
+    使用 storage_state 的上下文按状态文件分组，重置后重新写入登录状态。
+    传入 asset_cache 时每个上下文都通过它加载静态资源；传入 api_mock 时
+    接口请求由进程内模拟后端响应。
+    """
+
+    def __init__(self, browser: "Browser", base_url: str, size: int = 2,
+                 context_options: Dict[str, Any] = None, navigation_timeout: int = 30000,
+                 asset_cache=None, api_mock=None):
+        self.browser = browser
+        self.asset_cache = asset_cache
+        self.api_mock = api_mock
+        self.base_url = base_url
+        self.size = size
+        self.context_options = dict(context_options or DEFAULT_CONTEXT_OPTIONS)
+        self.navigation_timeout = navigation_timeout
+        self._idle: Dict[Optional[str], List[_PooledContext]] = {}
+        self._in_use: Dict[int, _PooledContext] = {}
+        self.hits = 0
+        self.misses = 0
+        self.resets = 0
+        self.discarded = 0
+        self.acquire_ms: List[float] = []
+
+    def warm_up(self, count: int = None, storage_state: str = None):
+        """预先创建 count 个预热上下文（默认填满容量）"""
+        idle = self._idle.setdefault(storage_state, [])
+        while len(idle) < (self.size if count is None else count):
+            idle.append(self._create(storage_state))
+
+    def acquire(self, storage_state: str = None) -> Tuple["BrowserContext", "Page"]:
+        """取出一个已加载SPA外壳的上下文和页面"""
+        start = time.perf_counter()
+        idle = self._idle.get(storage_state)
+        if idle:
+            entry = idle.pop()
+            self.hits += 1
+        else:
+            entry = self._create(storage_state)
+            self.misses += 1
+        self._in_use[id(entry.page)] = entry
+        self.acquire_ms.append((time.perf_counter() - start) * 1000)
+        return entry.context, entry.page
+
+    def release(self, page: "Page"):
+        """重置上下文并放回池中"""
+        entry = self._in_use.pop(id(page), None)
+        if entry is None:
+            return
+        idle = self._idle.setdefault(entry.storage_state, [])
+        # 注入过初始化脚本（如 AuthStateCache.apply_to_context 写入的登录状态）的上下文无法重置
+        if len(idle) >= self.size or entry.has_init_scripts:
+            self._discard(entry)
+            return
+        try:
+            self._reset(entry)
+        except Exception as e:
+            print(f"重置浏览器上下文失败，关闭该上下文: {e}")
+            self._discard(entry)
+            return
+        idle.append(entry)
+
+    def close(self):
+        """关闭池中所有上下文"""
+        for entries in self._idle.values():
+            for entry in entries:
+                entry.context.close()
+        for entry in self._in_use.values():
+            entry.context.close()
+        self._idle.clear()
+        self._in_use.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """命中/未命中统计"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "resets": self.resets,
+            "discarded": self.discarded,
+            "idle": sum(len(entries) for entries in self._idle.values()),
+            "avg_acquire_ms": round(sum(self.acquire_ms) / len(self.acquire_ms), 2) if self.acquire_ms else 0.0
+        }
+
+    def _create(self, storage_state: Optional[str]) -> _PooledContext:
+        options = dict(self.context_options)
+        if storage_state:
+            options["storage_state"] = storage_state
+        context = self.browser.new_context(**options)
+        entry = _PooledContext(context, context.new_page(), storage_state)
+        _track(entry)
+        self._install_routes(context)
+        self._goto(entry.page)
+        return entry
+
+    def _install_routes(self, context: "BrowserContext"):
+        for interceptor in (self.asset_cache, self.api_mock):
+            if interceptor is not None:
+                interceptor.install(context)
+
+    def _goto(self, page: "Page"):
+        if self.asset_cache is not None:
+            self.asset_cache.goto(page, self.base_url, timeout=self.navigation_timeout)
+        else:
+            page.goto(self.base_url, timeout=self.navigation_timeout)
+
+    def _reset(self, entry: _PooledContext):
+        """清理测试留下的状态，并重新加载SPA外壳"""
+        context, page = entry.context, entry.page
+        for extra_page in context.pages:
+            if extra_page is not page:
+                extra_page.close()
+        _unroute_all(context, entry)
+        _unroute_all(page, entry)
+        self._install_routes(context)
+        context.clear_cookies()
+        context.clear_permissions()
+
+        if not page.url.startswith(self.base_url):
+            self._goto(page)
+        page.evaluate("() => { localStorage.clear(); sessionStorage.clear(); }")
+        if entry.storage_state:
+            self._restore_storage_state(entry)
+        # 重新加载以丢弃SPA内存中的状态（静态资源走浏览器缓存）
+        if page.url.rstrip("/") == self.base_url.rstrip("/"):
+            page.reload(timeout=self.navigation_timeout)
+        else:
+            self._goto(page)
+        self.resets += 1
+
+    def _restore_storage_state(self, entry: _PooledContext):
+        with open(entry.storage_state, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        if state.get("cookies"):
+            entry.context.add_cookies(state["cookies"])
+        items = [item for origin in state.get("origins", []) for item in origin["localStorage"]]
+        entry.page.evaluate(
+            "items => items.forEach(item => localStorage.setItem(item.name, item.value))", items
+        )
+
+    def _discard(self, entry: _PooledContext):
+        self.discarded += 1
+        try:
+            entry.context.close()
+        except Exception:
+            pass
@@ -0,0 +1,176 @@
+"""
+测试数据文件注册表
+test_data/ 下的数据文件在每个进程中只解析一次，之后所有调用方共享同一份
+只读数据（修改时报错，需要修改时用 thaw() 复制）；JSONL 文件通过 mmap 按行
+读取，数 MB 的压测数据集只在访问某条记录时才解析该行
+"""
+import json
+import mmap
+import os
+import threading
+from collections.abc import Sequence
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "test_data")
+
+
+def _read_only(self, *args, **kwargs):
+    raise TypeError("测试数据是只读的，需要修改时请先用 utils.data_registry.thaw() 复制")
+
+
+class ReadOnlyDict(dict):
+    """只读字典：与普通 dict 比较、序列化结果相同，copy() 返回可修改的浅拷贝"""
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        # pickle/deepcopy 默认逐项 __setitem__ 重建，这里改为通过构造函数
+        return ReadOnlyDict, (dict(self),)
+
+
+class ReadOnlyList(list):
+    """只读列表：与普通 list 比较、序列化结果相同，copy() 返回可修改的浅拷贝"""
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = clear = extend = insert = pop = remove = reverse = sort = _read_only
+
+    def __reduce__(self):
+        return ReadOnlyList, (list(self),)
+
+
+def freeze(value: Any) -> Any:
+    """把 json 解析结果递归转换为只读结构"""
+    if isinstance(value, dict):
+        return ReadOnlyDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return ReadOnlyList(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """返回只读结构的可修改深拷贝"""
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [thaw(item) for item in value]
+    return value
+
+
+class JsonlDataset(Sequence):
+    """按行懒加载的 JSONL 数据集
+
+    文件以 mmap 方式打开，顺序迭代时逐行解析；第一次按下标访问或取长度时
+    扫描一遍换行符建立行偏移索引，之后随机访问只解析对应的一行。
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        # 空文件无法 mmap
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self._offsets: Optional[List[int]] = None
+        self._lock = threading.Lock()
+
+    def _line_offsets(self) -> List[int]:
+        with self._lock:
+            if self._offsets is None:
+                offsets, position, data = [], 0, self._data
+                end = len(data)
+                while position < end:
+                    newline = data.find(b"\n", position)
+                    if newline == -1:
+                        newline = end
+                    if data[position:newline].strip():
+                        offsets.append(position)
+                    position = newline + 1
+                self._offsets = offsets
+            return self._offsets
+
+    def _parse_at(self, offset: int) -> Any:
+        newline = self._data.find(b"\n", offset)
+        return freeze(json.loads(self._data[offset:newline if newline != -1 else len(self._data)]))
+
+    def __len__(self) -> int:
+        return len(self._line_offsets())
+
+    def __getitem__(self, index):
+        offsets = self._line_offsets()
+        if isinstance(index, slice):
+            return [self._parse_at(offset) for offset in offsets[index]]
+        return self._parse_at(offsets[index])
+
+    def __iter__(self) -> Iterator[Any]:
+        data = self._data
+        position, end = 0, len(data)
+        while position < end:
+            newline = data.find(b"\n", position)
+            if newline == -1:
+                newline = end
+            line = data[position:newline]
+            if line.strip():
+                yield freeze(json.loads(line))
+            position = newline + 1
+
+    def close(self):
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+
+
+class DataRegistry:
+    """数据文件注册表
+
+    名称相对 test_data/ 目录解析，也可以传入文件路径；省略后缀时依次查找
+    .json 和 .jsonl。.json 文件整体解析为只读结构，.jsonl 文件返回
+    JsonlDataset。
+    """
+
+    def __init__(self, data_dir: str = DATA_DIR):
+        self.data_dir = data_dir
+        self._cache: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self.stats = {"loads": 0, "hits": 0}
+
+    def resolve(self, name: str) -> str:
+        path = name if os.path.isabs(name) else os.path.join(self.data_dir, name)
+        if not os.path.splitext(path)[1]:
+            for suffix in (".json", ".jsonl"):
+                if os.path.exists(path + suffix):
+                    return os.path.realpath(path + suffix)
+        return os.path.realpath(path)
+
+    def get(self, name: str) -> Union[ReadOnlyDict, ReadOnlyList, JsonlDataset, Any]:
+        """获取数据文件的内容，同一文件只解析一次"""
+        path = self.resolve(name)
+        data = self._cache.get(path)
+        if data is not None:
+            self.stats["hits"] += 1
+            return data
+        with self._lock:
+            data = self._cache.get(path)
+            if data is None:
+                if path.endswith(".jsonl"):
+                    data = JsonlDataset(path)
+                else:
+                    with open(path, encoding="utf-8") as f:
+                        data = freeze(json.load(f))
+                self._cache[path] = data
+                self.stats["loads"] += 1
+            return data
+
+    def clear(self):
+        """丢弃已加载的数据（数据文件被修改后使用）"""
+        with self._lock:
+            for data in self._cache.values():
+                if isinstance(data, JsonlDataset):
+                    data.close()
+            self._cache.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "files": len(self._cache)}
+
+
+data_registry = DataRegistry()
@@ -3,39 +3,230 @@
 """
 import sqlite3
 import os
-from typing import Optional, Dict, Any, List
+import threading
+import time
+from typing import Optional, Dict, Any, List, Iterable, Tuple, Union
 from datetime import datetime, timedelta
+from .config import Config
+
+
+def _is_locked_error(error: sqlite3.OperationalError) -> bool:
+    """判断是否为数据库锁冲突（SQLITE_BUSY / SQLITE_LOCKED）"""
+    message = str(error).lower()
+    return "locked" in message or "busy" in message
+
+
+class ConnectionPool:
+    """SQLite连接池
+
+    每个线程（xdist 下即每个 worker 进程中的每个线程）复用同一个连接，
+    并缓存预编译语句。同一数据库文件的所有 DatabaseHelper 实例共享一个连接池。
+    WAL 日志模式会永久写入数据库文件，只在 wal=True 时开启（用于测试自己
+    创建的数据库副本），不会改动开发者的数据库。
+    """
+
+    _pools: Dict[str, "ConnectionPool"] = {}
+    _pools_lock = threading.Lock()
+
+    def __init__(self, db_path: str, busy_timeout: int = 5000, cached_statements: int = 256,
+                 wal: bool = False):
+        self.db_path = db_path
+        self.wal = wal
+        self.busy_timeout = busy_timeout  # 毫秒
+        self.cached_statements = cached_statements
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._stats = {"connections_opened": 0, "queries": 0, "lock_wait_ms": 0.0}
+
+    @classmethod
+    def for_path(cls, db_path: str, **kwargs) -> "ConnectionPool":
+        """获取指定数据库文件的共享连接池"""
+        key = os.path.abspath(db_path)
+        with cls._pools_lock:
+            pool = cls._pools.get(key)
+            if pool is None:
+                pool = cls(db_path, **kwargs)
+                cls._pools[key] = pool
+            elif kwargs.get("wal"):
+                pool.wal = True
+            return pool
+
+    @classmethod
+    def close_all_pools(cls):
+        """关闭所有连接池"""
+        with cls._pools_lock:
+            pools = list(cls._pools.values())
+            cls._pools.clear()
+        for pool in pools:
+            pool.close()
+
+    def open_connection(self) -> sqlite3.Connection:
+        """新建一个连接（锁等待由调用方统一处理，因此 timeout 为 0）"""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=0,
+            check_same_thread=False,
+            cached_statements=self.cached_statements
+        )
+        conn.row_factory = sqlite3.Row  # 使结果可以通过列名访问
+        self.record(connections_opened=1)
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        """获取当前线程的连接"""
+        if os.getpid() != self._pid:
+            # fork 之后父进程的连接不可复用
+            self._reset_after_fork()
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self.open_connection()
+            if self.wal:
+                try:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute("PRAGMA synchronous=NORMAL")
+                except sqlite3.OperationalError:
+                    # 其他进程持有锁时无法切换日志模式，保持默认模式即可
+                    pass
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def close(self):
+        """关闭连接池中的所有连接"""
+        with self._lock:
+            connections = self._connections
+            self._connections = []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
+
+    def _reset_after_fork(self):
+        with self._lock:
+            self._connections = []
+        self._local = threading.local()
+        self._pid = os.getpid()
+
+    def record(self, connections_opened: int = 0, queries: int = 0, lock_wait_ms: float = 0.0):
+        """累加统计计数"""
+        with self._lock:
+            self._stats["connections_opened"] += connections_opened
+            self._stats["queries"] += queries
+            self._stats["lock_wait_ms"] += lock_wait_ms
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取统计信息"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["lock_wait_ms"] = round(stats["lock_wait_ms"], 3)
+        return stats
+
+    def reset_stats(self):
+        """重置统计信息"""
+        with self._lock:
+            self._stats = {"connections_opened": 0, "queries": 0, "lock_wait_ms": 0.0}
 
 
 class DatabaseHelper:
     """数据库操作助手"""
     
-    def __init__(self, db_path: Optional[str] = None):
-        self.db_path = db_path or os.path.join(
-            os.path.dirname(__file__), 
-            "../../src/database/taobei.db"
-        )
+    def __init__(self, db_path: Optional[str] = None, pooled: bool = True, busy_timeout: int = 5000,
+                 wal: bool = False):
+        # 并行隔离时 worker_environment fixture 会通过 DB_PATH 指向 worker 独占的数据库副本
+        self.db_path = db_path or Config().DB_PATH
+        self.pooled = pooled
+        self.busy_timeout = busy_timeout  # 毫秒
+        if pooled:
+            self.pool = ConnectionPool.for_path(self.db_path, busy_timeout=busy_timeout, wal=wal)
+        else:
+            self.pool = ConnectionPool(self.db_path, busy_timeout=busy_timeout, wal=wal)
     
     def get_connection(self) -> sqlite3.Connection:
-        """获取数据库连接"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row  # 使结果可以通过列名访问
-        return conn
+        """获取数据库连接（连接池模式下为当前线程复用的连接）"""
+        if self.pooled:
+            return self.pool.acquire()
+        return self.pool.open_connection()
+    
+    def _release(self, conn: sqlite3.Connection):
+        """归还连接，非连接池模式下直接关闭"""
+        if not self.pooled:
+            conn.close()
+    
+    def _run_with_retry(self, work, queries: int = 1):
+        """在当前连接上执行 work(conn)，遇到锁冲突时在 busy_timeout 内退避重试"""
+        conn = self.get_connection()
+        waited = 0.0
+        delay = 0.005
+        try:
+            while True:
+                try:
+                    result = work(conn)
+                    break
+                except Exception as e:
+                    # 任何异常都先回滚未完成的事务：连接会被复用，不能继续持有写锁
+                    if conn.in_transaction:
+                        conn.rollback()
+                    if not isinstance(e, sqlite3.OperationalError) or not _is_locked_error(e) \
+                            or waited * 1000 >= self.busy_timeout:
+                        raise
+                    time.sleep(delay)
+                    waited += delay
+                    delay = min(delay * 2, 0.1)
+            self.pool.record(queries=queries, lock_wait_ms=waited * 1000)
+            return result
+        finally:
+            self._release(conn)
+    
+    def _execute(self, query: str, params: tuple = (), commit: bool = False,
+                 fetch: bool = False):
+        """执行单条语句"""
+        def work(conn):
+            cursor = conn.execute(query, params)
+            rows = cursor.fetchall() if fetch else None
+            if commit:
+                conn.commit()
+            return cursor, rows
+        return self._run_with_retry(work)
+    
+    def execute_batch(self, statements: List[Tuple[str, List[tuple]]]) -> int:
+        """在同一个事务中用 executemany 执行多组语句，返回受影响的总行数"""
+        statements = [(query, list(rows)) for query, rows in statements]
+        
+        def work(conn):
+            before = conn.total_changes
+            with conn:
+                for query, rows in statements:
+                    if rows:
+                        conn.executemany(query, rows)
+            return conn.total_changes - before
+        return self._run_with_retry(work, queries=len(statements))
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """获取连接与查询统计：connections_opened、queries、lock_wait_ms"""
+        return self.pool.get_stats()
+    
+    def reset_stats(self):
+        """重置连接与查询统计"""
+        self.pool.reset_stats()
+    
+    def close(self):
+        """关闭连接池中的连接"""
+        self.pool.close()
     
     def execute_query(self, query: str, params: tuple = ()) -> List[Dict[str, Any]]:
         """执行查询语句"""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(query, params)
-            return [dict(row) for row in cursor.fetchall()]
+        _, rows = self._execute(query, params, fetch=True)
+        return [dict(row) for row in rows]
     
     def execute_update(self, query: str, params: tuple = ()) -> int:
         """执行更新语句"""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(query, params)
-            conn.commit()
-            return cursor.rowcount
+        cursor, _ = self._execute(query, params, commit=True)
+        return cursor.rowcount
     
     # 用户相关操作
     def create_test_user(self, phone_number: str, nickname: str = None) -> int:
@@ -44,11 +235,8 @@ class DatabaseHelper:
         INSERT INTO users (phone_number, nickname, created_at, updated_at)
         VALUES (?, ?, datetime('now'), datetime('now'))
         """
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(query, (phone_number, nickname))
-            conn.commit()
-            return cursor.lastrowid
+        cursor, _ = self._execute(query, (phone_number, nickname), commit=True)
+        return cursor.lastrowid
     
     def get_user_by_phone(self, phone_number: str) -> Optional[Dict[str, Any]]:
         """根据手机号获取用户"""
@@ -67,11 +255,10 @@ class DatabaseHelper:
     
     def create_user_if_not_exists(self, phone_number: str, nickname: str = None) -> int:
         """如果用户不存在则创建用户"""
-        if not self.user_exists(phone_number):
+        user = self.get_user_by_phone(phone_number)
+        if user is None:
             return self.create_test_user(phone_number, nickname or f"用户{phone_number[-4:]}")
-        else:
-            user = self.get_user_by_phone(phone_number)
-            return user['id'] if user else None
+        return user['id']
     
     # 验证码相关操作
     def create_verification_code(self, phone_number: str, code: str, expires_in_seconds: int = 60) -> int:
@@ -81,11 +268,8 @@ class DatabaseHelper:
         INSERT INTO verification_codes (phone_number, code, expires_at, created_at)
         VALUES (?, ?, ?, datetime('now'))
         """
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(query, (phone_number, code, expires_at.isoformat()))
-            conn.commit()
-            return cursor.lastrowid
+        cursor, _ = self._execute(query, (phone_number, code, expires_at.isoformat()), commit=True)
+        return cursor.lastrowid
     
     def get_verification_code(self, phone_number: str) -> Optional[Dict[str, Any]]:
         """获取最新的验证码"""
@@ -123,30 +307,63 @@ class DatabaseHelper:
         results = self.execute_query(query, (phone_number, code))
         return len(results) > 0
     
+    # 批量操作
+    def bulk_create_users(self, users: Iterable[Union[str, Dict[str, Any]]]) -> int:
+        """批量创建用户，已存在的手机号会被忽略，返回新建数量
+        
+        users 中的元素可以是手机号，也可以是包含 phone_number/nickname 的字典
+        """
+        query = """
+        INSERT OR IGNORE INTO users (phone_number, nickname, created_at, updated_at)
+        VALUES (?, ?, datetime('now'), datetime('now'))
+        """
+        rows = []
+        for user in users:
+            if isinstance(user, str):
+                rows.append((user, f"用户{user[-4:]}"))
+            else:
+                phone = user["phone_number"]
+                rows.append((phone, user.get("nickname") or f"用户{phone[-4:]}"))
+        return self.execute_batch([(query, rows)])
+    
+    def bulk_create_verification_codes(self, phone_numbers: Iterable[str], code: str = "123456",
+                                       expires_in_seconds: int = 60) -> int:
+        """批量为手机号创建验证码记录，返回创建数量"""
+        expires_at = (datetime.now() + timedelta(seconds=expires_in_seconds)).isoformat()
+        query = """
+        INSERT INTO verification_codes (phone_number, code, expires_at, created_at)
+        VALUES (?, ?, ?, datetime('now'))
+        """
+        rows = [(phone, code, expires_at) for phone in phone_numbers]
+        return self.execute_batch([(query, rows)])
+    
+    def bulk_delete_by_phones(self, phone_numbers: Iterable[str]) -> int:
+        """批量删除手机号对应的用户和验证码，返回删除的总行数"""
+        rows = [(phone,) for phone in phone_numbers]
+        return self.execute_batch([
+            ("DELETE FROM verification_codes WHERE phone_number = ?", rows),
+            ("DELETE FROM users WHERE phone_number = ?", rows)
+        ])
+    
     # 测试数据清理
     def clean_test_data(self):
-        """清理测试数据"""
-        test_phones = [
-            "13800138001",
-            "13800138002", 
-            "13800138003",
-            "13800138004",
-            "13800138005"
-        ]
+        """清理测试数据（当前worker手机号段内的测试手机号）"""
+        test_phones = Config().get_test_phones(5)
         
-        # 删除测试用户
-        for phone in test_phones:
-            self.delete_user_by_phone(phone)
-            self.delete_verification_codes(phone)
+        # 删除测试用户及其验证码
+        self.bulk_delete_by_phones(test_phones)
     
     def setup_test_data(self):
         """设置测试数据"""
-        # 创建已注册的测试用户
-        if not self.user_exists("13800138001"):
-            self.create_test_user("13800138001", "测试用户1")
-        
-        # 确保未注册的测试手机号不存在
-        self.delete_user_by_phone("13800138002")
+        config = Config()
+        # 在同一个事务中创建已注册的测试用户，并确保未注册的测试手机号不存在
+        self.execute_batch([
+            ("""
+            INSERT OR IGNORE INTO users (phone_number, nickname, created_at, updated_at)
+            VALUES (?, ?, datetime('now'), datetime('now'))
+            """, [(config.TEST_PHONE_REGISTERED, "测试用户1")]),
+            ("DELETE FROM users WHERE phone_number = ?", [(config.TEST_PHONE_UNREGISTERED,)])
+        ])
     
     def get_table_count(self, table_name: str) -> int:
         """获取表中记录数量"""
@@ -0,0 +1,91 @@
+"""
+数据库快照管理
+"""
+import os
+import shutil
+import sqlite3
+import threading
+from typing import Callable, Optional
+
+from .database_helper import DatabaseHelper
+
+
+class DatabaseSnapshot:
+    """数据库基准快照
+
+    会话开始时基于 init.sql 和种子数据构建一次基准库，之后每个测试
+    通过 SQLite 在线备份 API 将基准库整体还原到工作库，耗时与库文件
+    大小成正比，且不会遗漏测试中以任意手机号写入的数据。
+    """
+
+    def __init__(self, snapshot_path: str, init_sql: Optional[str] = None):
+        self.snapshot_path = snapshot_path
+        self.init_sql = init_sql or os.path.join(
+            os.path.dirname(__file__),
+            "../../src/database/init.sql"
+        )
+        self._source: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self.restore_count = 0
+
+    def build(self, seed: Optional[Callable[[DatabaseHelper], None]] = None) -> str:
+        """构建基准库，seed 用于写入种子数据"""
+        self.close()
+        if os.path.exists(self.snapshot_path):
+            os.remove(self.snapshot_path)
+
+        # 基准库使用非连接池模式，保持默认日志模式，便于直接复制文件
+        helper = DatabaseHelper(self.snapshot_path, pooled=False)
+        with open(self.init_sql, encoding="utf-8") as f:
+            script = f.read()
+        conn = helper.get_connection()
+        try:
+            conn.executescript(script)
+        finally:
+            conn.close()
+        if seed:
+            seed(helper)
+        return self.snapshot_path
+
+    def create_copy(self, target_path: str) -> str:
+        """复制一份基准库作为工作库
+
+        工作库已存在时可能正被复用的后端进程打开，通过在线备份原地覆盖，
+        不删除文件。
+        """
+        if os.path.exists(target_path):
+            source = sqlite3.connect(self.snapshot_path)
+            target = sqlite3.connect(target_path, timeout=5)
+            try:
+                source.backup(target)
+            finally:
+                target.close()
+                source.close()
+            return target_path
+        for suffix in ("-wal", "-shm"):
+            if os.path.exists(target_path + suffix):
+                os.remove(target_path + suffix)
+        shutil.copyfile(self.snapshot_path, target_path)
+        return target_path
+
+    def restore(self, helper: DatabaseHelper):
+        """将基准库还原到 helper 所指向的工作库"""
+        with self._lock:
+            if self._source is None:
+                self._source = sqlite3.connect(self.snapshot_path, check_same_thread=False)
+            target = helper.get_connection()
+            try:
+                if target.in_transaction:
+                    target.rollback()
+                self._source.backup(target)
+            finally:
+                if not helper.pooled:
+                    target.close()
+            self.restore_count += 1
+
+    def close(self):
+        """关闭基准库连接"""
+        with self._lock:
+            if self._source is not None:
+                self._source.close()
+                self._source = None
@@ -0,0 +1,144 @@
+"""
+按历史耗时调度并行测试
+每次运行后记录每个测试的耗时；并行运行时按耗时从长到短（LPT）把测试分配到
+各个 worker，浏览器测试和纯API测试分在不同的 worker 组，使总耗时接近最长路径
+"""
+import heapq
+import json
+import os
+import re
+import statistics
+from typing import Any, Dict, Iterable, List, Tuple
+
+
+# 没有历史耗时（也没有同类测试的耗时）时的估计值（秒）
+DEFAULT_DURATIONS = {"browser": 10.0, "api": 1.0}
+
+# 新耗时在平滑值中的权重，减少单次波动的影响
+SMOOTHING = 0.5
+
+_GROUP_SUFFIX = re.compile(r"@[^\[\]@]*$")
+
+
+def base_nodeid(nodeid: str) -> str:
+    """去掉 --dist loadgroup 附加在 nodeid 后的 @分组名"""
+    return _GROUP_SUFFIX.sub("", nodeid)
+
+
+class DurationStore:
+    """历史耗时：nodeid -> 平滑后的耗时（秒）"""
+
+    def __init__(self, path: str = ".test_durations.json"):
+        self.path = path
+        self.durations: Dict[str, float] = {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self.durations = {key: float(value) for key, value in json.load(f).items()}
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    def update(self, measured: Dict[str, float]):
+        """合并本次运行的耗时"""
+        for nodeid, duration in measured.items():
+            previous = self.durations.get(nodeid)
+            self.durations[nodeid] = duration if previous is None \
+                else round(previous * (1 - SMOOTHING) + duration * SMOOTHING, 4)
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(dict(sorted(self.durations.items())), f, ensure_ascii=False, indent=2)
+
+    def estimate(self, tests: Iterable[Tuple[str, str]]) -> Dict[str, float]:
+        """估计 (nodeid, 类别) 的耗时；没有历史的测试取同类测试耗时的中位数"""
+        tests = list(tests)
+        known = {}
+        for nodeid, kind in tests:
+            if nodeid in self.durations:
+                known.setdefault(kind, []).append(self.durations[nodeid])
+        fallback = {kind: statistics.median(values) for kind, values in known.items()}
+        return {
+            nodeid: self.durations.get(nodeid, fallback.get(kind, DEFAULT_DURATIONS.get(kind, 1.0)))
+            for nodeid, kind in tests
+        }
+
+
+def lpt(durations: Dict[str, float], bins: int) -> List[Dict[str, Any]]:
+    """最长处理时间优先：依次把最长的测试放到当前负载最小的分组"""
+    loads = [(0.0, index) for index in range(bins)]
+    result = [{"load": 0.0, "tests": []} for _ in range(bins)]
+    for nodeid, duration in sorted(durations.items(), key=lambda item: (-item[1], item[0])):
+        load, index = heapq.heappop(loads)
+        result[index]["tests"].append(nodeid)
+        result[index]["load"] = load + duration
+        heapq.heappush(loads, (load + duration, index))
+    return result
+
+
+def _makespan(groups: List[Dict[str, Any]]) -> float:
+    return max((group["load"] for group in groups), default=0.0)
+
+
+def plan_schedule(tests: List[Tuple[str, str, float]], workers: int) -> Dict[str, Any]:
+    """为 (nodeid, 类别, 耗时) 生成分组计划
+
+    两类测试都存在且 worker 不少于两个时，尝试所有浏览器/API worker 数的
+    划分，取预计总耗时最短的一种；返回每个分组的名称、类别、测试和预计负载。
+    """
+    by_kind: Dict[str, Dict[str, float]] = {}
+    for nodeid, kind, duration in tests:
+        by_kind.setdefault(kind, {})[nodeid] = duration
+
+    workers = max(workers, 1)
+    if len(by_kind) < 2 or workers < 2:
+        if len(by_kind) > 1:  # 只有一个 worker：全部放在同一组
+            by_kind = {"mixed": {nodeid: duration for nodeid, _, duration in tests}}
+        split = {kind: workers for kind in by_kind}
+    else:
+        browser, api = by_kind["browser"], by_kind["api"]
+        best = min(
+            range(1, workers),
+            key=lambda count: max(_makespan(lpt(browser, count)), _makespan(lpt(api, workers - count)))
+        )
+        split = {"browser": best, "api": workers - best}
+
+    groups = []
+    for kind, durations in sorted(by_kind.items()):
+        count = min(split[kind], len(durations))
+        for index, group in enumerate(lpt(durations, count)):
+            groups.append({"name": f"lpt-{kind}-{index}", "kind": kind,
+                           "load": round(group["load"], 3), "tests": group["tests"]})
+    return {
+        "workers": workers,
+        "split": split,
+        "makespan": round(max((group["load"] for group in groups), default=0.0), 3),
+        "total": round(sum(duration for _, _, duration in tests), 3),
+        "groups": groups
+    }
+
+
+class DurationRecorder:
+    """pytest 插件：累计每个测试 setup/call/teardown 的耗时，会话结束时写入历史
+
+    xdist 下只在主进程注册，worker 的报告会转发给主进程。跳过的测试不记录。
+    """
+
+    def __init__(self, store: DurationStore):
+        self.store = store
+        self.measured: Dict[str, float] = {}
+        self._skipped = set()
+
+    def pytest_runtest_logreport(self, report):
+        nodeid = base_nodeid(report.nodeid)
+        if report.skipped:
+            self._skipped.add(nodeid)
+        self.measured[nodeid] = self.measured.get(nodeid, 0.0) + report.duration
+
+    def pytest_sessionfinish(self, session):
+        measured = {nodeid: round(duration, 4) for nodeid, duration in self.measured.items()
+                    if nodeid not in self._skipped}
+        if measured:
+            self.store.update(measured)
+            self.store.save()
@@ -0,0 +1,176 @@
+"""
+负载生成器
+按 test_data/performance.json 中的并发数和持续时间执行 登录 → 退出登录 →
+健康检查 流程（只包含 src/backend/app.js 实际提供的接口），统计各接口的吞吐量、
+延迟分位数、错误率和状态码分布
+"""
+import asyncio
+import math
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+
+from .async_api_helper import AsyncAPIHelper
+from .config import Config
+from .data_registry import data_registry
+from .database_helper import DatabaseHelper
+
+PERFORMANCE_DATA = os.path.join(os.path.dirname(__file__), "../test_data/performance.json")
+
+ENDPOINTS = ["login", "logout", "health"]
+
+
+def load_performance_settings(path: str = PERFORMANCE_DATA) -> Dict[str, Any]:
+    """读取性能测试配置（只读，进程内只解析一次）"""
+    return data_registry.get(path)
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """计算已排序数据的分位数（最近秩法）"""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class EndpointStats:
+    """单个接口的延迟与错误统计"""
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.errors = 0
+        self.status_codes: Dict[str, int] = {}
+
+    def record(self, latency_ms: float, ok: bool, status_code: Optional[int] = None):
+        """记录一次请求，status_code 为 None 表示请求没有得到响应"""
+        self.latencies.append(latency_ms)
+        if not ok:
+            self.errors += 1
+        key = str(status_code) if status_code is not None else "no_response"
+        self.status_codes[key] = self.status_codes.get(key, 0) + 1
+
+    def summary(self, duration: float) -> Dict[str, Any]:
+        """汇总统计结果"""
+        latencies = sorted(self.latencies)
+        total = len(latencies)
+        return {
+            "requests": total,
+            "errors": self.errors,
+            "error_rate": round(self.errors / total, 4) if total else 0.0,
+            "throughput_rps": round(total / duration, 2) if duration else 0.0,
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p95_ms": round(percentile(latencies, 95), 2),
+            "p99_ms": round(percentile(latencies, 99), 2),
+            "max_ms": round(latencies[-1], 2) if latencies else 0.0,
+            "status_codes": dict(sorted(self.status_codes.items()))
+        }
+
+
+class LoadGenerator:
+    """基于 AsyncAPIHelper 的负载生成器
+
+    每个虚拟用户使用一个压测手机号循环执行业务流程。后端不会在响应中返回
+    验证码，且发送验证码接口每个IP每分钟只允许1次，因此流程不调用它，登录前
+    通过 code_provider 写入一个已知验证码（默认直接写库），这一步不计入接口耗时。
+    写入的压测用户和验证码由 cleanup() 删除。
+    """
+
+    def __init__(self, config: Config = None, phones: Optional[List[str]] = None,
+                 code_provider: Optional[Callable[[str], str]] = None,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.config = config or Config()
+        self.phones = phones or load_performance_settings()["stress_test_phones"]
+        self.code_provider = code_provider or self._seed_verification_code
+        self.transport = transport
+        self._db_helper: Optional[DatabaseHelper] = None
+        self._seeded_phones = set()
+
+    @property
+    def db_helper(self) -> DatabaseHelper:
+        if self._db_helper is None:
+            self._db_helper = DatabaseHelper(self.config.DB_PATH)
+        return self._db_helper
+
+    def _seed_verification_code(self, phone_number: str) -> str:
+        """向数据库写入已知验证码"""
+        code = self.config.TEST_VERIFICATION_CODE
+        self._seeded_phones.add(phone_number)
+        self.db_helper.create_verification_code(phone_number, code)
+        return code
+
+    def prepare_users(self, count: int):
+        """确保压测手机号已注册"""
+        self._seeded_phones.update(self.phones[:count])
+        self.db_helper.bulk_create_users(self.phones[:count])
+
+    def cleanup(self) -> int:
+        """删除压测写入的用户和验证码，返回删除的行数"""
+        if not self._seeded_phones:
+            return 0
+        deleted = self.db_helper.bulk_delete_by_phones(sorted(self._seeded_phones))
+        self._seeded_phones.clear()
+        return deleted
+
+    async def _timed(self, stats: Dict[str, EndpointStats], endpoint: str, call):
+        """执行一次请求并记录耗时"""
+        start = time.perf_counter()
+        try:
+            response = await call
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            response = None
+            ok = False
+        status_code = response.status_code if response is not None else None
+        stats[endpoint].record((time.perf_counter() - start) * 1000, ok, status_code)
+        return response
+
+    async def _virtual_user(self, api: AsyncAPIHelper, phone_number: str, deadline: float,
+                            stats: Dict[str, EndpointStats]):
+        """单个虚拟用户循环执行业务流程直到截止时间"""
+        while time.monotonic() < deadline:
+            code = await asyncio.to_thread(self.code_provider, phone_number)
+
+            response = await self._timed(stats, "login", api.login(phone_number, code))
+            token = None
+            if response is not None and response.status_code == 200:
+                token = api.get_response_data(response).get("token")
+            if token:
+                await self._timed(stats, "logout", api.logout(token))
+
+            await self._timed(stats, "health", api.health_check())
+
+    async def run_level(self, concurrency: int, duration: float) -> Dict[str, Any]:
+        """以指定并发数运行指定时长"""
+        stats = {endpoint: EndpointStats() for endpoint in ENDPOINTS}
+        async with AsyncAPIHelper(self.config, max_connections=concurrency,
+                                  transport=self.transport) as api:
+            start = time.monotonic()
+            deadline = start + duration
+            await asyncio.gather(*[
+                self._virtual_user(api, self.phones[i % len(self.phones)], deadline, stats)
+                for i in range(concurrency)
+            ])
+            elapsed = time.monotonic() - start
+
+        endpoints = {endpoint: stats[endpoint].summary(elapsed) for endpoint in ENDPOINTS}
+        total_requests = sum(item["requests"] for item in endpoints.values())
+        total_errors = sum(item["errors"] for item in endpoints.values())
+        return {
+            "concurrent_users": concurrency,
+            "duration_seconds": duration,
+            "elapsed_seconds": round(elapsed, 3),
+            "total_requests": total_requests,
+            "throughput_rps": round(total_requests / elapsed, 2) if elapsed else 0.0,
+            "error_rate": round(total_errors / total_requests, 4) if total_requests else 0.0,
+            "endpoints": endpoints
+        }
+
+    def run(self, concurrency_levels: List[int], durations: List[float]) -> List[Dict[str, Any]]:
+        """依次运行所有并发数与持续时间组合"""
+        results = []
+        for duration in durations:
+            for concurrency in concurrency_levels:
+                results.append(asyncio.run(self.run_level(concurrency, duration)))
+        return results
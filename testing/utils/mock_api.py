@@ -0,0 +1,195 @@
+"""
+进程内模拟后端
+基于 TestDataManager 的数据实现 /api/products* 和 /api/auth/* 接口，通过
+Playwright 的 route 拦截页面请求，UI测试无需启动 Node 后端和 SQLite
+"""
+import json
+import re
+from typing import Any, Dict, Iterable, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from .test_data import TestDataManager
+
+
+_PHONE_PATTERN = re.compile(r"^1[3-9]\d{9}$")
+_PRODUCT_DETAIL_PATH = re.compile(r"^/api/products/([^/]+)$")
+
+SORT_FIELDS = {"price", "name", "rating", "created_at", "id"}
+
+
+class MockBackend:
+    """模拟后端：请求处理与 Playwright 路由解耦，可直接调用 handle 测试
+
+    registered_phones 中的手机号视为已注册用户（如当前worker的测试手机号）。
+    """
+
+    def __init__(self, data_manager: Optional[TestDataManager] = None, verification_code: str = None,
+                 registered_phones: Iterable[str] = ()):
+        self.data = data_manager or TestDataManager()
+        self.verification_code = verification_code or self.data.get_verification_codes()["valid"]
+        self.registered_phones = list(registered_phones)
+        self.codes: Dict[str, str] = {}
+        self.requests = []
+        self._seed_users()
+
+    def reset(self):
+        """恢复初始数据（每个测试之间调用）"""
+        self.data.reset_data()
+        self.codes.clear()
+        self.requests.clear()
+        self._seed_users()
+
+    def _seed_users(self):
+        for phone_number in self.registered_phones:
+            if self.data.get_user_by_phone(phone_number) is None:
+                self.data.add_test_user({"phone_number": phone_number, "nickname": f"用户{phone_number[-4:]}", "avatar": None})
+
+    # Playwright 路由
+    def install(self, target):
+        """在浏览器上下文或页面上拦截商品和认证接口"""
+        target.route("**/api/products*", self._handle_route)
+        target.route("**/api/products/**", self._handle_route)
+        target.route("**/api/auth/**", self._handle_route)
+
+    def _handle_route(self, route):
+        request = route.request
+        parts = urlsplit(request.url)
+        try:
+            body = json.loads(request.post_data) if request.post_data else {}
+        except ValueError:
+            body = {}
+        status, payload = self.handle(request.method, parts.path, dict(parse_qsl(parts.query)), body)
+        route.fulfill(
+            status=status,
+            content_type="application/json; charset=utf-8",
+            body=json.dumps(payload, ensure_ascii=False)
+        )
+
+    # 请求分发
+    def handle(self, method: str, path: str, query: Dict[str, str] = None,
+               body: Dict[str, Any] = None) -> Tuple[int, Dict[str, Any]]:
+        """处理一次请求，返回 (状态码, 响应JSON)"""
+        query = query or {}
+        body = body or {}
+        self.requests.append({"method": method, "path": path, "query": query})
+
+        if method == "GET" and path == "/api/products":
+            return self._list_products(query)
+        match = _PRODUCT_DETAIL_PATH.match(path)
+        if method == "GET" and match:
+            return self._product_detail(match.group(1))
+        if method == "POST" and path in ("/api/auth/send-verification-code", "/api/auth/send-code"):
+            return self._send_code(body)
+        if method == "POST" and path == "/api/auth/login":
+            return self._login(body, register=False)
+        if method == "POST" and path == "/api/auth/register":
+            return self._login(body, register=True)
+        if method == "POST" and path == "/api/auth/logout":
+            return 200, {"message": "退出登录成功"}
+        return 404, {"error": "接口不存在"}
+
+    # 商品接口
+    def _list_products(self, query: Dict[str, str]) -> Tuple[int, Dict[str, Any]]:
+        try:
+            page = int(query.get("page", 1))
+        except ValueError:
+            page = 0
+        if page < 1:
+            return 400, {"error": "页码必须是大于0的整数"}
+        try:
+            page_size = int(query.get("pageSize", query.get("page_size", 10)))
+        except ValueError:
+            page_size = 0
+        if not 1 <= page_size <= 100:
+            return 400, {"error": "每页数量必须是1-100之间的整数"}
+
+        keyword = query.get("keyword", "").strip()
+        if len(keyword) > 100:
+            return 400, {"error": "搜索关键词不能超过100个字符"}
+
+        products = self.data.search_products_by_keyword(keyword) if keyword else self.data.get_all_products()
+
+        category = query.get("category")
+        if category and category not in ("all", "全部"):
+            products = [
+                product for product in products
+                if product["category"] == category or str(product["category_id"]) == category
+            ]
+
+        sort_by = query.get("sortBy", query.get("sort_by"))
+        if sort_by in SORT_FIELDS:
+            descending = query.get("sortOrder", query.get("sort_order", "asc")).lower() == "desc"
+            products = sorted(products, key=lambda product: product[sort_by], reverse=descending)
+
+        total_items = len(products)
+        start = (page - 1) * page_size
+        end = start + page_size
+        return 200, {
+            "products": products[start:end],
+            "pagination": {
+                "current_page": page,
+                "page_size": page_size,
+                "total_items": total_items,
+                "total_pages": (total_items + page_size - 1) // page_size,
+                "has_next": end < total_items,
+                "has_prev": page > 1
+            }
+        }
+
+    def _product_detail(self, product_id: str) -> Tuple[int, Dict[str, Any]]:
+        if not product_id.isdigit() or int(product_id) < 1:
+            return 400, {"error": "商品ID必须是正整数"}
+        product = self.data.get_product_by_id(int(product_id))
+        if product is None:
+            return 404, {"error": "商品不存在"}
+        return 200, product
+
+    # 认证接口（与 src/backend/routes/auth.js 的响应保持一致）
+    def _send_code(self, body: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        phone_number = body.get("phone") or body.get("phoneNumber")
+        if not phone_number:
+            return 400, {"error": "手机号不能为空"}
+        if not _PHONE_PATTERN.match(phone_number):
+            return 400, {"error": "请输入正确的手机号码"}
+        self.codes[phone_number] = self.verification_code
+        return 200, {"message": "验证码已发送", "expiresIn": 60}
+
+    def _login(self, body: Dict[str, Any], register: bool) -> Tuple[int, Dict[str, Any]]:
+        phone_number = body.get("phone") or body.get("phoneNumber")
+        code = body.get("code") or body.get("verificationCode")
+        if not phone_number:
+            return 400, {"error": "手机号不能为空"}
+        if not code:
+            return 400, {"error": "验证码不能为空"}
+        if not _PHONE_PATTERN.match(phone_number):
+            return 400, {"error": "请输入正确的手机号码"}
+        if len(code) != 6:
+            return 400, {"error": "验证码必须是6位数字"}
+        if register and str(body.get("agreeToTerms", "")).lower() != "true":
+            return 400, {"error": "必须同意用户协议"}
+        if self.codes.get(phone_number) != code:
+            return 400, {"error": "验证码错误或已过期"}
+        del self.codes[phone_number]
+
+        user = self.data.get_user_by_phone(phone_number)
+        if user is None and not register:
+            return 400, {"error": "该手机号未注册，请先完成注册"}
+
+        status, message = 200, "登录成功"
+        if register and user is None:
+            user = {"phone_number": phone_number, "nickname": f"用户{phone_number[-4:]}", "avatar": None}
+            self.data.add_test_user(user)
+            status, message = 201, "注册成功"
+        elif register:
+            message = "该手机号已注册，将直接为您登录"
+
+        return status, {
+            "message": message,
+            "token": f"mock-token-{user['id']}",
+            "user": {
+                "id": user["id"],
+                "phoneNumber": user["phone_number"],
+                "nickname": user.get("nickname"),
+                "avatar": user.get("avatar")
+            }
+        }
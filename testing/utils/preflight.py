@@ -0,0 +1,74 @@
+"""
+运行前预检
+测试开始前并行检查配置中的后端、前端和数据库是否可用，全部检查的总耗时
+不超过预算（默认约1秒），避免端口或地址配置错误时每个测试都等到请求超时
+"""
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from .config import Config
+
+
+def preflight_targets(config: Config) -> List[Dict[str, Any]]:
+    """需要检查的目标：HTTP 地址或数据库文件"""
+    targets = [{"name": "backend", "url": config.get_api_url("health")}]
+    if not config.API_MOCK:
+        targets.append({"name": "frontend", "url": config.BASE_URL})
+    targets.append({"name": "database", "path": config.DB_PATH})
+    return targets
+
+
+def _probe(target: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+    start = time.perf_counter()
+    result = {"name": target["name"], "target": target.get("url") or target.get("path"), "ok": False}
+    try:
+        if "path" in target:
+            result["ok"] = os.path.isfile(target["path"])
+            if not result["ok"]:
+                result["error"] = "文件不存在"
+        else:
+            response = requests.get(target["url"], timeout=timeout, allow_redirects=False)
+            result["status"] = response.status_code
+            result["ok"] = response.status_code < 500
+            if not result["ok"]:
+                result["error"] = f"状态码 {response.status_code}"
+    except requests.exceptions.ConnectionError:
+        result["error"] = "无法连接"
+    except requests.exceptions.Timeout:
+        result["error"] = "请求超时"
+    except requests.exceptions.RequestException as e:
+        result["error"] = str(e)
+    result["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return result
+
+
+def run_preflight(targets: List[Dict[str, Any]], budget: float = 1.0) -> List[Dict[str, Any]]:
+    """并行检查所有目标，超出预算仍未完成的记为超时，不等待其结束"""
+    if not targets:
+        return []
+    pool = ThreadPoolExecutor(max_workers=len(targets), thread_name_prefix="preflight")
+    futures = [pool.submit(_probe, target, budget) for target in targets]
+    wait(futures, timeout=budget)
+    pool.shutdown(wait=False, cancel_futures=True)
+
+    results = []
+    for target, future in zip(targets, futures):
+        if future.done():
+            results.append(future.result())
+        else:
+            results.append({"name": target["name"], "target": target.get("url") or target.get("path"),
+                            "ok": False, "error": f"超过预检预算 {budget}s", "elapsed_ms": budget * 1000})
+    return results
+
+
+def format_results(results: List[Dict[str, Any]], profile: Optional[str] = None) -> str:
+    """预检结果摘要，每个目标一行"""
+    lines = [f"环境预检 (profile: {profile})" if profile else "环境预检"]
+    for result in results:
+        status = "✅" if result["ok"] else f"❌ {result.get('error', '')}"
+        lines.append(f"  {result['name']:<9} {result['target']}  {status}  {result['elapsed_ms']}ms")
+    return "\n".join(lines)
@@ -0,0 +1,184 @@
+"""
+重试策略
+指数退避加随机抖动，按请求是否幂等决定哪些失败可以重试；每个测试有重试预算，
+所有重试都会记入 retry_stats，在测试报告中统计不稳定带来的额外开销
+"""
+import random
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import requests
+
+from .circuit_breaker import BackendUnavailable
+from .config import Config
+from .wait_profiler import wait_profiler
+
+# 重复执行不会改变结果的 HTTP 方法
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+# 服务端临时故障，幂等请求可以重试
+TRANSIENT_STATUS = frozenset({500, 502, 503, 504})
+
+# 判断是否重试：返回重试原因，返回 None 表示不重试
+RetryClassifier = Callable[[Any, Optional[BaseException]], Optional[str]]
+
+
+class RetryStats:
+    """重试统计
+
+    按测试记录重试次数和原因，并负责每个测试的重试预算。不在测试中时
+    （如命令行工具）只统计不限制预算。
+    """
+
+    def __init__(self):
+        self.tests: Dict[str, Dict[str, Any]] = {}
+        self._current: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def start_test(self, nodeid: str):
+        self._current = nodeid
+
+    def end_test(self) -> int:
+        """结束当前测试，返回该测试的重试次数"""
+        nodeid, self._current = self._current, None
+        with self._lock:
+            return self.tests.get(nodeid, {}).get("retries", 0)
+
+    def current_retries(self) -> int:
+        with self._lock:
+            return self.tests.get(self._current, {}).get("retries", 0)
+
+    def acquire(self, budget: Optional[int]) -> bool:
+        """当前测试是否还有重试预算"""
+        return budget is None or self._current is None or self.current_retries() < budget
+
+    def record(self, target: str, reason: str, delay: float):
+        """记录一次重试"""
+        with self._lock:
+            entry = self.tests.setdefault(self._current or "<no test>",
+                                          {"retries": 0, "delay_s": 0.0, "reasons": {}})
+            entry["retries"] += 1
+            entry["delay_s"] = round(entry["delay_s"] + delay, 3)
+            key = f"{target} {reason}"
+            entry["reasons"][key] = entry["reasons"].get(key, 0) + 1
+
+    def summary(self) -> Dict[str, Any]:
+        """重试总数、退避等待总时长和重试最多的测试"""
+        with self._lock:
+            tests = {nodeid: dict(entry) for nodeid, entry in self.tests.items()}
+        return {
+            "total_retries": sum(entry["retries"] for entry in tests.values()),
+            "total_delay_s": round(sum(entry["delay_s"] for entry in tests.values()), 3),
+            "tests": dict(sorted(tests.items(), key=lambda item: -item[1]["retries"]))
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {nodeid: dict(entry, reasons=dict(entry["reasons"])) for nodeid, entry in self.tests.items()}
+
+    def merge(self, data: Dict[str, Any]):
+        """合并 xdist worker 的统计"""
+        with self._lock:
+            for nodeid, other in data.items():
+                entry = self.tests.setdefault(nodeid, {"retries": 0, "delay_s": 0.0, "reasons": {}})
+                entry["retries"] += other["retries"]
+                entry["delay_s"] = round(entry["delay_s"] + other["delay_s"], 3)
+                for key, count in other["reasons"].items():
+                    entry["reasons"][key] = entry["reasons"].get(key, 0) + count
+
+    def clear(self):
+        with self._lock:
+            self.tests.clear()
+
+
+class RetryPolicy:
+    """指数退避重试
+
+    第 n 次重试前等待 min(max_delay, base_delay * 2^n)，再按 jitter 比例随机缩短，
+    避免多个 worker 同时重试。退避等待计入 wait_profiler 的固定等待。
+    """
+
+    def __init__(self, max_retries: int = 3, base_delay: float = 1.0, max_delay: float = 8.0,
+                 jitter: float = 0.5, budget: Optional[int] = None, stats: Optional[RetryStats] = None,
+                 rng: Optional[random.Random] = None, sleep: Optional[Callable[[float], None]] = None):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.budget = budget
+        self.stats = stats or retry_stats
+        self.rng = rng or random.Random()
+        self.sleep = sleep or wait_profiler.sleep
+
+    @classmethod
+    def from_config(cls, config: Optional[Config] = None, **kwargs) -> "RetryPolicy":
+        """按 Config 的 MAX_RETRIES、RETRY_DELAY（毫秒）等配置创建"""
+        config = config or Config()
+        settings = {
+            "max_retries": config.MAX_RETRIES,
+            "base_delay": config.RETRY_DELAY / 1000,
+            "max_delay": config.RETRY_MAX_DELAY / 1000,
+            "jitter": config.RETRY_JITTER,
+            "budget": config.RETRY_BUDGET
+        }
+        settings.update(kwargs)
+        return cls(**settings)
+
+    def backoff(self, attempt: int) -> float:
+        """第 attempt 次重试（从0开始）前的等待秒数"""
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return delay * (1 - self.jitter * self.rng.random())
+
+    def run(self, func: Callable[[], Any], classify: RetryClassifier, target: str) -> Any:
+        """执行 func，classify 判定可重试时退避后重试，直到成功、不可重试或用完次数/预算"""
+        attempt = 0
+        while True:
+            result, error = None, None
+            try:
+                result = func()
+            except Exception as e:
+                error = e
+            reason = classify(result, error)
+            if reason is None or attempt >= self.max_retries or not self.stats.acquire(self.budget):
+                if error is not None:
+                    raise error
+                return result
+            delay = self.backoff(attempt)
+            self.stats.record(target, reason, delay)
+            print(f"🔁 重试 {target}（{reason}），第 {attempt + 1} 次，等待 {delay:.2f}s")
+            self.sleep(delay)
+            attempt += 1
+
+
+def api_retry_reason(method: str, idempotent: Optional[bool] = None) -> RetryClassifier:
+    """API请求的重试判定
+
+    连接未建立（ConnectTimeout）时请求没有发出，任何方法都可以重试；响应中带有
+    SQLITE_BUSY 说明写入未执行，同样可以重试。其余连接错误、读超时和 5xx 只对
+    幂等请求重试。已熔断的主机不重试。
+    """
+    if idempotent is None:
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+
+    def classify(response: Optional[requests.Response], error: Optional[BaseException]) -> Optional[str]:
+        if error is not None:
+            if isinstance(error, BackendUnavailable):
+                return None
+            if isinstance(error, requests.exceptions.ConnectTimeout):
+                return "connect_timeout"
+            if idempotent and isinstance(error, requests.exceptions.ConnectionError):
+                return "connection_error"
+            if idempotent and isinstance(error, requests.exceptions.ReadTimeout):
+                return "read_timeout"
+            return None
+        if response.status_code in TRANSIENT_STATUS:
+            if "SQLITE_BUSY" in response.text:
+                return "sqlite_busy"
+            if idempotent:
+                return f"http_{response.status_code}"
+        return None
+
+    return classify
+
+
+# 全局重试统计实例
+retry_stats = RetryStats()
@@ -0,0 +1,174 @@
+"""
+流式测试报告
+每个测试结束时立即向 JSONL 文件追加一行结果，运行中断时已完成的结果
+仍然可用；HTML 报告由 build_html 从 JSONL 流式生成，不在内存中保留全部结果
+"""
+import argparse
+import html
+import json
+import os
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+# 失败详情最多保留的字符数
+MAX_LONGREPR_CHARS = 8000
+
+
+class StreamReporter:
+    """pytest 插件：每个测试结束时追加一行 JSON
+
+    pytest-xdist 下 worker 的测试报告会转发给主进程，插件只在主进程注册，
+    由主进程单独写文件；每行以 O_APPEND 方式一次写入并加文件锁，多个进程
+    同时写同一文件也不会交错。
+    """
+
+    def __init__(self, path: str = "reports/results.jsonl"):
+        self.path = path
+        self.counts = Counter()
+        self._lock = threading.Lock()
+        self._fd = None
+
+    def pytest_sessionstart(self, session):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_APPEND, 0o644)
+        self._write({"event": "session_start", "time": time.time(), "root": str(session.config.rootpath)})
+
+    def pytest_runtest_logreport(self, report):
+        # 只记录决定测试结果的阶段：call，或失败/跳过的 setup，或失败的 teardown
+        if report.when == "call" or (report.when == "setup" and not report.passed) \
+                or (report.when == "teardown" and report.failed):
+            outcome = "error" if report.when != "call" and report.failed else report.outcome
+            if getattr(report, "wasxfail", None) is not None:
+                outcome = "xfailed" if report.skipped else "xpassed"
+            self.counts[outcome] += 1
+            node = getattr(report, "node", None)  # xdist 转发的报告带有 worker 节点
+            record = {
+                "event": "test",
+                "nodeid": report.nodeid,
+                "outcome": outcome,
+                "when": report.when,
+                "duration": round(report.duration, 4),
+                "worker": node.gateway.id if node is not None else "master",
+                "time": time.time()
+            }
+            retries = dict(report.user_properties).get("retries")
+            if retries:
+                record["retries"] = retries
+            if not report.passed:
+                record["longrepr"] = str(report.longrepr)[:MAX_LONGREPR_CHARS]
+            self._write(record)
+
+    def pytest_sessionfinish(self, session, exitstatus):
+        self._write({"event": "session_finish", "time": time.time(), "exitstatus": int(exitstatus),
+                     "counts": dict(self.counts)})
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _write(self, record: Dict[str, Any]):
+        if self._fd is None:
+            return
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._lock:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                os.write(self._fd, line)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+
+def iter_results(path: str) -> Iterator[Dict[str, Any]]:
+    """逐行读取结果，忽略被中断写入的残缺行"""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+_HTML_HEAD = """<!DOCTYPE html>
+<html lang="zh-CN"><head><meta charset="utf-8"><title>{title}</title>
+<style>
+body {{ font-family: sans-serif; margin: 20px; }}
+table {{ border-collapse: collapse; width: 100%; }}
+th, td {{ border: 1px solid #ddd; padding: 4px 8px; text-align: left; vertical-align: top; }}
+.passed {{ color: #2e7d32; }} .failed, .error {{ color: #c62828; }} .skipped, .xfailed {{ color: #f9a825; }}
+pre {{ white-space: pre-wrap; margin: 0; font-size: 12px; }}
+</style></head><body>
+<h1>{title}</h1>
+<table><tr><th>测试</th><th>结果</th><th>耗时(秒)</th><th>Worker</th><th>详情</th></tr>
+"""
+
+
+def build_html(jsonl_path: str = "reports/results.jsonl", html_path: str = "reports/stream_report.html",
+               title: str = "淘贝测试报告") -> Dict[str, Any]:
+    """从 JSONL 结果流式生成 HTML 报告，返回汇总信息
+
+    结果逐行写出，汇总放在表格之后；运行被中断（没有 session_finish）时
+    报告标记为未完成。
+    """
+    counts = Counter()
+    total_duration = 0.0
+    total_retries = 0
+    finished = False
+    directory = os.path.dirname(html_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    with open(html_path, "w", encoding="utf-8") as out:
+        out.write(_HTML_HEAD.format(title=html.escape(title)))
+        for record in iter_results(jsonl_path):
+            if record.get("event") == "session_finish":
+                finished = True
+                continue
+            if record.get("event") != "test":
+                continue
+            outcome = record["outcome"]
+            counts[outcome] += 1
+            total_duration += record.get("duration", 0.0)
+            total_retries += record.get("retries", 0)
+            details = f"<pre>{html.escape(record['longrepr'])}</pre>" if record.get("longrepr") else ""
+            if record.get("retries"):
+                details = f"重试 {record['retries']} 次" + details
+            out.write(
+                f"<tr><td>{html.escape(record['nodeid'])}</td>"
+                f"<td class=\"{outcome}\">{outcome}</td>"
+                f"<td>{record.get('duration', 0):.3f}</td>"
+                f"<td>{html.escape(str(record.get('worker') or ''))}</td>"
+                f"<td>{details}</td></tr>\n"
+            )
+        out.write("</table>\n")
+        summary = ", ".join(f"{outcome}: {count}" for outcome, count in sorted(counts.items()))
+        status = "已完成" if finished else "未完成（运行被中断，以下为部分结果）"
+        out.write(f"<h2>汇总</h2><p>{html.escape(status)}</p>"
+                  f"<p>共 {sum(counts.values())} 个测试，{html.escape(summary)}，"
+                  f"总耗时 {total_duration:.2f} 秒，重试 {total_retries} 次</p>\n</body></html>\n")
+
+    return {"counts": dict(counts), "total": sum(counts.values()),
+            "duration": round(total_duration, 2), "retries": total_retries, "finished": finished}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="从流式JSONL结果生成HTML报告")
+    parser.add_argument("jsonl", nargs="?", default="reports/results.jsonl", help="JSONL结果文件")
+    parser.add_argument("-o", "--output", default="reports/stream_report.html", help="HTML报告路径")
+    args = parser.parse_args()
+    summary = build_html(args.jsonl, args.output)
+    print(f"📊 HTML报告: {args.output} ({summary['total']} 个测试, {summary['counts']})")
+
+
+if __name__ == "__main__":
+    main()
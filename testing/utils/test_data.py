@@ -1,14 +1,31 @@
 """
 测试数据管理类
 """
+import bisect
+import itertools
 import random
 import string
-from typing import Dict, List, Any
+from operator import itemgetter
+from typing import Dict, Iterable, List, Any, Set
 from datetime import datetime, timedelta
 
 
+# 维护预排序视图的商品字段
+SORTED_FIELDS = ("price", "name")
+
+
+def _ngrams(text: str, size: int) -> Set[str]:
+    """文本中所有长度为 size 的连续子串"""
+    return {text[index:index + size] for index in range(len(text) - size + 1)}
+
+
 class TestDataManager:
-    """测试数据管理器"""
+    """测试数据管理器
+
+    商品和用户除列表外还维护按 ID/手机号/分类的哈希索引、关键词的字符
+    n-gram 倒排索引和按价格/名称的预排序视图，增删时同步更新，生成数千条
+    商品做分页和排序测试时查询不需要线性扫描。
+    """
     
     # 添加这个方法来避免pytest收集警告
     __test__ = False
@@ -24,6 +41,7 @@ class TestDataManager:
         self._init_categories()
         self._init_products()
         self._init_users()
+        self._build_indexes()
     
     def _init_categories(self):
         """初始化商品分类数据"""
@@ -167,6 +185,90 @@ class TestDataManager:
             }
         ]
     
+    # 索引维护
+    def _build_indexes(self):
+        """根据当前的商品和用户列表重建全部索引"""
+        self._products_by_id: Dict[int, Dict[str, Any]] = {}
+        self._products_by_category: Dict[str, Dict[int, Dict[str, Any]]] = {}
+        # 单字关键词查 1-gram，更长的关键词取各 2-gram 倒排列表的交集后再校验
+        self._keyword_index: Dict[int, Dict[str, Set[int]]] = {1: {}, 2: {}}
+        self._sorted_views: Dict[str, List[tuple]] = {field: [] for field in SORTED_FIELDS}
+        for product in self.products:
+            self._index_product(product, update_views=False)
+        self._rebuild_sorted_views()
+
+        self._users_by_id: Dict[int, Dict[str, Any]] = {}
+        self._users_by_phone: Dict[str, Dict[str, Any]] = {}
+        for user in self.users:
+            self._index_user(user)
+
+        self._next_product_id = max(self._products_by_id, default=0) + 1
+        self._next_user_id = max(self._users_by_id, default=0) + 1
+
+    def _rebuild_sorted_views(self):
+        for field in SORTED_FIELDS:
+            self._sorted_views[field] = sorted(
+                (product[field], product["id"]) for product in self._products_by_id.values()
+            )
+
+    def _index_product(self, product: Dict[str, Any], update_views: bool = True):
+        product_id = product["id"]
+        self._products_by_id[product_id] = product
+        self._products_by_category.setdefault(product["category"], {})[product_id] = product
+        for size, index in self._keyword_index.items():
+            for gram in self._product_grams(product, size):
+                index.setdefault(gram, set()).add(product_id)
+        if update_views:
+            for field in SORTED_FIELDS:
+                bisect.insort(self._sorted_views[field], (product[field], product_id))
+
+    def _unindex_product(self, product: Dict[str, Any]):
+        product_id = product["id"]
+        del self._products_by_id[product_id]
+        category = self._products_by_category[product["category"]]
+        del category[product_id]
+        if not category:
+            del self._products_by_category[product["category"]]
+        for size, index in self._keyword_index.items():
+            for gram in self._product_grams(product, size):
+                index[gram].discard(product_id)
+                if not index[gram]:
+                    del index[gram]
+        for field in SORTED_FIELDS:
+            view = self._sorted_views[field]
+            del view[bisect.bisect_left(view, (product[field], product_id))]
+
+    @staticmethod
+    def _product_grams(product: Dict[str, Any], size: int) -> Set[str]:
+        # 名称和描述分别切分，避免产生跨字段的子串
+        return _ngrams(product["name"].lower(), size) | _ngrams(product["description"].lower(), size)
+
+    def _index_user(self, user: Dict[str, Any]):
+        self._users_by_id[user["id"]] = user
+        self._users_by_phone.setdefault(user["phone_number"], user)
+
+    def _unindex_user(self, user: Dict[str, Any]):
+        del self._users_by_id[user["id"]]
+        phone_number = user["phone_number"]
+        if self._users_by_phone.get(phone_number) is user:
+            del self._users_by_phone[phone_number]
+            # 手机号重复时，由剩下的第一个用户接替
+            for other in self.users:
+                if other["phone_number"] == phone_number:
+                    self._users_by_phone[phone_number] = other
+                    break
+
+    def _sorted_products(self, field: str, ascending: bool) -> List[Dict[str, Any]]:
+        view = self._sorted_views[field]
+        if ascending:
+            ids = [product_id for _, product_id in view]
+        else:
+            # 降序时值相同的商品仍按添加顺序排列，与稳定排序的结果一致
+            ids = []
+            for _, group in itertools.groupby(reversed(view), key=itemgetter(0)):
+                ids.extend(reversed([product_id for _, product_id in group]))
+        return [self._products_by_id[product_id].copy() for product_id in ids]
+
     # 用户数据相关方法
     def get_valid_user(self) -> Dict[str, Any]:
         """获取有效的用户数据"""
@@ -174,10 +276,8 @@ class TestDataManager:
     
     def get_user_by_phone(self, phone_number: str) -> Dict[str, Any]:
         """根据手机号获取用户数据"""
-        for user in self.users:
-            if user["phone_number"] == phone_number:
-                return user.copy()
-        return None
+        user = self._users_by_phone.get(phone_number)
+        return user.copy() if user is not None else None
     
     def generate_random_phone(self) -> str:
         """生成随机手机号"""
@@ -228,32 +328,45 @@ class TestDataManager:
     
     def get_product_by_id(self, product_id: int) -> Dict[str, Any]:
         """根据ID获取商品数据"""
-        for product in self.products:
-            if product["id"] == product_id:
-                return product.copy()
-        return None
+        product = self._products_by_id.get(product_id)
+        return product.copy() if product is not None else None
     
     def get_products_by_category(self, category: str) -> List[Dict[str, Any]]:
         """根据分类获取商品数据"""
-        return [product.copy() for product in self.products if product["category"] == category]
+        return [product.copy() for product in self._products_by_category.get(category, {}).values()]
     
     def search_products_by_keyword(self, keyword: str) -> List[Dict[str, Any]]:
-        """根据关键词搜索商品"""
+        """根据关键词搜索商品（名称或描述包含关键词，不区分大小写）"""
+        keyword = keyword.lower()
+        if not keyword:
+            return self.get_all_products()
+
+        size = min(len(keyword), 2)
+        index = self._keyword_index[size]
+        candidates = None
+        for gram in sorted(_ngrams(keyword, size), key=lambda gram: len(index.get(gram, ()))):
+            postings = index.get(gram)
+            if not postings:
+                return []
+            candidates = set(postings) if candidates is None else candidates & postings
+            if not candidates:
+                return []
+
+        # n-gram 都命中不代表整个关键词连续出现，还需逐个确认；ID 递增分配，按 ID 排序即添加顺序
         results = []
-        for product in self.products:
-            if keyword.lower() in product["name"].lower() or keyword.lower() in product["description"].lower():
+        for product_id in sorted(candidates):
+            product = self._products_by_id[product_id]
+            if keyword in product["name"].lower() or keyword in product["description"].lower():
                 results.append(product.copy())
         return results
     
     def get_products_sorted_by_price(self, ascending: bool = True) -> List[Dict[str, Any]]:
         """按价格排序获取商品"""
-        sorted_products = sorted(self.products, key=lambda x: x["price"], reverse=not ascending)
-        return [product.copy() for product in sorted_products]
+        return self._sorted_products("price", ascending)
     
     def get_products_sorted_by_name(self, ascending: bool = True) -> List[Dict[str, Any]]:
         """按名称排序获取商品"""
-        sorted_products = sorted(self.products, key=lambda x: x["name"], reverse=not ascending)
-        return [product.copy() for product in sorted_products]
+        return self._sorted_products("name", ascending)
     
     def get_categories(self) -> List[Dict[str, Any]]:
         """获取所有分类数据"""
@@ -324,28 +437,64 @@ class TestDataManager:
     
     def add_test_user(self, user_data: Dict[str, Any]) -> int:
         """添加测试用户"""
-        user_id = max([user["id"] for user in self.users]) + 1 if self.users else 1
+        user_id = self._next_user_id
+        self._next_user_id += 1
         user_data["id"] = user_id
         user_data["created_at"] = datetime.now().isoformat() + "Z"
         user_data["updated_at"] = datetime.now().isoformat() + "Z"
         self.users.append(user_data)
+        self._index_user(user_data)
         return user_id
     
     def add_test_product(self, product_data: Dict[str, Any]) -> int:
         """添加测试商品"""
-        product_id = max([product["id"] for product in self.products]) + 1 if self.products else 1
+        product_id = self._assign_product_id(product_data)
+        self.products.append(product_data)
+        self._index_product(product_data)
+        return product_id
+    
+    def add_test_products(self, products: Iterable[Dict[str, Any]]) -> List[int]:
+        """批量添加测试商品，预排序视图在全部添加后一次性重建"""
+        product_ids = []
+        for product_data in products:
+            product_ids.append(self._assign_product_id(product_data))
+            self.products.append(product_data)
+            self._index_product(product_data, update_views=False)
+        self._rebuild_sorted_views()
+        return product_ids
+    
+    def load_generated_data(self, product_count: int, user_count: int = 0, seed: int = None) -> Dict[str, int]:
+        """追加按种子确定性生成的商品和用户，用于大数据量的分页、搜索和排序测试"""
+        from .catalog_generator import DEFAULT_SEED, CatalogGenerator  # Faker 导入较慢，用到时才加载
+
+        generator = CatalogGenerator(DEFAULT_SEED if seed is None else seed)
+        self.add_test_products(generator.iter_products(product_count))
+        for user in generator.iter_users(user_count):
+            self.add_test_user(user)
+        return {"products": len(self.products), "users": len(self.users)}
+
+    def _assign_product_id(self, product_data: Dict[str, Any]) -> int:
+        product_id = self._next_product_id
+        self._next_product_id += 1
         product_data["id"] = product_id
         product_data["created_at"] = datetime.now().isoformat() + "Z"
-        self.products.append(product_data)
         return product_id
     
     def remove_test_user(self, user_id: int):
         """删除测试用户"""
-        self.users = [user for user in self.users if user["id"] != user_id]
+        user = self._users_by_id.get(user_id)
+        if user is None:
+            return
+        self.users = [other for other in self.users if other is not user]
+        self._unindex_user(user)
     
     def remove_test_product(self, product_id: int):
         """删除测试商品"""
-        self.products = [product for product in self.products if product["id"] != product_id]
+        product = self._products_by_id.get(product_id)
+        if product is None:
+            return
+        self.products = [other for other in self.products if other is not product]
+        self._unindex_product(product)
 
 
 # 全局测试数据管理器实例
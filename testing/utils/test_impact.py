@@ -0,0 +1,351 @@
+"""
+测试影响分析
+采集时逐个测试跟踪执行过的仓库内源码文件（页面对象、APIHelper、步骤定义等）
+和访问过的后端接口，写入依赖索引；选择时根据 git diff 的改动文件，通过索引
+和后端路由的 require 关系找出受影响的测试，只运行这些测试
+"""
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+from urllib.parse import urlsplit
+
+import pytest
+
+from .duration_scheduler import base_nodeid
+
+
+INDEX_VERSION = 1
+
+# 改动后必须运行全部测试的文件（相对仓库根目录）
+GLOBAL_FILES = {
+    "testing/conftest.py",
+    "testing/pytest.ini",
+    "testing/requirements.txt",
+    "testing/behave.ini"
+}
+
+# 前端改动影响所有使用浏览器的测试
+FRONTEND_PREFIX = "src/frontend/"
+BACKEND_PREFIXES = ("src/backend/", "src/database/")
+
+# 按函数名记录的符号（其余文件只记录到文件级别）
+_SYMBOL_PREFIXES = ("testing/pages/", "testing/utils/api_helper.py", "testing/utils/async_api_helper.py")
+
+_REQUIRE_PATTERN = re.compile(r"require\(\s*['\"](\.[^'\"]+)['\"]\s*\)")
+_ROUTE_REQUIRE_PATTERN = re.compile(r"(?:const|let|var)\s+(\w+)\s*=\s*require\(\s*['\"](\.[^'\"]+)['\"]\s*\)")
+_APP_USE_PATTERN = re.compile(r"app\.use\(\s*['\"](/[^'\"]*)['\"]\s*,\s*(\w+)\s*\)")
+
+
+def find_repo_root(start: Optional[str] = None) -> Path:
+    """仓库根目录（git 不可用时取 testing 的上一级目录）"""
+    try:
+        result = subprocess.run(["git", "rev-parse", "--show-toplevel"], cwd=start or os.getcwd(),
+                                capture_output=True, text=True, timeout=10)
+        if result.returncode == 0:
+            return Path(result.stdout.strip())
+    except (OSError, subprocess.SubprocessError):
+        pass
+    return Path(__file__).resolve().parents[2]
+
+
+def _resolve_js(base_dir: Path, spec: str) -> Optional[Path]:
+    """按 Node 的规则解析相对 require 路径"""
+    target = (base_dir / spec).resolve()
+    for candidate in (target, target.with_name(target.name + ".js"), target / "index.js"):
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def _require_closure(entry: Path, stop_dir: Path) -> Set[Path]:
+    """entry 及其递归 require 的仓库内 JS 文件"""
+    seen: Set[Path] = set()
+    pending = [entry]
+    while pending:
+        current = pending.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        try:
+            source = current.read_text(encoding="utf-8")
+        except OSError:
+            continue
+        for spec in _REQUIRE_PATTERN.findall(source):
+            resolved = _resolve_js(current.parent, spec)
+            if resolved is not None and stop_dir in resolved.parents:
+                pending.append(resolved)
+    return seen
+
+
+def backend_route_map(repo_root: Path) -> Dict[str, List[str]]:
+    """解析 src/backend/app.js，得到 接口前缀 -> 路由文件及其依赖（DAO等） 的映射"""
+    src_dir = repo_root / "src"
+    app_js = src_dir / "backend" / "app.js"
+    try:
+        source = app_js.read_text(encoding="utf-8")
+    except OSError:
+        return {}
+
+    modules = {name: spec for name, spec in _ROUTE_REQUIRE_PATTERN.findall(source)}
+    route_map = {}
+    for prefix, name in _APP_USE_PATTERN.findall(source):
+        if name not in modules:
+            continue
+        entry = _resolve_js(app_js.parent, modules[name])
+        if entry is None:
+            continue
+        route_map[prefix] = sorted(
+            path.relative_to(repo_root).as_posix() for path in _require_closure(entry, src_dir)
+        )
+    return route_map
+
+
+def backend_files_for(endpoints: Iterable[str], route_map: Dict[str, List[str]]) -> Set[str]:
+    """接口路径对应的后端文件；未匹配任何路由的接口只依赖 app.js（404处理）"""
+    files = set()
+    for endpoint in endpoints:
+        files.add("src/backend/app.js")
+        for prefix, route_files in route_map.items():
+            if endpoint == prefix or endpoint.startswith(prefix.rstrip("/") + "/"):
+                files.update(route_files)
+    return files
+
+
+class ImpactCollector:
+    """pytest 插件：按测试采集依赖
+
+    sys.settrace 只接收函数调用事件（不做行级跟踪），记录调用发生在哪个
+    仓库内文件；requests/httpx 发出的请求从调用参数中取 URL 记录接口路径，
+    页面中的请求由 page fixture 调用 record_url 记录。fixture 的依赖单独
+    采集，测试的依赖包含它用到的全部 fixture 的依赖，会话级 fixture 只执行
+    一次也不会漏记。
+    """
+
+    def __init__(self, repo_root: Optional[Path] = None):
+        self.repo_root = Path(repo_root or find_repo_root()).resolve()
+        self.tests: Dict[str, Dict[str, Any]] = {}
+        self._fixture_deps: Dict[str, Dict[str, Set[str]]] = {}
+        self._stack: List[Dict[str, Set[str]]] = []
+        self._file_kinds: Dict[str, Any] = {}
+        self._prefix = str(self.repo_root) + os.sep
+        self._skip = [path for path in {sys.prefix, sys.base_prefix, sys.exec_prefix} if path]
+        self._previous_trace = None
+        self._current: Optional[Dict[str, Set[str]]] = None
+        self._own_file = os.path.abspath(__file__)
+
+    # 跟踪
+    def start(self):
+        self._previous_trace = sys.gettrace()
+        if self._previous_trace is not None:
+            print("⚠️ 已有其他跟踪器（如覆盖率工具），测试影响采集将替换它")
+        sys.settrace(self._trace)
+        threading.settrace(self._trace)
+
+    def stop(self):
+        sys.settrace(self._previous_trace)
+        threading.settrace(None)
+
+    def _classify(self, filename: str):
+        if filename.endswith(os.path.join("requests", "sessions.py")):
+            return "requests"
+        if filename.endswith(os.path.join("httpx", "_client.py")):
+            return "httpx"
+        if filename.startswith("<"):  # <frozen os>、<string> 等没有源文件的代码
+            return None
+        path = os.path.abspath(filename)
+        if path == self._own_file:
+            return None
+        if not path.startswith(self._prefix) or "site-packages" in path \
+                or any(path.startswith(prefix + os.sep) for prefix in self._skip):
+            return None
+        return os.path.relpath(path, self.repo_root).replace(os.sep, "/")
+
+    def _trace(self, frame, event, arg):
+        if event != "call" or not self._stack:
+            return None
+        code = frame.f_code
+        kind = self._file_kinds.get(code.co_filename, False)
+        if kind is False:
+            kind = self._file_kinds[code.co_filename] = self._classify(code.co_filename)
+        if kind is None:
+            return None
+        deps = self._stack[-1]
+        if kind == "requests":
+            if code.co_name == "request":
+                self.record_url(frame.f_locals.get("url"))
+        elif kind == "httpx":
+            if code.co_name == "build_request":
+                self.record_url(frame.f_locals.get("url"))
+        else:
+            deps["files"].add(kind)
+            if kind.startswith(_SYMBOL_PREFIXES):
+                deps["symbols"].add(f"{kind}::{getattr(code, 'co_qualname', code.co_name)}")
+        return None
+
+    def record_url(self, url):
+        """记录一次接口请求（只记录 /api 路径）"""
+        if not self._stack or url is None:
+            return
+        path = urlsplit(str(url)).path
+        if path == "/api" or path.startswith("/api/"):
+            self._stack[-1]["endpoints"].add(path)
+
+    @staticmethod
+    def _new_deps() -> Dict[str, Set[str]]:
+        return {"files": set(), "symbols": set(), "endpoints": set()}
+
+    # pytest 钩子
+    def pytest_sessionstart(self, session):
+        self.start()
+
+    def pytest_sessionfinish(self, session):
+        self.stop()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_fixture_setup(self, fixturedef, request):
+        self._stack.append(self._fixture_deps.setdefault(fixturedef.argname, self._new_deps()))
+        try:
+            yield
+        finally:
+            self._stack.pop()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        self._current = self._new_deps()
+        yield
+        self.tests[base_nodeid(item.nodeid)] = self._finish_item(item, self._current)
+        self._current = None
+
+    # 只在 setup/call/teardown 阶段内跟踪，报告类插件的钩子不计入依赖
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_setup(self, item):
+        yield from self._tracked()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        yield from self._tracked()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_teardown(self, item, nextitem):
+        yield from self._tracked()
+
+    def _tracked(self):
+        if self._current is None:
+            yield
+            return
+        self._stack.append(self._current)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+
+    def _finish_item(self, item, deps: Dict[str, Set[str]]) -> Dict[str, Any]:
+        for name in item.fixturenames:
+            fixture_deps = self._fixture_deps.get(name)
+            if fixture_deps:
+                for key in deps:
+                    deps[key].update(fixture_deps[key])
+
+        # BDD场景的 item.path 就是 .feature 文件
+        path = Path(str(item.path)).resolve()
+        if self.repo_root in path.parents:
+            deps["files"].add(path.relative_to(self.repo_root).as_posix())
+
+        return {
+            "files": sorted(deps["files"]),
+            "symbols": sorted(deps["symbols"]),
+            "endpoints": sorted(deps["endpoints"]),
+            "browser": "page" in item.fixturenames
+        }
+
+
+class ImpactIndex:
+    """依赖索引：nodeid -> 依赖的文件、符号、接口"""
+
+    def __init__(self, tests: Dict[str, Dict[str, Any]] = None, repo_root: Optional[Path] = None):
+        self.tests = tests or {}
+        self.repo_root = Path(repo_root or find_repo_root())
+        self._route_map = None
+
+    @classmethod
+    def load(cls, path: str, repo_root: Optional[Path] = None) -> Optional["ImpactIndex"]:
+        """读取索引，不存在或版本不符时返回 None"""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != INDEX_VERSION:
+            return None
+        return cls(data.get("tests", {}), repo_root)
+
+    def update(self, tests: Dict[str, Dict[str, Any]]):
+        """合并新采集的结果（本次未运行的测试保留原有记录）"""
+        self.tests.update(tests)
+
+    def save(self, path: str):
+        route_map = self.route_map
+        tests = {}
+        for nodeid, entry in sorted(self.tests.items()):
+            tests[nodeid] = {**entry, "backend": sorted(backend_files_for(entry.get("endpoints", []), route_map))}
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "generated_at": time.time(), "routes": route_map,
+                       "tests": tests}, f, ensure_ascii=False, indent=2)
+
+    @property
+    def route_map(self) -> Dict[str, List[str]]:
+        if self._route_map is None:
+            self._route_map = backend_route_map(self.repo_root)
+        return self._route_map
+
+    def affected(self, nodeids: Iterable[str], changed: Iterable[str]) -> Set[str]:
+        """受改动影响的测试
+
+        索引中没有记录的测试（新增的测试）总是运行；改动了全局文件时全部运行。
+        后端文件不在任何路由的依赖中时（如 app.js、package.json）影响所有
+        访问过接口的测试。
+        """
+        nodeids = list(nodeids)
+        changed = {path.replace(os.sep, "/") for path in changed}
+        if changed & GLOBAL_FILES:
+            return set(nodeids)
+
+        route_files = {path for files in self.route_map.values() for path in files}
+        backend_changed = {path for path in changed if path.startswith(BACKEND_PREFIXES)}
+        backend_wide = any(path not in route_files for path in backend_changed)
+        frontend_changed = any(path.startswith(FRONTEND_PREFIX) for path in changed)
+
+        selected = set()
+        for nodeid in nodeids:
+            entry = self.tests.get(nodeid)
+            if entry is None:
+                selected.add(nodeid)
+                continue
+            endpoints = entry.get("endpoints", [])
+            if changed.intersection(entry.get("files", [])) \
+                    or (frontend_changed and entry.get("browser")) \
+                    or (endpoints and backend_wide) \
+                    or (backend_changed and backend_changed & backend_files_for(endpoints, self.route_map)):
+                selected.add(nodeid)
+        return selected
+
+
+def changed_files(ref: str, repo_root: Optional[Path] = None) -> List[str]:
+    """相对 ref 改动过的文件（含未提交和未跟踪的文件），路径相对仓库根目录"""
+    cwd = str(repo_root or find_repo_root())
+    diff = subprocess.run(["git", "diff", "--name-only", ref], cwd=cwd, capture_output=True, text=True, timeout=60)
+    if diff.returncode != 0:
+        raise ValueError(f"无法计算相对 {ref} 的改动: {diff.stderr.strip()}")
+    untracked = subprocess.run(["git", "ls-files", "--others", "--exclude-standard"], cwd=cwd,
+                               capture_output=True, text=True, timeout=60)
+    files = diff.stdout.splitlines() + (untracked.stdout.splitlines() if untracked.returncode == 0 else [])
+    return sorted({path for path in files if path})
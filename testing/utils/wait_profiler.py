@@ -0,0 +1,103 @@
+"""
+等待耗时分析器
+按场景统计固定等待（sleep）和条件等待所占用的时间，其余时间视为有效操作时间
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+from .config import Config
+
+
+class WaitProfiler:
+    """等待耗时分析器
+
+    BasePage 的等待方法会把耗时记入当前场景：fixed_sleep 为固定时长的等待，
+    condition_wait 为等待DOM状态或网络响应的条件等待。未启用时只执行等待，
+    不做统计。
+    """
+
+    def __init__(self, enabled: Optional[bool] = None):
+        if enabled is None:
+            enabled = Config().WAIT_PROFILE
+        self.enabled = enabled
+        self.scenarios: List[Dict[str, Any]] = []
+        self._current: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+
+    def start_scenario(self, name: str):
+        """开始统计一个场景"""
+        if not self.enabled:
+            return
+        self._current = {
+            "name": name,
+            "started_at": time.perf_counter(),
+            "fixed_sleep_ms": 0.0,
+            "fixed_sleep_count": 0,
+            "condition_wait_ms": 0.0,
+            "condition_wait_count": 0
+        }
+
+    def end_scenario(self) -> Optional[Dict[str, Any]]:
+        """结束当前场景并返回统计结果"""
+        if not self.enabled or self._current is None:
+            return None
+        current, self._current = self._current, None
+        total_ms = (time.perf_counter() - current.pop("started_at")) * 1000
+        current["total_ms"] = round(total_ms, 2)
+        current["productive_ms"] = round(
+            max(total_ms - current["fixed_sleep_ms"] - current["condition_wait_ms"], 0.0), 2
+        )
+        current["fixed_sleep_ms"] = round(current["fixed_sleep_ms"], 2)
+        current["condition_wait_ms"] = round(current["condition_wait_ms"], 2)
+        with self._lock:
+            self.scenarios.append(current)
+        return current
+
+    def record(self, kind: str, elapsed_ms: float):
+        """记录一次等待，kind 为 fixed_sleep 或 condition_wait"""
+        if not self.enabled or self._current is None:
+            return
+        self._current[f"{kind}_ms"] += elapsed_ms
+        self._current[f"{kind}_count"] += 1
+
+    @contextmanager
+    def measure(self, kind: str):
+        """统计代码块的等待耗时"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(kind, (time.perf_counter() - start) * 1000)
+
+    def sleep(self, seconds: float):
+        """固定等待指定秒数并记录"""
+        with self.measure("fixed_sleep"):
+            time.sleep(seconds)
+
+    def summary(self) -> Dict[str, Any]:
+        """汇总所有场景"""
+        with self._lock:
+            scenarios = list(self.scenarios)
+        totals = {
+            key: round(sum(item[key] for item in scenarios), 2)
+            for key in ("total_ms", "fixed_sleep_ms", "condition_wait_ms", "productive_ms")
+        }
+        return {"totals": totals, "scenarios": scenarios}
+
+    def write_report(self, path: str = "reports/wait_profile.json"):
+        """写入JSON报告"""
+        if not self.enabled:
+            return
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, ensure_ascii=False, indent=2)
+
+
+# 全局等待耗时分析器实例
+wait_profiler = WaitProfiler()